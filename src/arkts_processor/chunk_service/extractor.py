@@ -6,6 +6,7 @@ Chunk 提取器
 
 from typing import List, Optional, Dict, Any
 from ..models import Symbol, SymbolType, Scope, ScopeType
+from ..source_index import SourceIndex
 from ..chunk_models import (
     CodeChunk, ChunkType, PositionRange, 
     ChunkMetadata, Parameter, TypeInfo
@@ -29,7 +30,11 @@ class ChunkExtractor:
         SymbolType.NAMESPACE: ChunkType.MODULE,
     }
     
-    def __init__(self, file_path: str, source_code: bytes, project_root: Optional[str] = None):
+    def __init__(self, 
+                 file_path: str, 
+                 source_code: bytes, 
+                 project_root: Optional[str] = None,
+                 source_index: Optional[SourceIndex] = None):
         """
         初始化提取器
         
@@ -37,10 +42,11 @@ class ChunkExtractor:
             file_path: 文件路径（绝对路径）
             source_code: 源代码字节数组
             project_root: 项目根目录（用于生成相对路径）
+            source_index: 共享的源代码索引（None 表示新建）
         """
         self.file_path = file_path
         self.source_code = source_code
-        self.source_lines = source_code.decode('utf-8').split('\n')
+        self.source_index = source_index or SourceIndex(source_code)
         self.project_root = project_root
     
     def extract_chunks(self, symbols: List[Symbol], scopes: List[Scope]) -> List[CodeChunk]:
@@ -294,29 +300,10 @@ class ChunkExtractor:
         Returns:
             源代码字符串
         """
-        start_line = symbol.range.start.line
-        end_line = symbol.range.end.line
-        
-        # 提取源代码行
-        if start_line == end_line:
-            # 单行代码
-            line = self.source_lines[start_line]
-            return line[symbol.range.start.column:symbol.range.end.column]
-        else:
-            # 多行代码
-            lines = []
-            for i in range(start_line, end_line + 1):
-                if i < len(self.source_lines):
-                    if i == start_line:
-                        # 第一行，从起始列开始
-                        lines.append(self.source_lines[i][symbol.range.start.column:])
-                    elif i == end_line:
-                        # 最后一行，到结束列结束
-                        lines.append(self.source_lines[i][:symbol.range.end.column])
-                    else:
-                        # 中间行，完整保留
-                        lines.append(self.source_lines[i])
-            return '\n'.join(lines)
+        # 符号范围的列号为字节列，经索引映射为字符偏移后直接切片
+        start = self.source_index.char_offset_at(symbol.range.start.line, symbol.range.start.column)
+        end = self.source_index.char_offset_at(symbol.range.end.line, symbol.range.end.column)
+        return self.source_index.text[start:end]
     
     def _extract_imports(self, symbol: Symbol) -> List[str]:
         """
@@ -7,7 +7,7 @@ Chunk 数据库存储层
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, bindparam, case, func, update
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
 from sqlalchemy.orm import Session
 
@@ -216,6 +216,56 @@ class ChunkRepository:
             session.commit()
             return count
     
+    def rename_file(self, 
+                    old_path: str, 
+                    new_path: str, 
+                    id_map: Optional[Dict[int, int]] = None) -> int:
+        """
+        将文件的所有 Chunk 移动到新路径
+        
+        同时改写 chunk_id 的路径前缀和源码中的 "# file:" 元数据头，
+        并按 id_map 更新关联的符号ID（符号ID包含文件路径，重命名后随之变化）。
+        新路径上残留的旧 Chunk 先删除。
+        
+        Args:
+            old_path: 原文件路径
+            new_path: 新文件路径
+            id_map: 符号ID映射（原ID -> 新ID，可选）
+            
+        Returns:
+            移动的 Chunk 数量
+        """
+        old_prefix = f"{old_path}#"
+        with self.db_manager.get_session() as session:
+            session.query(ChunkModel).filter_by(path=new_path).delete()
+            count = session.query(ChunkModel).filter_by(path=old_path).update({
+                ChunkModel.path: new_path,
+                ChunkModel.chunk_id: case(
+                    (ChunkModel.chunk_id.startswith(old_prefix, autoescape=True),
+                     f"{new_path}#" + func.substr(ChunkModel.chunk_id, len(old_prefix) + 1)),
+                    else_=ChunkModel.chunk_id
+                ),
+                ChunkModel.source: func.replace(
+                    ChunkModel.source, f"# file: {old_path}\n", f"# file: {new_path}\n"
+                ),
+                ChunkModel.updated_at: datetime.utcnow(),
+            }, synchronize_session=False)
+            
+            mapping = [
+                {"old_id": old_id, "new_id": new_id}
+                for old_id, new_id in (id_map or {}).items() if old_id != new_id
+            ]
+            if mapping:
+                chunks = ChunkModel.__table__
+                session.execute(
+                    update(chunks)
+                    .where(chunks.c.path == new_path, chunks.c.symbol_id == bindparam("old_id"))
+                    .values(symbol_id=bindparam("new_id")),
+                    mapping
+                )
+            session.commit()
+            return count
+    
     def get_all_chunks(self, limit: Optional[int] = None) -> List[CodeChunk]:
         """
         获取所有 Chunk
@@ -50,8 +50,13 @@ class ChunkService:
         Returns:
             CodeChunk 列表
         """
-        # 首先使用 SymbolService 处理文件
-        process_result = self.symbol_service.process_file(file_path)
+        # 首先使用 SymbolService 处理文件（内容与文件清单一致时跳过）
+        process_result = self.symbol_service.process_file(file_path, skip_unchanged=True)
+        if process_result.get("skipped"):
+            # 文件未变化，已保存的 Chunk 仍然有效
+            existing_chunks = self.repository.get_chunks_by_file(file_path)
+            if existing_chunks:
+                return existing_chunks
         
         # 获取符号和作用域
         symbols = self.symbol_service.repository.get_symbols_by_file(file_path)
@@ -245,6 +250,20 @@ class ChunkService:
         """
         return self.repository.delete_chunks_by_file(file_path)
     
+    def rename_file(self, old_path: str, new_path: str) -> int:
+        """
+        将文件的符号和 Chunk 移动到新路径（内容未变化的重命名，不重新生成）
+        
+        Args:
+            old_path: 原文件路径
+            new_path: 新文件路径
+            
+        Returns:
+            移动的 Chunk 数量
+        """
+        id_map = self.symbol_service.rename_file(old_path, new_path)
+        return self.repository.rename_file(old_path, new_path, id_map)
+    
     def get_statistics(self, file_path: Optional[str] = None) -> Dict[str, int]:
         """
         获取统计信息
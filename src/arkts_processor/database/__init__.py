@@ -4,8 +4,12 @@
 提供符号表的持久化存储功能。
 """
 
-from .schema import Base, SymbolModel, ScopeModel, ReferenceModel, TypeModel
-from .repository import SymbolRepository
+from .schema import (
+    Base, SymbolModel, ScopeModel, ReferenceModel, TypeModel, FileManifestModel,
+    ImportBindingModel, FileDependencyModel, FileApiModel
+)
+from .repository import SymbolRepository, DatabaseManager
+from .profiles import EngineProfile, ENGINE_PROFILES, get_profile
 
 __all__ = [
     "Base",
@@ -13,5 +17,13 @@ __all__ = [
     "ScopeModel",
     "ReferenceModel",
     "TypeModel",
+    "FileManifestModel",
+    "ImportBindingModel",
+    "FileDependencyModel",
+    "FileApiModel",
     "SymbolRepository",
+    "DatabaseManager",
+    "EngineProfile",
+    "ENGINE_PROFILES",
+    "get_profile",
 ]
@@ -0,0 +1,100 @@
+"""
+SQLite 引擎性能配置
+
+每个配置包含每次建立连接时执行的 PRAGMA 和连接池参数：
+
+- bulk_load: 全量索引时使用，WAL + 关闭同步刷盘，大页缓存和内存映射，单写连接
+- serving: 索引完成后提供查询，WAL + NORMAL 同步，读者与写者互不阻塞，较大的连接池
+- safe: 与 SQLite 默认行为一致的回滚日志和完全同步，仅增加忙等待超时
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """SQLite 引擎配置"""
+    name: str
+    journal_mode: Optional[str] = None  # WAL / DELETE，None 表示不修改
+    synchronous: Optional[str] = None  # OFF / NORMAL / FULL
+    cache_size: Optional[int] = None  # 页数，负数表示 KiB
+    mmap_size: Optional[int] = None  # 字节
+    temp_store: Optional[str] = None  # DEFAULT / FILE / MEMORY
+    busy_timeout: Optional[int] = None  # 毫秒
+    pool_options: Dict[str, Any] = field(default_factory=dict)  # create_engine 的连接池参数
+
+    def pragmas(self) -> List[str]:
+        """
+        获取建立连接时执行的 PRAGMA 语句
+
+        Returns:
+            PRAGMA 语句列表
+        """
+        statements = []
+        if self.journal_mode is not None:
+            statements.append(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.synchronous is not None:
+            statements.append(f"PRAGMA synchronous={self.synchronous}")
+        if self.cache_size is not None:
+            statements.append(f"PRAGMA cache_size={self.cache_size}")
+        if self.mmap_size is not None:
+            statements.append(f"PRAGMA mmap_size={self.mmap_size}")
+        if self.temp_store is not None:
+            statements.append(f"PRAGMA temp_store={self.temp_store}")
+        if self.busy_timeout is not None:
+            statements.append(f"PRAGMA busy_timeout={self.busy_timeout}")
+        return statements
+
+
+ENGINE_PROFILES: Dict[str, EngineProfile] = {
+    "bulk_load": EngineProfile(
+        name="bulk_load",
+        journal_mode="WAL",
+        synchronous="OFF",
+        cache_size=-262144,  # 256 MiB
+        mmap_size=1 << 30,  # 1 GiB
+        temp_store="MEMORY",
+        busy_timeout=30000,
+        pool_options={"pool_size": 1, "max_overflow": 0, "pool_timeout": 60},
+    ),
+    "serving": EngineProfile(
+        name="serving",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-65536,  # 64 MiB
+        mmap_size=256 << 20,  # 256 MiB
+        temp_store="MEMORY",
+        busy_timeout=5000,
+        pool_options={"pool_size": 8, "max_overflow": 16, "pool_timeout": 30},
+    ),
+    "safe": EngineProfile(
+        name="safe",
+        journal_mode="DELETE",
+        synchronous="FULL",
+        busy_timeout=5000,
+    ),
+}
+
+
+def get_profile(profile: Union[str, EngineProfile]) -> EngineProfile:
+    """
+    获取引擎配置
+
+    Args:
+        profile: 配置名称（bulk_load / serving / safe）或配置对象
+
+    Returns:
+        引擎配置
+
+    Raises:
+        ValueError: 未知的配置名称
+    """
+    if isinstance(profile, EngineProfile):
+        return profile
+    try:
+        return ENGINE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown engine profile: {profile}. Available: {', '.join(ENGINE_PROFILES)}"
+        ) from None
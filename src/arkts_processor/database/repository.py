@@ -4,33 +4,113 @@
 提供符号表的CRUD操作和查询功能。
 """
 
-from typing import ContextManager, Optional, List, Dict, Any, Generator, cast
-from sqlalchemy import create_engine, and_, or_
-from sqlalchemy.orm import sessionmaker, Session
+from typing import ContextManager, Optional, List, Dict, Any, Generator, Iterable, Iterator, Sequence, Tuple, Union, cast
+from sqlalchemy import bindparam, create_engine, and_, or_, event, exists, func, insert, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker, Session, object_session
 from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
+import re
 
-from .schema import Base, SymbolModel, ScopeModel, ReferenceModel, TypeModel, SymbolRelationModel
-from ..models import Symbol, Scope, Reference, Position, Range, TypeInfo, SymbolType, ScopeType
+from .schema import (
+    Base, SymbolModel, ScopeModel, ReferenceModel, TypeModel, SymbolRelationModel, FileManifestModel,
+    ImportBindingModel, FileDependencyModel, FileApiModel
+)
+from .profiles import EngineProfile, get_profile
+from ..models import (
+    Symbol, Scope, Reference, ReferenceType, SymbolRelation, FileFingerprint, ImportBinding, Position, Range,
+    TypeInfo, SymbolType, ScopeType, Visibility
+)
+from ..symbol_ids import compute_symbol_ids
+
+
+# 类型完整标识：(名称, 是否原始类型, 是否数组, 是否泛型, 泛型参数, 是否可空)
+TypeKey = Tuple[str, bool, bool, bool, Tuple[str, ...], bool]
+
+
+def _regexp_fullmatch(pattern: str, value: Optional[str]) -> bool:
+    """SQL 函数 regexp_fullmatch(pattern, value)：值是否完全匹配正则表达式"""
+    if value is None:
+        return False
+    return re.fullmatch(pattern, value) is not None
+
+
+def _register_functions(dbapi_connection, connection_record) -> None:
+    """为新建的 SQLite 连接注册自定义函数"""
+    dbapi_connection.create_function("regexp_fullmatch", 2, _regexp_fullmatch, deterministic=True)
 
 
 class DatabaseManager:
     """数据库连接管理器"""
     
-    def __init__(self, db_path: str = "arkts_symbols.db"):
+    def __init__(self, 
+                 db_path: str = "arkts_symbols.db", 
+                 profile: Union[str, EngineProfile] = "safe"):
         """
         初始化数据库管理器
         
         Args:
             db_path: 数据库文件路径
+            profile: 引擎性能配置（bulk_load / serving / safe 或 EngineProfile）
         """
         self.db_path = db_path
-        self.engine = create_engine(f"sqlite:///{db_path}", echo=False)
-        self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
+        self.SessionLocal = sessionmaker(autoflush=False, autocommit=False)
+        self.set_profile(profile)
+    
+    def set_profile(self, profile: Union[str, EngineProfile]) -> None:
+        """
+        切换引擎性能配置（例如全量索引后从 bulk_load 切换到 serving）
+        
+        会释放现有连接池并按新配置重建引擎，之后建立的连接执行新配置的 PRAGMA。
+        
+        Args:
+            profile: 配置名称或配置对象
+        """
+        self.profile = get_profile(profile)
+        
+        # 内存数据库的数据只存在于唯一的连接中，不能重建引擎
+        in_memory = self.db_path in ("", ":memory:")
+        if getattr(self, "engine", None) is not None:
+            if in_memory:
+                return
+            self.engine.dispose()
+        
+        # 内存数据库使用单连接池，不支持连接池大小参数
+        pool_options = {} if in_memory else dict(self.profile.pool_options)
+        self.engine = create_engine(f"sqlite:///{self.db_path}", echo=False, **pool_options)
+        event.listen(self.engine, "connect", _register_functions)
+        event.listen(self.engine, "connect", self._apply_pragmas)
+        self.SessionLocal.configure(bind=self.engine)
+    
+    def _apply_pragmas(self, dbapi_connection, connection_record) -> None:
+        """为新建的连接执行当前配置的 PRAGMA"""
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in self.profile.pragmas():
+                cursor.execute(statement)
+        finally:
+            cursor.close()
         
     def create_tables(self):
-        """创建所有表"""
+        """创建所有表（已存在的表补充新增的可空列）"""
         Base.metadata.create_all(bind=self.engine)
+        self._add_missing_columns()
+    
+    def _add_missing_columns(self) -> None:
+        """为旧版本数据库中已存在的表补充后来新增的可空列"""
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing = {
+                    row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table.name}")')
+                }
+                for column in table.columns:
+                    if column.name in existing or not column.nullable:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    connection.exec_driver_sql(
+                        f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                    )
         
     def drop_tables(self):
         """删除所有表"""
@@ -62,32 +142,222 @@ class SymbolRepository:
         """
         self.db_manager = db_manager
         
+        # 类型驻留缓存：类型完整标识 -> 类型ID，首次使用时从 types 表预热
+        self._type_ids: Optional[Dict[TypeKey, int]] = None
+        
+        # 反向缓存：类型ID -> 类型完整标识，读取符号时据此还原类型信息
+        self._type_keys: Optional[Dict[int, TypeKey]] = None
+    
+    @contextmanager
+    def _use_session(self, session: Optional[Session] = None) -> Generator[Session, None, None]:
+        """使用调用方的会话（同一事务）或新开一个会话"""
+        if session is not None:
+            yield session
+        else:
+            with self.db_manager.get_session() as own_session:
+                yield own_session
+        
     # ========== 类型操作 ==========
     
     def save_type(self, type_info: TypeInfo, session: Session) -> TypeModel:
-        """保存类型信息"""
-        # 检查是否已存在
-        existing = session.query(TypeModel).filter(
-            TypeModel.name == type_info.name,
-            TypeModel.is_array == type_info.is_array,
-            TypeModel.nullable == type_info.nullable
-        ).first()
-        
-        if existing:
-            return existing
-            
-        type_model = TypeModel(
-            name=type_info.name,
-            is_primitive=type_info.is_primitive,
-            is_array=type_info.is_array,
-            is_generic=type_info.is_generic,
-            generic_params=type_info.generic_params,
-            nullable=type_info.nullable
+        """保存类型信息（通过类型驻留缓存查重）"""
+        type_id = self.intern_types([type_info], session)[self.type_key(type_info)]
+        return cast(TypeModel, session.get(TypeModel, type_id))
+    
+    @staticmethod
+    def _row_type_key(name: str, is_primitive: Optional[bool], is_array: Optional[bool],
+                      is_generic: Optional[bool], generic_params: Optional[List[str]],
+                      nullable: Optional[bool]) -> TypeKey:
+        """由 types 表的列值构造类型完整标识"""
+        return (name, bool(is_primitive), bool(is_array), bool(is_generic),
+                tuple(generic_params or ()), bool(nullable))
+    
+    @staticmethod
+    def type_key(type_info: TypeInfo) -> TypeKey:
+        """
+        类型的完整标识（类型驻留缓存的键）
+        
+        Args:
+            type_info: 类型信息
+            
+        Returns:
+            (名称, 是否原始类型, 是否数组, 是否泛型, 泛型参数, 是否可空)
+        """
+        return (
+            type_info.name,
+            bool(type_info.is_primitive),
+            bool(type_info.is_array),
+            bool(type_info.is_generic),
+            tuple(type_info.generic_params or ()),
+            bool(type_info.nullable),
         )
+    
+    def warm_type_cache(self) -> int:
+        """
+        从 types 表加载类型驻留缓存（同一标识有多行时取ID最小的）
         
-        session.add(type_model)
-        session.flush()
-        return type_model
+        Returns:
+            缓存的类型数量
+        """
+        with self.db_manager.get_session() as session:
+            rows = session.execute(
+                select(TypeModel.id, TypeModel.name, TypeModel.is_primitive, TypeModel.is_array,
+                       TypeModel.is_generic, TypeModel.generic_params, TypeModel.nullable)
+                .order_by(TypeModel.id)
+            )
+            cache: Dict[TypeKey, int] = {}
+            keys: Dict[int, TypeKey] = {}
+            for type_id, *columns in rows:
+                key = self._row_type_key(*columns)
+                cache.setdefault(key, type_id)
+                keys[type_id] = key
+        
+        self._type_ids = cache
+        self._type_keys = keys
+        return len(cache)
+    
+    def clear_type_cache(self) -> None:
+        """清空类型驻留缓存（下次使用时重新从数据库加载）"""
+        self._type_ids = None
+        self._type_keys = None
+    
+    def _load_type_keys(self, type_ids: Iterable[Optional[int]], session: Session) -> Dict[int, TypeKey]:
+        """
+        确保类型ID都在反向缓存中（未命中的ID一次查询）
+        
+        Args:
+            type_ids: 类型ID（可包含None和重复）
+            session: 数据库会话
+            
+        Returns:
+            类型ID到类型完整标识的映射
+        """
+        if self._type_keys is None:
+            self.warm_type_cache()
+        keys = cast(Dict[int, TypeKey], self._type_keys)
+        
+        missing = {type_id for type_id in type_ids if type_id is not None and type_id not in keys}
+        if missing:
+            rows = session.execute(
+                select(TypeModel.id, TypeModel.name, TypeModel.is_primitive, TypeModel.is_array,
+                       TypeModel.is_generic, TypeModel.generic_params, TypeModel.nullable)
+                .where(TypeModel.id.in_(missing))
+            )
+            for type_id, *columns in rows:
+                keys[type_id] = self._row_type_key(*columns)
+        return keys
+    
+    def _type_info(self, type_id: Optional[int], session: Optional[Session]) -> Optional[TypeInfo]:
+        """由类型ID还原类型信息（每次返回新的对象）"""
+        if type_id is None:
+            return None
+        keys = self._type_keys
+        if keys is None or type_id not in keys:
+            if session is None:
+                return None
+            keys = self._load_type_keys([type_id], session)
+        key = keys.get(type_id)
+        if key is None:
+            return None
+        name, is_primitive, is_array, is_generic, generic_params, nullable = key
+        return TypeInfo(
+            name=name,
+            is_primitive=is_primitive,
+            is_array=is_array,
+            is_generic=is_generic,
+            generic_params=list(generic_params),
+            nullable=nullable
+        )
+    
+    def intern_types(self, type_infos: List[TypeInfo], session: Session) -> Dict[TypeKey, int]:
+        """
+        批量驻留类型信息
+        
+        先查进程内缓存（首次使用时从 types 表预热），缓存未命中的类型
+        只查询一次数据库，仍不存在的通过一条 INSERT ... RETURNING 插入。
+        新插入的类型在会话提交后才进入缓存，回滚时丢弃。
+        
+        Args:
+            type_infos: 类型信息列表（可重复）
+            session: 数据库会话
+            
+        Returns:
+            类型标识到类型ID的映射
+        """
+        if self._type_ids is None:
+            self.warm_type_cache()
+        cache = cast(Dict[TypeKey, int], self._type_ids)
+        uncommitted: Dict[TypeKey, int] = session.info.get("interned_types", {})
+        
+        type_ids: Dict[TypeKey, int] = {}
+        pending: Dict[TypeKey, TypeInfo] = {}
+        for type_info in type_infos:
+            key = self.type_key(type_info)
+            if key in type_ids or key in pending:
+                continue
+            type_id = cache.get(key, uncommitted.get(key))
+            if type_id is not None:
+                type_ids[key] = type_id
+            else:
+                pending[key] = type_info
+        if not pending:
+            return type_ids
+        
+        # 缓存未命中：可能由其他连接写入，查询一次
+        names = list({key[0] for key in pending})
+        existing = session.execute(
+            select(TypeModel.id, TypeModel.name, TypeModel.is_primitive, TypeModel.is_array,
+                   TypeModel.is_generic, TypeModel.generic_params, TypeModel.nullable)
+            .where(TypeModel.name.in_(names))
+            .order_by(TypeModel.id)
+        )
+        for type_id, *columns in existing:
+            key = self._row_type_key(*columns)
+            if key in pending and key not in type_ids:
+                type_ids[key] = type_id
+                cache[key] = type_id
+        
+        # 插入仍缺失的类型
+        missing = [(key, type_info) for key, type_info in pending.items() if key not in type_ids]
+        if missing:
+            rows = [
+                {
+                    "name": type_info.name,
+                    "is_primitive": type_info.is_primitive,
+                    "is_array": type_info.is_array,
+                    "is_generic": type_info.is_generic,
+                    "generic_params": type_info.generic_params,
+                    "nullable": type_info.nullable,
+                }
+                for _, type_info in missing
+            ]
+            statement = insert(TypeModel).returning(TypeModel.id, sort_by_parameter_order=True)
+            inserted = {key: type_id for (key, _), type_id in zip(missing, session.scalars(statement, rows))}
+            type_ids.update(inserted)
+            self._stage_types(session, inserted)
+        
+        return type_ids
+    
+    def _stage_types(self, session: Session, inserted: Dict[TypeKey, int]) -> None:
+        """记录会话内新插入的类型，提交后并入缓存，回滚时丢弃"""
+        if "interned_types" not in session.info:
+            session.info["interned_types"] = {}
+            
+            def on_commit(committed_session: Session) -> None:
+                staged = committed_session.info.pop("interned_types", {})
+                if self._type_ids is not None:
+                    for key, type_id in staged.items():
+                        self._type_ids.setdefault(key, type_id)
+                if self._type_keys is not None:
+                    for key, type_id in staged.items():
+                        self._type_keys[type_id] = key
+            
+            def on_rollback(rolled_back_session: Session) -> None:
+                rolled_back_session.info.pop("interned_types", None)
+            
+            event.listen(session, "after_commit", on_commit, once=True)
+            event.listen(session, "after_rollback", on_rollback, once=True)
+        session.info["interned_types"].update(inserted)
     
     # ========== 作用域操作 ==========
     
@@ -128,74 +398,138 @@ class SymbolRepository:
             ).all()
             return [self._scope_model_to_entity(sm) for sm in scope_models]
     
+    def save_scopes_batch(self, scopes: List[Scope], session: Optional[Session] = None) -> List[int]:
+        """
+        批量保存作用域
+        
+        作用域的 id/parent_id 视为批内的临时ID：按嵌套深度逐层插入（每层一条
+        INSERT ... RETURNING），在内存中把子作用域的 parent_id 映射为父作用域的新ID。
+        parent_id 不指向批内作用域时按已存在的数据库ID原样保存。
+        保存后 scope.id 和 scope.parent_id 更新为数据库ID。
+        
+        Args:
+            scopes: 作用域列表
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+            
+        Returns:
+            作用域ID列表（与输入顺序一致）
+        """
+        if not scopes:
+            return []
+        
+        by_temp_id = {scope.id: scope for scope in scopes if scope.id is not None}
+        
+        # 按批内嵌套深度分层，父作用域总在子作用域之前插入
+        levels: Dict[int, List[Scope]] = {}
+        for scope in scopes:
+            depth = 0
+            current = scope
+            while current.parent_id is not None and current.parent_id in by_temp_id:
+                current = by_temp_id[current.parent_id]
+                depth += 1
+            levels.setdefault(depth, []).append(scope)
+        
+        new_ids: Dict[int, int] = {}
+        statement = insert(ScopeModel).returning(ScopeModel.id, sort_by_parameter_order=True)
+        with self._use_session(session) as session:
+            for depth in sorted(levels):
+                level = levels[depth]
+                rows = []
+                for scope in level:
+                    parent_id = scope.parent_id
+                    if parent_id is not None and parent_id in by_temp_id:
+                        parent_id = new_ids[id(by_temp_id[parent_id])]
+                    scope.parent_id = parent_id
+                    rows.append({
+                        "scope_type": scope.scope_type,
+                        "file_path": scope.file_path,
+                        "parent_id": parent_id,
+                        "start_line": scope.range.start.line,
+                        "start_column": scope.range.start.column,
+                        "start_offset": scope.range.start.offset,
+                        "end_line": scope.range.end.line,
+                        "end_column": scope.range.end.column,
+                        "end_offset": scope.range.end.offset,
+                        "meta_data": scope.metadata,
+                    })
+                for scope, scope_id in zip(level, session.scalars(statement, rows)):
+                    new_ids[id(scope)] = scope_id
+        
+        for scope in scopes:
+            scope.id = new_ids[id(scope)]
+        return [scope.id for scope in scopes]
+    
     # ========== 符号操作 ==========
     
     def save_symbol(self, symbol: Symbol):
         """保存符号"""
         with self.db_manager.get_session() as session:
             # 保存类型信息
-            type_id = None
-            if symbol.type_info:
-                type_model = self.save_type(symbol.type_info, session)
-                type_id = type_model.id
-                
-            return_type_id = None
-            if symbol.return_type:
-                return_type_model = self.save_type(symbol.return_type, session)
-                return_type_id = return_type_model.id
-            
-            # 将 ArkUI 相关字段保存到 meta_data 中
-            meta_data = symbol.metadata.copy() if symbol.metadata else {}
-            if symbol.arkui_decorators:
-                meta_data['arkui_decorators'] = symbol.arkui_decorators
-            if symbol.component_type:
-                meta_data['component_type'] = symbol.component_type
-            if symbol.style_bindings:
-                meta_data['style_bindings'] = symbol.style_bindings
-            if symbol.event_handlers:
-                meta_data['event_handlers'] = symbol.event_handlers
-            if symbol.resource_refs:
-                meta_data['resource_refs'] = symbol.resource_refs
-            
-            symbol_model = SymbolModel(
-                name=symbol.name,
-                symbol_type=symbol.symbol_type,
-                file_path=symbol.file_path,
-                scope_id=symbol.scope_id,
-                start_line=symbol.range.start.line,
-                start_column=symbol.range.start.column,
-                start_offset=symbol.range.start.offset,
-                end_line=symbol.range.end.line,
-                end_column=symbol.range.end.column,
-                end_offset=symbol.range.end.offset,
-                type_id=type_id,
-                return_type_id=return_type_id,
-                visibility=symbol.visibility,
-                is_static=symbol.is_static,
-                is_abstract=symbol.is_abstract,
-                is_readonly=symbol.is_readonly,
-                is_async=symbol.is_async,
-                is_exported=symbol.is_exported,
-                is_export_default=symbol.is_export_default,
-                extends=symbol.extends,
-                implements=symbol.implements,
-                documentation=symbol.documentation,
-                decorators=symbol.decorators,
-                meta_data=meta_data
-            )
+            type_infos = [t for t in (symbol.type_info, symbol.return_type) if t]
+            type_ids = self.intern_types(type_infos, session)
+            type_id = type_ids[self.type_key(symbol.type_info)] if symbol.type_info else None
+            return_type_id = type_ids[self.type_key(symbol.return_type)] if symbol.return_type else None
+            
+            symbol_model = SymbolModel(**self._symbol_to_row(symbol, type_id, return_type_id))
             
             session.add(symbol_model)
             session.flush()
             symbol.id = cast(int, symbol_model.id)
             return symbol_model.id
     
+    def _symbol_to_row(self, 
+                       symbol: Symbol, 
+                       type_id: Optional[int], 
+                       return_type_id: Optional[int]) -> Dict[str, Any]:
+        """将符号转换为 symbols 表的列值"""
+        # 将 ArkUI 相关字段保存到 meta_data 中
+        meta_data = symbol.metadata.copy() if symbol.metadata else {}
+        if symbol.arkui_decorators:
+            meta_data['arkui_decorators'] = symbol.arkui_decorators
+        if symbol.component_type:
+            meta_data['component_type'] = symbol.component_type
+        if symbol.style_bindings:
+            meta_data['style_bindings'] = symbol.style_bindings
+        if symbol.event_handlers:
+            meta_data['event_handlers'] = symbol.event_handlers
+        if symbol.resource_refs:
+            meta_data['resource_refs'] = symbol.resource_refs
+        
+        return {
+            "id": symbol.id,
+            "name": symbol.name,
+            "symbol_type": symbol.symbol_type,
+            "file_path": symbol.file_path,
+            "scope_id": symbol.scope_id,
+            "start_line": symbol.range.start.line,
+            "start_column": symbol.range.start.column,
+            "start_offset": symbol.range.start.offset,
+            "end_line": symbol.range.end.line,
+            "end_column": symbol.range.end.column,
+            "end_offset": symbol.range.end.offset,
+            "type_id": type_id,
+            "return_type_id": return_type_id,
+            "visibility": symbol.visibility,
+            "is_static": symbol.is_static,
+            "is_abstract": symbol.is_abstract,
+            "is_readonly": symbol.is_readonly,
+            "is_async": symbol.is_async,
+            "is_exported": symbol.is_exported,
+            "is_export_default": symbol.is_export_default,
+            "extends": symbol.extends,
+            "implements": symbol.implements,
+            "documentation": symbol.documentation,
+            "decorators": symbol.decorators,
+            "meta_data": meta_data,
+        }
+    
     def get_symbol_by_id(self, symbol_id: int) -> Optional[Symbol]:
         """根据ID获取符号"""
         with self.db_manager.get_session() as session:
             symbol_model = session.query(SymbolModel).filter(SymbolModel.id == symbol_id).first()
             if not symbol_model:
                 return None
-            return self._symbol_model_to_entity(symbol_model)
+            return self._symbol_model_to_entity(symbol_model, session)
     
     def get_symbols_by_name(self, name: str, file_path: Optional[str] = None) -> List[Symbol]:
         """根据名称查找符号"""
@@ -203,8 +537,7 @@ class SymbolRepository:
             query = session.query(SymbolModel).filter(SymbolModel.name == name)
             if file_path:
                 query = query.filter(SymbolModel.file_path == file_path)
-            symbol_models = query.all()
-            return [self._symbol_model_to_entity(sm) for sm in symbol_models]
+            return self._symbol_models_to_entities(query.all(), session)
     
     def get_symbols_by_file(self, file_path: str) -> List[Symbol]:
         """获取文件的所有符号"""
@@ -212,7 +545,45 @@ class SymbolRepository:
             symbol_models = session.query(SymbolModel).filter(
                 SymbolModel.file_path == file_path
             ).all()
-            return [self._symbol_model_to_entity(sm) for sm in symbol_models]
+            return self._symbol_models_to_entities(symbol_models, session)
+    
+    def get_symbols_by_ids(self, symbol_ids: Iterable[int]) -> Dict[int, Symbol]:
+        """
+        批量根据ID获取符号
+        
+        Args:
+            symbol_ids: 符号ID（可重复）
+            
+        Returns:
+            符号ID到符号的映射（不存在的ID不包含在内）
+        """
+        ids = list(set(symbol_ids))
+        if not ids:
+            return {}
+        with self.db_manager.get_session() as session:
+            symbol_models = session.scalars(select(SymbolModel).where(SymbolModel.id.in_(ids))).all()
+            return {symbol.id: symbol for symbol in self._symbol_models_to_entities(symbol_models, session)}
+    
+    def iter_all_symbols(self, batch_size: int = 1000) -> Iterator[Symbol]:
+        """
+        按文件分组遍历数据库中的所有符号（用于启动时批量预热内存索引）
+        
+        Args:
+            batch_size: 每批从数据库读取的行数
+            
+        Yields:
+            符号（按文件路径和ID排序）
+        """
+        with self.db_manager.get_session() as session:
+            query = session.query(SymbolModel).order_by(
+                SymbolModel.file_path, SymbolModel.id
+            ).yield_per(batch_size)
+            models = iter(query)
+            while True:
+                batch = list(islice(models, batch_size))
+                if not batch:
+                    break
+                yield from self._symbol_models_to_entities(batch, session)
     
     def get_symbols_by_type(self, symbol_type: SymbolType, file_path: Optional[str] = None) -> List[Symbol]:
         """根据类型查找符号"""
@@ -220,26 +591,137 @@ class SymbolRepository:
             query = session.query(SymbolModel).filter(SymbolModel.symbol_type == symbol_type)
             if file_path:
                 query = query.filter(SymbolModel.file_path == file_path)
-            symbol_models = query.all()
-            return [self._symbol_model_to_entity(sm) for sm in symbol_models]
+            return self._symbol_models_to_entities(query.all(), session)
     
-    def get_symbol_at_position(self, file_path: str, line: int, column: int) -> Optional[Symbol]:
-        """获取指定位置的符号"""
-        with self.db_manager.get_session() as session:
-            symbol_model = session.query(SymbolModel).filter(
-                SymbolModel.file_path == file_path,
-                SymbolModel.start_line <= line,
-                SymbolModel.end_line >= line
-            ).first()
-            
-            if symbol_model:
-                # 进一步检查列范围
-                if (symbol_model.start_line == line and symbol_model.start_column <= column) or \
-                   (symbol_model.end_line == line and symbol_model.end_column >= column) or \
-                   (symbol_model.start_line < line < symbol_model.end_line):
-                    return self._symbol_model_to_entity(symbol_model)
+    def query_symbols(self,
+                      name: Optional[str] = None,
+                      name_prefix: Optional[str] = None,
+                      name_suffix: Optional[str] = None,
+                      name_contains: Sequence[str] = (),
+                      name_regex: Optional[str] = None,
+                      symbol_types: Optional[Sequence[SymbolType]] = None,
+                      file_path: Optional[str] = None,
+                      scope_id: Optional[int] = None,
+                      is_public: Optional[bool] = None,
+                      is_static: Optional[bool] = None,
+                      is_abstract: Optional[bool] = None,
+                      has_type: Optional[bool] = None,
+                      extends: Optional[str] = None,
+                      implements: Optional[str] = None) -> List[Symbol]:
+        """
+        按组合条件查询符号（所有条件编译为一条 SQL 语句，名称比较区分大小写）
+        
+        Args:
+            name: 名称等于
+            name_prefix: 名称前缀（转换为索引可用的范围条件）
+            name_suffix: 名称后缀
+            name_contains: 名称必须包含的子串
+            name_regex: 名称完全匹配的正则表达式
+            symbol_types: 符号类型（任一）
+            file_path: 文件路径
+            scope_id: 作用域ID
+            is_public: 是否公开
+            is_static: 是否静态
+            is_abstract: 是否抽象
+            has_type: 是否有类型信息
+            extends: 继承的类名
+            implements: 实现的接口名
             
+        Returns:
+            符号列表
+        """
+        conditions = []
+        if name is not None:
+            conditions.append(SymbolModel.name == name)
+        if name_prefix:
+            conditions.append(SymbolModel.name >= name_prefix)
+            upper = self._prefix_upper_bound(name_prefix)
+            if upper is not None:
+                conditions.append(SymbolModel.name < upper)
+            else:
+                conditions.append(func.substr(SymbolModel.name, 1, len(name_prefix)) == name_prefix)
+        if name_suffix:
+            conditions.append(func.substr(SymbolModel.name, -len(name_suffix)) == name_suffix)
+        for text in name_contains:
+            conditions.append(func.instr(SymbolModel.name, text) > 0)
+        if name_regex is not None:
+            conditions.append(func.regexp_fullmatch(name_regex, SymbolModel.name))
+        if symbol_types:
+            conditions.append(SymbolModel.symbol_type.in_(list(symbol_types)))
+        if file_path:
+            conditions.append(SymbolModel.file_path == file_path)
+        if scope_id is not None:
+            conditions.append(SymbolModel.scope_id == scope_id)
+        if is_public is not None:
+            if is_public:
+                conditions.append(SymbolModel.visibility == Visibility.PUBLIC)
+            else:
+                conditions.append(SymbolModel.visibility != Visibility.PUBLIC)
+        if is_static is not None:
+            conditions.append(SymbolModel.is_static == is_static)
+        if is_abstract is not None:
+            conditions.append(SymbolModel.is_abstract == is_abstract)
+        if has_type is not None:
+            if has_type:
+                conditions.append(SymbolModel.type_id.isnot(None))
+            else:
+                conditions.append(SymbolModel.type_id.is_(None))
+        if extends:
+            conditions.append(self._json_list_contains(SymbolModel.extends, extends))
+        if implements:
+            conditions.append(self._json_list_contains(SymbolModel.implements, implements))
+        
+        with self.db_manager.get_session() as session:
+            symbol_models = session.scalars(select(SymbolModel).where(*conditions)).all()
+            return self._symbol_models_to_entities(symbol_models, session)
+    
+    @staticmethod
+    def _prefix_upper_bound(prefix: str) -> Optional[str]:
+        """前缀范围的上界（末字符加一），无法构造时返回None"""
+        last = ord(prefix[-1])
+        if last >= 0x10FFFF or 0xD7FF <= last < 0xE000:
             return None
+        return prefix[:-1] + chr(last + 1)
+    
+    @staticmethod
+    def _json_list_contains(column, value: str):
+        """JSON 数组列包含指定值的条件"""
+        elements = func.json_each(column).table_valued("value")
+        return exists(select(literal(1)).select_from(elements).where(elements.c.value == value))
+    
+    def get_symbol_at_position(self, file_path: str, line: int, column: int) -> Optional[Symbol]:
+        """
+        获取包含指定位置的最内层符号
+        
+        范围按 Range.contains 的半开区间语义判断；最内层为起始位置最靠后、
+        起始位置相同时结束位置最靠前的符号（与 IntervalIndex 一致）。
+        
+        Args:
+            file_path: 文件路径
+            line: 行号
+            column: 列号
+            
+        Returns:
+            符号或None
+        """
+        statement = (
+            select(SymbolModel)
+            .where(
+                SymbolModel.file_path == file_path,
+                or_(SymbolModel.start_line < line,
+                    and_(SymbolModel.start_line == line, SymbolModel.start_column <= column)),
+                or_(SymbolModel.end_line > line,
+                    and_(SymbolModel.end_line == line, SymbolModel.end_column > column))
+            )
+            .order_by(SymbolModel.start_line.desc(), SymbolModel.start_column.desc(),
+                      SymbolModel.end_line, SymbolModel.end_column, SymbolModel.id)
+            .limit(1)
+        )
+        with self.db_manager.get_session() as session:
+            symbol_model = session.scalars(statement).first()
+            if symbol_model is None:
+                return None
+            return self._symbol_model_to_entity(symbol_model, session)
     
     # ========== 引用操作 ==========
     
@@ -253,6 +735,7 @@ class SymbolRepository:
                 line=reference.position.line,
                 column=reference.position.column,
                 offset=reference.position.offset,
+                end_column=reference.end_column,
                 context=reference.context,
                 meta_data=reference.metadata
             )
@@ -271,76 +754,505 @@ class SymbolRepository:
             return [self._reference_model_to_entity(rm) for rm in ref_models]
     
     def get_references_by_file(self, file_path: str) -> List[Reference]:
-        """获取文件中的所有引用"""
+        """获取文件中的所有引用（按行、起始列、结束列排序）"""
         with self.db_manager.get_session() as session:
             ref_models = session.query(ReferenceModel).filter(
                 ReferenceModel.file_path == file_path
+            ).order_by(
+                ReferenceModel.line, ReferenceModel.column, ReferenceModel.end_column, ReferenceModel.id
             ).all()
             return [self._reference_model_to_entity(rm) for rm in ref_models]
     
-    # ========== 批量操作 ==========
+    def get_reference_at_position(self, file_path: str, line: int, column: int) -> Optional[Reference]:
+        """
+        获取覆盖指定位置的引用（起始列最靠后的一个）
+        
+        Args:
+            file_path: 文件路径
+            line: 行号
+            column: 列号
+            
+        Returns:
+            引用或None
+        """
+        # 结束列未知时按一个字符处理
+        end_column = func.coalesce(ReferenceModel.end_column, ReferenceModel.column + 1)
+        statement = (
+            select(ReferenceModel)
+            .where(
+                ReferenceModel.file_path == file_path,
+                ReferenceModel.line == line,
+                ReferenceModel.column <= column,
+                end_column > column
+            )
+            .order_by(ReferenceModel.column.desc(), end_column, ReferenceModel.id)
+            .limit(1)
+        )
+        with self.db_manager.get_session() as session:
+            ref_model = session.scalars(statement).first()
+            return self._reference_model_to_entity(ref_model) if ref_model else None
+    
+    def save_references_batch(self, 
+                              references: List[Reference], 
+                              session: Optional[Session] = None) -> List[int]:
+        """
+        批量保存引用（一条 INSERT ... RETURNING）
+        
+        Args:
+            references: 引用列表
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+            
+        Returns:
+            引用ID列表（与输入顺序一致）
+        """
+        if not references:
+            return []
+        
+        rows = [
+            {
+                "symbol_id": reference.symbol_id,
+                "file_path": reference.file_path,
+                "reference_type": reference.reference_type,
+                "line": reference.position.line,
+                "column": reference.position.column,
+                "offset": reference.position.offset,
+                "end_column": reference.end_column,
+                "context": reference.context,
+                "meta_data": reference.metadata,
+            }
+            for reference in references
+        ]
+        statement = insert(ReferenceModel).returning(ReferenceModel.id, sort_by_parameter_order=True)
+        with self._use_session(session) as session:
+            ids = list(session.scalars(statement, rows))
+        
+        for reference, reference_id in zip(references, ids):
+            reference.id = reference_id
+        return ids
+    
+    # ========== 关系操作 ==========
     
-    def save_symbols_batch(self, symbols: List[Symbol]) -> List[int]:
-        """批量保存符号"""
+    # 层次查询的最大深度（防止关系中存在环时无限递归）
+    MAX_HIERARCHY_DEPTH = 64
+    
+    def save_relations_batch(self, 
+                             relations: List[SymbolRelation], 
+                             session: Optional[Session] = None) -> int:
+        """
+        批量保存符号关系（已存在的关系忽略）
+        
+        Args:
+            relations: 关系列表
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+            
+        Returns:
+            提交的关系数量
+        """
+        if not relations:
+            return 0
+        
+        rows = [
+            {
+                "from_symbol_id": relation.from_symbol_id,
+                "to_symbol_id": relation.to_symbol_id,
+                "relation_type": relation.relation_type,
+                "meta_data": relation.metadata,
+            }
+            for relation in relations
+        ]
+        with self._use_session(session) as session:
+            session.execute(insert(SymbolRelationModel).prefix_with("OR IGNORE"), rows)
+        return len(rows)
+    
+    def get_relations(self, 
+                      symbol_id: int, 
+                      relation_types: Optional[Sequence[str]] = None,
+                      incoming: bool = False) -> List[SymbolRelation]:
+        """
+        获取符号的直接关系
+        
+        Args:
+            symbol_id: 符号ID
+            relation_types: 关系类型（可选）
+            incoming: True 时返回指向该符号的关系，否则返回从该符号出发的关系
+            
+        Returns:
+            关系列表
+        """
+        column = SymbolRelationModel.to_symbol_id if incoming else SymbolRelationModel.from_symbol_id
+        statement = select(SymbolRelationModel).where(column == symbol_id)
+        if relation_types:
+            statement = statement.where(SymbolRelationModel.relation_type.in_(list(relation_types)))
         with self.db_manager.get_session() as session:
-            ids = []
-            for symbol in symbols:
-                # 保存类型信息
-                type_id = None
-                if symbol.type_info:
-                    type_model = self.save_type(symbol.type_info, session)
-                    type_id = type_model.id
-                    
-                return_type_id = None
-                if symbol.return_type:
-                    return_type_model = self.save_type(symbol.return_type, session)
-                    return_type_id = return_type_model.id
-                
-                # 将 ArkUI 相关字段保存到 meta_data 中
-                meta_data = symbol.metadata.copy() if symbol.metadata else {}
-                if symbol.arkui_decorators:
-                    meta_data['arkui_decorators'] = symbol.arkui_decorators
-                if symbol.component_type:
-                    meta_data['component_type'] = symbol.component_type
-                if symbol.style_bindings:
-                    meta_data['style_bindings'] = symbol.style_bindings
-                if symbol.event_handlers:
-                    meta_data['event_handlers'] = symbol.event_handlers
-                if symbol.resource_refs:
-                    meta_data['resource_refs'] = symbol.resource_refs
-                
-                symbol_model = SymbolModel(
-                    name=symbol.name,
-                    symbol_type=symbol.symbol_type,
-                    file_path=symbol.file_path,
-                    scope_id=symbol.scope_id,
-                    start_line=symbol.range.start.line,
-                    start_column=symbol.range.start.column,
-                    start_offset=symbol.range.start.offset,
-                    end_line=symbol.range.end.line,
-                    end_column=symbol.range.end.column,
-                    end_offset=symbol.range.end.offset,
-                    type_id=type_id,
-                    return_type_id=return_type_id,
-                    visibility=symbol.visibility,
-                    is_static=symbol.is_static,
-                    is_abstract=symbol.is_abstract,
-                    is_readonly=symbol.is_readonly,
-                    is_async=symbol.is_async,
-                    is_exported=symbol.is_exported,
-                    is_export_default=symbol.is_export_default,
-                    extends=symbol.extends,
-                    implements=symbol.implements,
-                    documentation=symbol.documentation,
-                    decorators=symbol.decorators,
-                    meta_data=meta_data
+            return [
+                SymbolRelation(
+                    from_symbol_id=model.from_symbol_id,
+                    to_symbol_id=model.to_symbol_id,
+                    relation_type=model.relation_type,
+                    metadata=model.meta_data or {}
                 )
-                
-                session.add(symbol_model)
-                session.flush()
-                ids.append(symbol_model.id)
-                symbol.id = cast(int, symbol_model.id)
-                
+                for model in session.scalars(statement.order_by(SymbolRelationModel.id))
+            ]
+    
+    def get_related_symbols(self, 
+                            symbol_id: int, 
+                            relation_types: Sequence[str],
+                            ancestors: bool) -> List[Symbol]:
+        """
+        通过递归 CTE 获取关系闭包中的所有符号
+        
+        Args:
+            symbol_id: 起始符号ID
+            relation_types: 沿哪些类型的关系遍历
+            ancestors: True 时沿关系方向向上（基类、接口），否则向下（子类、实现者）
+            
+        Returns:
+            符号列表（按距离排序，距离相同时按ID排序，不含起始符号）
+        """
+        relation = SymbolRelationModel
+        types = list(relation_types)
+        if ancestors:
+            start_column, next_column = relation.from_symbol_id, relation.to_symbol_id
+        else:
+            start_column, next_column = relation.to_symbol_id, relation.from_symbol_id
+        
+        closure = (
+            select(next_column.label("symbol_id"), literal(1).label("depth"))
+            .where(start_column == symbol_id, relation.relation_type.in_(types))
+            .cte("closure", recursive=True)
+        )
+        closure = closure.union(
+            select(next_column, closure.c.depth + 1)
+            .join(closure, start_column == closure.c.symbol_id)
+            .where(relation.relation_type.in_(types), closure.c.depth < self.MAX_HIERARCHY_DEPTH)
+        )
+        nearest = (
+            select(closure.c.symbol_id, func.min(closure.c.depth).label("depth"))
+            .where(closure.c.symbol_id != symbol_id)
+            .group_by(closure.c.symbol_id)
+            .subquery()
+        )
+        statement = (
+            select(SymbolModel)
+            .join(nearest, SymbolModel.id == nearest.c.symbol_id)
+            .order_by(nearest.c.depth, SymbolModel.id)
+        )
+        with self.db_manager.get_session() as session:
+            return self._symbol_models_to_entities(session.scalars(statement).all(), session)
+    
+    def get_subclasses(self, symbol_id: int) -> List[Symbol]:
+        """获取类的所有（直接和间接）子类"""
+        return self.get_related_symbols(symbol_id, ["extends"], ancestors=False)
+    
+    def get_implementors(self, symbol_id: int) -> List[Symbol]:
+        """获取接口的所有实现类（包括通过子接口实现的类和实现类的子类）"""
+        descendants = self.get_related_symbols(symbol_id, ["extends", "implements"], ancestors=False)
+        return [s for s in descendants if s.symbol_type != SymbolType.INTERFACE]
+    
+    def get_ancestors(self, symbol_id: int) -> List[Symbol]:
+        """获取符号的所有祖先（基类和接口），由近及远"""
+        return self.get_related_symbols(symbol_id, ["extends", "implements"], ancestors=True)
+    
+    # ========== 文件清单 ==========
+    
+    def get_file_manifest(self) -> Dict[str, FileFingerprint]:
+        """
+        获取文件清单
+        
+        Returns:
+            文件路径到文件指纹的映射
+        """
+        with self.db_manager.get_session() as session:
+            rows = session.execute(
+                select(FileManifestModel.file_path, FileManifestModel.size,
+                       FileManifestModel.mtime_ns, FileManifestModel.content_hash)
+            )
+            return {row[0]: FileFingerprint(*row) for row in rows}
+    
+    def get_file_fingerprint(self, file_path: str) -> Optional[FileFingerprint]:
+        """
+        获取单个文件的指纹
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            文件指纹或None
+        """
+        with self.db_manager.get_session() as session:
+            row = session.execute(
+                select(FileManifestModel.file_path, FileManifestModel.size,
+                       FileManifestModel.mtime_ns, FileManifestModel.content_hash)
+                .where(FileManifestModel.file_path == file_path)
+            ).first()
+            return FileFingerprint(*row) if row else None
+    
+    def save_file_fingerprints(self, 
+                               fingerprints: List[FileFingerprint], 
+                               session: Optional[Session] = None) -> None:
+        """
+        批量写入文件指纹（已存在的文件覆盖）
+        
+        Args:
+            fingerprints: 文件指纹列表
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+        """
+        if not fingerprints:
+            return
+        
+        statement = sqlite_insert(FileManifestModel)
+        statement = statement.on_conflict_do_update(
+            index_elements=[FileManifestModel.file_path],
+            set_={
+                "size": statement.excluded.size,
+                "mtime_ns": statement.excluded.mtime_ns,
+                "content_hash": statement.excluded.content_hash,
+                "indexed_at": func.current_timestamp(),
+            }
+        )
+        rows = [
+            {
+                "file_path": fp.file_path,
+                "size": fp.size,
+                "mtime_ns": fp.mtime_ns,
+                "content_hash": fp.content_hash,
+            }
+            for fp in fingerprints
+        ]
+        with self._use_session(session) as session:
+            session.execute(statement, rows)
+    
+    # ========== 对外接口指纹 ==========
+    
+    def get_api_fingerprint(self, file_path: str, session: Optional[Session] = None) -> Optional[str]:
+        """
+        获取文件的对外接口指纹
+        
+        Args:
+            file_path: 文件路径
+            session: 数据库会话（可选）
+            
+        Returns:
+            指纹；文件未记录时返回None
+        """
+        with self._use_session(session) as session:
+            return session.scalar(
+                select(FileApiModel.api_hash).where(FileApiModel.file_path == file_path)
+            )
+    
+    def save_api_fingerprint(self, file_path: str, api_hash: str, session: Optional[Session] = None) -> None:
+        """
+        写入文件的对外接口指纹（已存在时覆盖）
+        
+        Args:
+            file_path: 文件路径
+            api_hash: 对外接口指纹
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+        """
+        statement = sqlite_insert(FileApiModel).values(file_path=file_path, api_hash=api_hash)
+        statement = statement.on_conflict_do_update(
+            index_elements=[FileApiModel.file_path],
+            set_={"api_hash": statement.excluded.api_hash, "updated_at": func.current_timestamp()}
+        )
+        with self._use_session(session) as session:
+            session.execute(statement)
+    
+    # ========== 导入绑定与文件依赖 ==========
+    
+    def save_import_bindings(self, bindings: List[ImportBinding], session: Optional[Session] = None) -> None:
+        """
+        批量保存导入绑定
+        
+        Args:
+            bindings: 导入绑定列表
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+        """
+        if not bindings:
+            return
+        
+        rows = [
+            {
+                "file_path": binding.file_path,
+                "local_name": binding.local_name,
+                "imported_name": binding.imported_name,
+                "module": binding.module,
+                "target_path": binding.target_path,
+                "line": binding.position.line,
+                "column": binding.position.column,
+                "end_column": binding.end_column,
+            }
+            for binding in bindings
+        ]
+        with self._use_session(session) as session:
+            session.execute(insert(ImportBindingModel), rows)
+    
+    def get_import_bindings(self, 
+                            file_path: Optional[str] = None, 
+                            target_path: Optional[str] = None,
+                            session: Optional[Session] = None) -> List[ImportBinding]:
+        """
+        获取导入绑定
+        
+        Args:
+            file_path: 导入方文件路径（可选）
+            target_path: 被导入的文件路径（可选）
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+            
+        Returns:
+            导入绑定列表（按文件和位置排序）
+        """
+        statement = select(ImportBindingModel)
+        if file_path is not None:
+            statement = statement.where(ImportBindingModel.file_path == file_path)
+        if target_path is not None:
+            statement = statement.where(ImportBindingModel.target_path == target_path)
+        statement = statement.order_by(ImportBindingModel.file_path, ImportBindingModel.line,
+                                       ImportBindingModel.column, ImportBindingModel.id)
+        with self._use_session(session) as session:
+            return [
+                ImportBinding(
+                    file_path=model.file_path,
+                    local_name=model.local_name,
+                    imported_name=model.imported_name,
+                    module=model.module,
+                    position=Position(model.line, model.column, 0),
+                    end_column=model.end_column,
+                    target_path=model.target_path
+                )
+                for model in session.scalars(statement)
+            ]
+    
+    def save_file_dependencies(self, 
+                               edges: Iterable[Tuple[str, str]], 
+                               session: Optional[Session] = None) -> None:
+        """
+        批量保存文件依赖边（已存在的边忽略）
+        
+        Args:
+            edges: (依赖方文件, 被依赖文件) 列表
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+        """
+        rows = [{"file_path": source, "depends_on": target} for source, target in edges if source != target]
+        if not rows:
+            return
+        with self._use_session(session) as session:
+            session.execute(insert(FileDependencyModel).prefix_with("OR IGNORE"), rows)
+    
+    def get_file_dependencies(self, file_path: str) -> List[str]:
+        """
+        获取文件直接依赖的文件
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            文件路径列表（有序）
+        """
+        with self.db_manager.get_session() as session:
+            return list(session.scalars(
+                select(FileDependencyModel.depends_on)
+                .where(FileDependencyModel.file_path == file_path)
+                .order_by(FileDependencyModel.depends_on)
+            ))
+    
+    def get_dependent_files(self, file_paths: Sequence[str], transitive: bool = False) -> List[str]:
+        """
+        获取依赖于给定文件的文件（反向依赖）
+        
+        传递闭包通过递归 CTE 计算，依赖环不会导致无限递归。
+        
+        Args:
+            file_paths: 被依赖的文件路径
+            transitive: 是否包含间接依赖的文件
+            
+        Returns:
+            文件路径列表（有序，不含给定文件本身）
+        """
+        if not file_paths:
+            return []
+        
+        dependency = FileDependencyModel
+        start = list(file_paths)
+        closure = (
+            select(dependency.file_path.label("file_path"))
+            .where(dependency.depends_on.in_(start))
+            .cte("dependents", recursive=True)
+        )
+        if transitive:
+            closure = closure.union(
+                select(dependency.file_path)
+                .join(closure, dependency.depends_on == closure.c.file_path)
+            )
+        statement = (
+            select(closure.c.file_path)
+            .where(closure.c.file_path.not_in(start))
+            .distinct()
+            .order_by(closure.c.file_path)
+        )
+        with self.db_manager.get_session() as session:
+            return list(session.scalars(statement))
+    
+    def delete_resolution_data(self, file_path: str, session: Optional[Session] = None) -> None:
+        """
+        删除文件中可以不重新解析源文件而重建的数据：
+        导入引用、从本文件符号出发的关系和本文件的依赖边
+        
+        Args:
+            file_path: 文件路径
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+        """
+        with self._use_session(session) as session:
+            session.query(ReferenceModel).filter(
+                ReferenceModel.file_path == file_path,
+                ReferenceModel.reference_type == ReferenceType.IMPORT
+            ).delete(synchronize_session=False)
+            file_symbol_ids = select(SymbolModel.id).where(SymbolModel.file_path == file_path)
+            session.query(SymbolRelationModel).filter(
+                SymbolRelationModel.from_symbol_id.in_(file_symbol_ids)
+            ).delete(synchronize_session=False)
+            session.query(FileDependencyModel).filter(
+                FileDependencyModel.file_path == file_path
+            ).delete(synchronize_session=False)
+    
+    # ========== 批量操作 ==========
+    
+    def save_symbols_batch(self, symbols: List[Symbol], session: Optional[Session] = None) -> List[int]:
+        """
+        批量保存符号
+        
+        类型信息先批量驻留（一次查询已有类型、一次插入缺失类型）。
+        符号都带有提取时计算的ID时直接批量插入，不回读ID；
+        否则通过一条多行 INSERT ... RETURNING 写入，缺少的ID由数据库分配。
+        
+        Args:
+            symbols: 符号列表
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+            
+        Returns:
+            符号ID列表（与输入顺序一致）
+        """
+        if not symbols:
+            return []
+        
+        with self._use_session(session) as session:
+            type_infos = [t for symbol in symbols for t in (symbol.type_info, symbol.return_type) if t]
+            type_ids = self.intern_types(type_infos, session)
+            
+            rows = []
+            for symbol in symbols:
+                type_id = type_ids[self.type_key(symbol.type_info)] if symbol.type_info else None
+                return_type_id = type_ids[self.type_key(symbol.return_type)] if symbol.return_type else None
+                rows.append(self._symbol_to_row(symbol, type_id, return_type_id))
+            
+            if all(symbol.id is not None for symbol in symbols):
+                session.execute(insert(SymbolModel), rows)
+                return [cast(int, symbol.id) for symbol in symbols]
+            
+            statement = insert(SymbolModel).returning(SymbolModel.id, sort_by_parameter_order=True)
+            ids = list(session.scalars(statement, rows))
+            
+            for symbol, symbol_id in zip(symbols, ids):
+                symbol.id = symbol_id
             
             return ids
     
@@ -352,31 +1264,141 @@ class SymbolRepository:
             ).delete()
             return count
     
-    # ========== 转换方法 ==========
+    def delete_file_data(self, file_path: str, session: Optional[Session] = None) -> int:
+        """
+        删除文件的所有符号、作用域、引用、涉及这些符号的关系以及文件清单记录
+        
+        其他文件指向这些符号的引用、本文件的导入绑定、接口指纹和依赖边同时删除，
+        其他文件指向本文件的依赖边保留（本文件重新出现时据此找到依赖方）。
+        
+        Args:
+            file_path: 文件路径
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+            
+        Returns:
+            删除的符号数量
+        """
+        with self._use_session(session) as session:
+            file_symbol_ids = select(SymbolModel.id).where(SymbolModel.file_path == file_path)
+            session.query(ReferenceModel).filter(or_(
+                ReferenceModel.file_path == file_path,
+                ReferenceModel.symbol_id.in_(file_symbol_ids)
+            )).delete(synchronize_session=False)
+            session.query(FileManifestModel).filter(
+                FileManifestModel.file_path == file_path
+            ).delete()
+            session.query(ImportBindingModel).filter(
+                ImportBindingModel.file_path == file_path
+            ).delete()
+            session.query(FileApiModel).filter(
+                FileApiModel.file_path == file_path
+            ).delete()
+            session.query(FileDependencyModel).filter(
+                FileDependencyModel.file_path == file_path
+            ).delete()
+            session.query(SymbolRelationModel).filter(or_(
+                SymbolRelationModel.from_symbol_id.in_(file_symbol_ids),
+                SymbolRelationModel.to_symbol_id.in_(file_symbol_ids)
+            )).delete(synchronize_session=False)
+            count = session.query(SymbolModel).filter(
+                SymbolModel.file_path == file_path
+            ).delete()
+            session.query(ScopeModel).filter(
+                ScopeModel.file_path == file_path
+            ).delete()
+            return count
     
-    def _symbol_model_to_entity(self, model: SymbolModel) -> Symbol:
-        """将数据库模型转换为实体"""
-        type_info = None
-        if model.type_info:
-            type_info = TypeInfo(
-                name=model.type_info.name,
-                is_primitive=model.type_info.is_primitive,
-                is_array=model.type_info.is_array,
-                is_generic=model.type_info.is_generic,
-                generic_params=model.type_info.generic_params or [],
-                nullable=model.type_info.nullable
-            )
+    def rename_file_data(self, old_path: str, new_path: str, session: Optional[Session] = None) -> Dict[int, int]:
+        """
+        将文件的符号、作用域、引用、导入绑定、依赖边、接口指纹和文件清单记录移动到新路径
+        
+        只更新 file_path 列，不需要重新提取。符号ID包含文件路径，按新路径重新计算，
+        引用和关系中的符号ID同步更新。新路径上残留的旧数据在同一事务中先删除。
+        
+        Args:
+            old_path: 原文件路径
+            new_path: 新文件路径
+            session: 数据库会话（可选，传入时与调用方处于同一事务）
+        
+        Returns:
+            移动的符号的ID映射（原ID -> 新ID），供其他保存符号ID的表（如 Chunk）同步更新
+        """
+        with self._use_session(session) as session:
+            self.delete_file_data(new_path, session=session)
+            for model in (ScopeModel, ReferenceModel, FileManifestModel, ImportBindingModel,
+                          FileDependencyModel, FileApiModel):
+                session.query(model).filter(
+                    model.file_path == old_path
+                ).update({model.file_path: new_path}, synchronize_session=False)
+            session.query(SymbolModel).filter(
+                SymbolModel.file_path == old_path
+            ).update({SymbolModel.file_path: new_path}, synchronize_session=False)
+            return self._rekey_symbols(new_path, session)
+    
+    def _rekey_symbols(self, file_path: str, session: Session) -> Dict[int, int]:
+        """
+        按文件路径重新计算文件中符号的ID，并更新指向这些符号的引用和关系
+        
+        Args:
+            file_path: 文件路径
+            session: 数据库会话
+            
+        Returns:
+            文件中所有符号的ID映射（原ID -> 新ID）
+        """
+        rows = session.execute(
+            select(SymbolModel.id, SymbolModel.name, SymbolModel.symbol_type,
+                   SymbolModel.start_offset, SymbolModel.end_offset)
+            .where(SymbolModel.file_path == file_path)
+        ).all()
+        new_ids = compute_symbol_ids(file_path, [
+            (row.name, row.symbol_type.value, row.start_offset or 0, row.end_offset or 0) for row in rows
+        ])
+        id_map = {row.id: new_id for row, new_id in zip(rows, new_ids)}
+        mapping = [{"old_id": old_id, "new_id": new_id} for old_id, new_id in id_map.items() if old_id != new_id]
+        if not mapping:
+            return id_map
         
-        return_type = None
-        if model.return_type_info:
-            return_type = TypeInfo(
-                name=model.return_type_info.name,
-                is_primitive=model.return_type_info.is_primitive,
-                is_array=model.return_type_info.is_array,
-                is_generic=model.return_type_info.is_generic,
-                generic_params=model.return_type_info.generic_params or [],
-                nullable=model.return_type_info.nullable
+        symbols = SymbolModel.__table__
+        references = ReferenceModel.__table__
+        relations = SymbolRelationModel.__table__
+        for column in (references.c.symbol_id, relations.c.from_symbol_id, relations.c.to_symbol_id, symbols.c.id):
+            statement = (
+                update(column.table)
+                .where(column == bindparam("old_id"))
+                .values({column.name: bindparam("new_id")})
             )
+            session.execute(statement, mapping)
+        return id_map
+    
+    # ========== 转换方法 ==========
+    
+    def _symbol_models_to_entities(self, models: Sequence[SymbolModel], session: Session) -> List[Symbol]:
+        """
+        批量将数据库模型转换为实体
+        
+        类型信息通过类型ID反向缓存还原，缓存未命中的类型一次查询，
+        不触发 type_info/return_type_info 关系的逐行懒加载。
+        
+        Args:
+            models: 符号模型列表
+            session: 模型所属的数据库会话
+            
+        Returns:
+            符号列表
+        """
+        self._load_type_keys(
+            [model.type_id for model in models] + [model.return_type_id for model in models],
+            session
+        )
+        return [self._symbol_model_to_entity(model, session) for model in models]
+    
+    def _symbol_model_to_entity(self, model: SymbolModel, session: Optional[Session] = None) -> Symbol:
+        """将数据库模型转换为实体"""
+        if session is None:
+            session = object_session(model)
+        type_info = self._type_info(model.type_id, session)
+        return_type = self._type_info(model.return_type_id, session)
         
         # 从 meta_data 中提取 ArkUI 相关字段
         meta_data = model.meta_data or {}
@@ -441,6 +1463,7 @@ class SymbolRepository:
             file_path=model.file_path,
             reference_type=model.reference_type,
             position=Position(model.line, model.column, model.offset),
+            end_column=model.end_column,
             context=model.context,
             metadata=model.meta_data or {},
             created_at=model.created_at
@@ -81,6 +81,7 @@ class SymbolModel(Base):
     """符号表"""
     __tablename__ = "symbols"
     
+    # 提取时计算的确定性ID（symbol_ids），未提供时由数据库分配
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False, index=True)
     symbol_type = Column(SQLEnum(SymbolType), nullable=False)
@@ -161,6 +162,7 @@ class ReferenceModel(Base):
     line = Column(Integer, nullable=False)
     column = Column(Integer, nullable=False)
     offset = Column(Integer, nullable=False)
+    end_column = Column(Integer, nullable=True)
     
     # 引用上下文
     context = Column(Text, nullable=True)
@@ -178,7 +180,7 @@ class ReferenceModel(Base):
         Index("idx_ref_symbol", "symbol_id"),
         Index("idx_ref_file", "file_path"),
         Index("idx_ref_type", "reference_type"),
-        Index("idx_ref_position", "file_path", "line", "column"),
+        Index("idx_ref_position", "file_path", "line", "column", "end_column"),
     )
     
     def __repr__(self):
@@ -209,3 +211,71 @@ class SymbolRelationModel(Base):
     
     def __repr__(self):
         return f"<SymbolRelationModel(from={self.from_symbol_id}, to={self.to_symbol_id}, type='{self.relation_type}')>"
+
+
+class FileManifestModel(Base):
+    """文件清单表（记录已索引文件的大小、修改时间和内容摘要）"""
+    __tablename__ = "file_manifest"
+    
+    file_path = Column(String(512), primary_key=True)
+    size = Column(Integer, nullable=False)
+    mtime_ns = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    
+    # 时间戳
+    indexed_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<FileManifestModel(file_path='{self.file_path}', hash='{self.content_hash}')>"
+
+
+class ImportBindingModel(Base):
+    """导入绑定表（重新解析引用时不需要重新解析源文件）"""
+    __tablename__ = "import_bindings"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    file_path = Column(String(512), nullable=False)
+    local_name = Column(String(255), nullable=False)
+    imported_name = Column(String(255), nullable=False)
+    module = Column(String(512), nullable=False)
+    target_path = Column(String(512), nullable=True)
+    line = Column(Integer, nullable=False)
+    column = Column(Integer, nullable=False)
+    end_column = Column(Integer, nullable=True)
+    
+    __table_args__ = (
+        Index("idx_import_file", "file_path"),
+        Index("idx_import_target", "target_path"),
+    )
+    
+    def __repr__(self):
+        return f"<ImportBindingModel(file='{self.file_path}', name='{self.local_name}', module='{self.module}')>"
+
+
+class FileDependencyModel(Base):
+    """文件依赖表（file_path 通过导入或继承/实现依赖 depends_on）"""
+    __tablename__ = "file_dependencies"
+    
+    file_path = Column(String(512), primary_key=True)
+    depends_on = Column(String(512), primary_key=True)
+    
+    __table_args__ = (
+        Index("idx_dependency_target", "depends_on"),
+    )
+    
+    def __repr__(self):
+        return f"<FileDependencyModel(file='{self.file_path}', depends_on='{self.depends_on}')>"
+
+
+class FileApiModel(Base):
+    """文件对外接口指纹表（与文件的符号在同一事务中写入）"""
+    __tablename__ = "file_api"
+    
+    file_path = Column(String(512), primary_key=True)
+    api_hash = Column(String(64), nullable=False)
+    
+    # 时间戳
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<FileApiModel(file_path='{self.file_path}', hash='{self.api_hash}')>"
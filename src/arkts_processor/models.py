@@ -90,6 +90,19 @@ class Range:
         return False
 
 
+@dataclass
+class TextEdit:
+    """
+    文本编辑（用于增量解析）
+    
+    range 基于应用本次编辑之前的文档内容，列号为UTF-8字节列（与 tree-sitter 一致），
+    字节偏移由行列重新计算，Position.offset 不参与计算。
+    多个编辑按顺序应用，每个编辑都基于前一个编辑应用后的文档。
+    """
+    range: Range
+    new_text: str
+
+
 @dataclass
 class TypeInfo:
     """类型信息"""
@@ -178,6 +191,12 @@ class Symbol:
                 self.range.start.column == other.range.start.column)
 
 
+@dataclass(eq=False)
+class SymbolTableVersion:
+    """作用域树共享的符号表版本号（可变，根作用域创建，子作用域构造时共享）"""
+    value: int = 0
+
+
 @dataclass
 class Scope:
     """作用域信息"""
@@ -196,10 +215,25 @@ class Scope:
     # 元数据
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # 父作用域的直接引用（不参与比较和输出，数据库ID变化后仍然有效）
+    parent: Optional['Scope'] = field(default=None, repr=False, compare=False)
+    
+    # 符号表版本号：同一作用域树的所有作用域共享一个对象（构造时从父作用域取得），
+    # 任一作用域通过 add_symbol 修改符号表时递增，名称查找缓存据此失效
+    symbol_table_version: SymbolTableVersion = field(
+        default_factory=SymbolTableVersion, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        """子作用域共享父作用域的符号表版本号"""
+        if self.parent is not None:
+            self.symbol_table_version = self.parent.symbol_table_version
+    
     def add_symbol(self, symbol: Symbol) -> None:
         """添加符号到作用域"""
         self.symbols[symbol.name] = symbol
         symbol.scope_id = self.id
+        self.symbol_table_version.value += 1
     
     def lookup(self, name: str, recursive: bool = True) -> Optional[Symbol]:
         """查找符号"""
@@ -207,10 +241,9 @@ class Scope:
         if name in self.symbols:
             return self.symbols[name]
         
-        # 递归查找父作用域
-        if recursive and self.parent_id is not None:
-            # 需要通过作用域管理器查找父作用域
-            pass
+        # 沿父作用域引用向上查找
+        if recursive and self.parent is not None:
+            return self.parent.lookup(name, recursive=True)
         
         return None
     
@@ -232,6 +265,9 @@ class Reference:
     position: Position
     reference_type: ReferenceType
     
+    # 结束列（与起始位置在同一行，不含；None 表示未知，按一个字符处理）
+    end_column: Optional[int] = None
+    
     # 引用上下文
     context: Optional[str] = None
     
@@ -241,6 +277,16 @@ class Reference:
     # 时间戳
     created_at: Optional[datetime] = None
 
+    @property
+    def span(self) -> Range:
+        """引用名称所占的范围"""
+        column = self.position.column
+        end_column = self.end_column if self.end_column is not None else column + 1
+        return Range(
+            start=self.position,
+            end=Position(self.position.line, end_column, self.position.offset + end_column - column)
+        )
+
 
 @dataclass
 class SymbolRelation:
@@ -249,3 +295,24 @@ class SymbolRelation:
     to_symbol_id: int
     relation_type: str  # "calls", "extends", "implements", "uses", etc.
     metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """文件指纹（文件清单中的一项，用于判断文件是否需要重新索引）"""
+    file_path: str
+    size: int
+    mtime_ns: int
+    content_hash: str  # 文件内容的 blake2b 摘要
+
+
+@dataclass
+class ImportBinding:
+    """导入绑定（文件通过 import 语句引入的一个名称）"""
+    file_path: str
+    local_name: str  # 本文件中使用的名称
+    imported_name: str  # 被导入模块中的名称（default 表示默认导出，* 表示命名空间导入）
+    module: str  # 模块说明符
+    position: Position  # 本地名称的位置
+    end_column: Optional[int] = None
+    target_path: Optional[str] = None  # 模块解析到的文件路径（非相对路径的模块为None）
@@ -0,0 +1,162 @@
+"""
+源代码索引
+
+对单个文件的源代码只解码一次，记录每行起始的字节偏移和字符偏移，
+提供字节与字符位置的相互映射，使按行取上下文、按节点取文本都变为切片操作。
+"""
+
+import bisect
+from typing import List
+
+
+class SourceIndex:
+    """源代码索引"""
+
+    def __init__(self, source_code: bytes):
+        """
+        初始化源代码索引
+
+        Args:
+            source_code: 源代码字节
+        """
+        self.source_code = source_code
+        self.text = source_code.decode('utf-8', errors='replace')
+
+        # 纯ASCII文件的字节偏移与字符偏移相同，无需映射
+        self.is_ascii = len(self.text) == len(source_code)
+
+        # 每行起始的字节偏移
+        self.line_starts: List[int] = [0]
+        find = source_code.find
+        offset = find(b'\n')
+        while offset >= 0:
+            self.line_starts.append(offset + 1)
+            offset = find(b'\n', offset + 1)
+
+        # 每行起始的字符偏移
+        if self.is_ascii:
+            self.char_line_starts = self.line_starts
+        else:
+            self.char_line_starts = [0]
+            text_find = self.text.find
+            offset = text_find('\n')
+            while offset >= 0:
+                self.char_line_starts.append(offset + 1)
+                offset = text_find('\n', offset + 1)
+
+    @property
+    def line_count(self) -> int:
+        """行数（与 split('\\n') 的结果数量一致）"""
+        return len(self.line_starts)
+
+    def line_of_offset(self, byte_offset: int) -> int:
+        """
+        获取字节偏移所在的行号
+
+        Args:
+            byte_offset: 字节偏移
+
+        Returns:
+            行号（从0开始）
+        """
+        return bisect.bisect_right(self.line_starts, byte_offset) - 1
+
+    def byte_to_char(self, byte_offset: int) -> int:
+        """
+        将字节偏移转换为字符偏移
+
+        Args:
+            byte_offset: 字节偏移
+
+        Returns:
+            字符偏移
+        """
+        if self.is_ascii:
+            return byte_offset
+        byte_offset = max(0, min(byte_offset, len(self.source_code)))
+        line = self.line_of_offset(byte_offset)
+        line_start = self.line_starts[line]
+        prefix = self.source_code[line_start:byte_offset]
+        return self.char_line_starts[line] + len(prefix.decode('utf-8', errors='replace'))
+
+    def char_to_byte(self, char_offset: int) -> int:
+        """
+        将字符偏移转换为字节偏移
+
+        Args:
+            char_offset: 字符偏移
+
+        Returns:
+            字节偏移
+        """
+        if self.is_ascii:
+            return char_offset
+        char_offset = max(0, min(char_offset, len(self.text)))
+        line = bisect.bisect_right(self.char_line_starts, char_offset) - 1
+        prefix = self.text[self.char_line_starts[line]:char_offset]
+        return self.line_starts[line] + len(prefix.encode('utf-8'))
+
+    def char_offset_at(self, line: int, byte_column: int) -> int:
+        """
+        将行号和字节列转换为字符偏移（超出范围时截断到行尾或文件尾）
+
+        Args:
+            line: 行号（从0开始）
+            byte_column: 字节列
+
+        Returns:
+            字符偏移
+        """
+        if line >= len(self.line_starts):
+            return len(self.text)
+        line_start = self.line_starts[line]
+        line_end = self.line_starts[line + 1] - 1 if line + 1 < len(self.line_starts) else len(self.source_code)
+        return self.byte_to_char(min(line_start + byte_column, line_end))
+
+    def get_text(self, start_byte: int, end_byte: int) -> str:
+        """
+        获取字节范围对应的文本
+
+        Args:
+            start_byte: 起始字节偏移
+            end_byte: 结束字节偏移
+
+        Returns:
+            文本
+        """
+        if self.is_ascii:
+            return self.text[start_byte:end_byte]
+        return self.text[self.byte_to_char(start_byte):self.byte_to_char(end_byte)]
+
+    def get_line(self, line: int) -> str:
+        """
+        获取指定行的文本（不含换行符）
+
+        Args:
+            line: 行号（从0开始）
+
+        Returns:
+            行文本，超出范围时返回空字符串
+        """
+        return self.get_lines(line, line)
+
+    def get_lines(self, start_line: int, end_line: int) -> str:
+        """
+        获取闭区间 [start_line, end_line] 内各行的文本（以换行符连接）
+
+        Args:
+            start_line: 起始行号
+            end_line: 结束行号
+
+        Returns:
+            文本，起始行超出范围时返回空字符串
+        """
+        starts = self.char_line_starts
+        if start_line < 0 or start_line >= len(starts):
+            return ""
+        start = starts[start_line]
+        if end_line + 1 < len(starts):
+            end = starts[end_line + 1] - 1
+        else:
+            end = len(self.text)
+        return self.text[start:end]
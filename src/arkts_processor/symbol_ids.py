@@ -0,0 +1,112 @@
+"""
+确定性符号ID
+
+符号ID由文件路径、限定名、符号类型和起始字节偏移计算得到，提取阶段即可确定，
+不依赖数据库自增主键。分析结果（符号、引用、关系）因此可以在工作进程中完整生成，
+写入方直接批量插入，无需回读ID。
+"""
+
+import hashlib
+from typing import Iterable, List, Sequence, Set, Tuple
+
+from .models import Symbol
+
+
+# SQLite INTEGER 主键为有符号64位整数，ID取非负的63位
+ID_MASK = (1 << 63) - 1
+
+# (名称, 符号类型, 起始偏移, 结束偏移)
+SymbolKey = Tuple[str, str, int, int]
+
+
+def symbol_id(file_path: str, qualified_name: str, kind: str, start_offset: int) -> int:
+    """
+    计算单个符号的ID
+
+    Args:
+        file_path: 文件路径
+        qualified_name: 限定名（如 Card.build）
+        kind: 符号类型的取值（SymbolType.value）
+        start_offset: 起始字节偏移
+
+    Returns:
+        非负的64位整数ID
+    """
+    payload = "\0".join((file_path, qualified_name, kind, str(start_offset)))
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest()
+    return (int.from_bytes(digest, "big") & ID_MASK) or 1
+
+
+def qualified_names(keys: Sequence[SymbolKey]) -> List[str]:
+    """
+    按范围包含关系计算限定名
+
+    外层符号的范围包含内层符号时，内层符号的限定名为 外层限定名.名称。
+    结果只取决于名称、类型和范围，与输入顺序无关。
+
+    Args:
+        keys: 符号键列表
+
+    Returns:
+        限定名列表（与输入顺序一致）
+    """
+    order = sorted(range(len(keys)), key=lambda i: (keys[i][2], -keys[i][3], keys[i][1], keys[i][0]))
+    names = [""] * len(keys)
+
+    # 当前仍包含后续符号的外层符号：(结束偏移, 限定名)
+    stack: List[Tuple[int, str]] = []
+    for index in order:
+        name, _, _, end = keys[index]
+        while stack and stack[-1][0] < end:
+            stack.pop()
+        names[index] = f"{stack[-1][1]}.{name}" if stack else name
+        stack.append((end, names[index]))
+    return names
+
+
+def compute_symbol_ids(file_path: str, keys: Sequence[SymbolKey]) -> List[int]:
+    """
+    计算一个文件中所有符号的ID
+
+    同一文件内键完全相同的符号（同名同类型且范围相同）按出现顺序追加序号区分。
+
+    Args:
+        file_path: 文件路径
+        keys: 符号键列表
+
+    Returns:
+        ID列表（与输入顺序一致）
+    """
+    names = qualified_names(keys)
+    order = sorted(range(len(keys)), key=lambda i: (keys[i][2], -keys[i][3], keys[i][1], names[i]))
+
+    ids = [0] * len(keys)
+    used: Set[int] = set()
+    for index in order:
+        _, kind, start, _ = keys[index]
+        candidate = symbol_id(file_path, names[index], kind, start)
+        suffix = 0
+        while candidate in used:
+            suffix += 1
+            candidate = symbol_id(file_path, f"{names[index]}#{suffix}", kind, start)
+        used.add(candidate)
+        ids[index] = candidate
+    return ids
+
+
+def symbol_key(symbol: Symbol) -> SymbolKey:
+    """符号的ID计算键"""
+    return (symbol.name, symbol.symbol_type.value, symbol.range.start.offset, symbol.range.end.offset)
+
+
+def assign_symbol_ids(file_path: str, symbols: Iterable[Symbol]) -> None:
+    """
+    为文件的符号原地设置ID
+
+    Args:
+        file_path: 文件路径
+        symbols: 文件的全部符号
+    """
+    symbols = list(symbols)
+    for symbol, value in zip(symbols, compute_symbol_ids(file_path, [symbol_key(s) for s in symbols])):
+        symbol.id = value
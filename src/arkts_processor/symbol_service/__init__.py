@@ -10,6 +10,7 @@ from .scope_analyzer import ScopeAnalyzer
 from .type_inference import TypeInferenceEngine
 from .reference_resolver import ReferenceResolver
 from .index_service import SymbolIndexService
+from .git_changes import GitIncrementalIndexer
 
 __all__ = [
     "SymbolService",
@@ -18,4 +19,5 @@ __all__ = [
     "TypeInferenceEngine",
     "ReferenceResolver",
     "SymbolIndexService",
+    "GitIncrementalIndexer",
 ]
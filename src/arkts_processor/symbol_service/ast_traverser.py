@@ -4,13 +4,91 @@ AST遍历器
 提供tree-sitter AST遍历的基础框架。
 """
 
-from typing import Callable, Any, Optional, List
+from typing import Callable, Any, Optional, List, Iterator, Dict, Tuple
 from tree_sitter import Node, Tree
 
+from ..source_index import SourceIndex
+
+
+def walk_tree(root: Node,
+              enter: Optional[Callable[[Node], Optional[bool]]] = None,
+              leave: Optional[Callable[[Node], None]] = None) -> None:
+    """
+    基于 TreeCursor 的显式栈遍历（不递归，不分配 children 列表）
+    
+    enter 在前序位置调用，返回 False 时跳过该节点的子树；
+    leave 在后序位置调用（被跳过子树的节点同样会调用）。
+    
+    Args:
+        root: 根节点
+        enter: 进入节点时的回调
+        leave: 离开节点时的回调
+    """
+    cursor = root.walk()
+    depth = 0
+    
+    while True:
+        node = cursor.node
+        descend = True
+        if enter is not None and enter(node) is False:
+            descend = False
+        
+        if descend and cursor.goto_first_child():
+            depth += 1
+            continue
+        
+        # 离开当前节点，回溯到下一个未访问的兄弟节点
+        while True:
+            if leave is not None:
+                leave(node)
+            if depth == 0:
+                return
+            if cursor.goto_next_sibling():
+                break
+            cursor.goto_parent()
+            depth -= 1
+            node = cursor.node
+
+
+def iter_nodes(root: Node, pre_order: bool = True) -> Iterator[Node]:
+    """
+    按前序或后序迭代子树中的所有节点
+    
+    Args:
+        root: 根节点
+        pre_order: 是否前序（False 为后序）
+        
+    Yields:
+        节点
+    """
+    cursor = root.walk()
+    depth = 0
+    
+    while True:
+        if pre_order:
+            yield cursor.node
+        
+        if cursor.goto_first_child():
+            depth += 1
+            continue
+        
+        while True:
+            if not pre_order:
+                yield cursor.node
+            if depth == 0:
+                return
+            if cursor.goto_next_sibling():
+                break
+            cursor.goto_parent()
+            depth -= 1
+
 
 class ASTVisitor:
     """AST访问者基类"""
     
+    # 融合遍历时不交给 visit_* 方法处理、直接由遍历引擎继续访问子节点的节点类型
+    FUSED_PASSTHROUGH_TYPES: frozenset = frozenset()
+    
     def visit(self, node: Node) -> Any:
         """
         访问节点
@@ -21,9 +99,10 @@ class ASTVisitor:
         Returns:
             访问结果
         """
-        method_name = f"visit_{node.type}"
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        visitor = self._get_visit_method(node.type)
+        if visitor is None:
+            return self.generic_visit(node)
+        return visitor(self, node)
     
     def generic_visit(self, node: Node) -> Any:
         """
@@ -34,13 +113,67 @@ class ASTVisitor:
         
         默认行为是遍历所有子节点，这确保了即使没有
         专门的处理方法，也不会遗漏子节点的遍历。
+        使用显式栈遍历后代节点：遇到定义了 visit_* 方法的节点时
+        交由该方法处理其子树，否则继续下探，与逐层调用 visit()
+        的结果一致，但不受递归深度限制。
         
         Args:
             node: AST节点
         """
-        # 遍历所有子节点
-        for child in node.children:
-            self.visit(child)
+        is_root = [True]
+        
+        def enter(current: Node) -> bool:
+            if is_root[0]:
+                is_root[0] = False
+                return True
+            visitor = self._get_visit_method(current.type)
+            if visitor is None:
+                return True
+            visitor(self, current)
+            return False
+        
+        walk_tree(node, enter)
+    
+    def _get_visit_method(self, node_type: str) -> Optional[Callable[..., Any]]:
+        """
+        获取节点类型对应的 visit_* 方法
+        
+        方法名和类上定义的方法按类缓存，避免每个节点拼接方法名；
+        实例上设置的同名属性优先（与 getattr(self, ...) 的查找顺序一致）。
+        
+        Args:
+            node_type: 节点类型
+            
+        Returns:
+            以 (self, node) 调用的方法或None
+        """
+        name, method = self._get_class_visit_entry(node_type)
+        instance_visitor = self.__dict__.get(name)
+        if instance_visitor is not None:
+            return lambda _, node: instance_visitor(node)
+        return method
+    
+    @classmethod
+    def _get_class_visit_entry(cls, node_type: str) -> Tuple[str, Optional[Callable[..., Any]]]:
+        """
+        获取节点类型对应的方法名和类上定义的未绑定方法（按类缓存）
+        
+        Args:
+            node_type: 节点类型
+            
+        Returns:
+            (方法名, 未绑定的方法或None)
+        """
+        cache: Optional[Dict[str, Tuple[str, Optional[Callable[..., Any]]]]] = \
+            cls.__dict__.get("_visit_method_cache")
+        if cache is None:
+            cache = {}
+            cls._visit_method_cache = cache
+        entry = cache.get(node_type)
+        if entry is None:
+            name = f"visit_{node_type}"
+            entry = cache[node_type] = (name, getattr(cls, name, None))
+        return entry
     
     def visit_children(self, node: Node) -> List[Any]:
         """
@@ -58,19 +191,117 @@ class ASTVisitor:
             if result is not None:
                 results.append(result)
         return results
+    
+    def enter_node(self, node: Node) -> bool:
+        """
+        融合遍历钩子：进入节点
+        
+        默认行为与 visit() 一致：存在 visit_* 方法时由其处理整个子树，
+        返回 False 让遍历引擎跳过该子树；否则返回 True 继续访问子节点
+        （相当于 generic_visit）。
+        
+        Args:
+            node: AST节点
+            
+        Returns:
+            是否继续访问子节点
+        """
+        if node.type in self.FUSED_PASSTHROUGH_TYPES:
+            return True
+        visitor = self._get_visit_method(node.type)
+        if visitor is None:
+            return True
+        visitor(self, node)
+        return False
+    
+    def leave_node(self, node: Node) -> None:
+        """
+        融合遍历钩子：离开节点（其子树已全部访问）
+        
+        Args:
+            node: AST节点
+        """
+        pass
+
+
+class FusedTraverser:
+    """
+    融合遍历器
+    
+    使用 TreeCursor 对语法树只做一次遍历，将每个节点依次分发给所有
+    已注册的阶段处理器（符号提取、作用域分析、引用收集等）。
+    某个处理器在 enter_node 中返回 False 时，只对该处理器跳过子树；
+    所有处理器都跳过时才不再下探。
+    """
+    
+    def __init__(self, handlers: List[ASTVisitor]):
+        """
+        初始化融合遍历器
+        
+        Args:
+            handlers: 阶段处理器列表（按分发顺序）
+        """
+        self.handlers = list(handlers)
+    
+    def walk(self, root: Node) -> None:
+        """
+        遍历以 root 为根的子树
+        
+        Args:
+            root: 根节点
+        """
+        handlers = self.handlers
+        if not handlers:
+            return
+        
+        # 每个处理器被挂起时所在的节点深度（None 表示处于活动状态）
+        suspended: List[Optional[int]] = [None] * len(handlers)
+        state = {"active": len(handlers), "depth": -1}
+        
+        def enter(node: Node) -> bool:
+            state["depth"] += 1
+            depth = state["depth"]
+            for i, handler in enumerate(handlers):
+                if suspended[i] is None and handler.enter_node(node) is False:
+                    suspended[i] = depth
+                    state["active"] -= 1
+            return state["active"] > 0
+        
+        def leave(node: Node) -> None:
+            depth = state["depth"]
+            for i, handler in enumerate(handlers):
+                level = suspended[i]
+                if level is None:
+                    handler.leave_node(node)
+                elif level == depth:
+                    handler.leave_node(node)
+                    suspended[i] = None
+                    state["active"] += 1
+            state["depth"] -= 1
+        
+        walk_tree(root, enter, leave)
 
 
 class ASTTraverser:
     """AST遍历器"""
     
-    def __init__(self, source_code: bytes):
+    def __init__(self, source_code: bytes, source_index: Optional[SourceIndex] = None):
         """
         初始化遍历器
         
         Args:
             source_code: 源代码字节
+            source_index: 源代码索引（同一文件的各分析阶段共享，None 表示按需创建）
         """
         self.source_code = source_code
+        self._source_index = source_index
+    
+    @property
+    def source_index(self) -> SourceIndex:
+        """源代码索引（首次使用时创建）"""
+        if self._source_index is None:
+            self._source_index = SourceIndex(self.source_code)
+        return self._source_index
         
     def traverse(self, 
                  tree: Tree, 
@@ -79,6 +310,9 @@ class ASTTraverser:
         """
         遍历AST
         
+        对每个节点调用 visitor.visit()。前序遍历时 visit() 返回 False
+        会跳过该节点的子树。
+        
         Args:
             tree: 语法树
             visitor: 访问者对象
@@ -102,13 +336,9 @@ class ASTTraverser:
             pre_order: 是否前序遍历
         """
         if pre_order:
-            visitor.visit(node)
-            
-        for child in node.children:
-            self._traverse_with_visitor(child, visitor, pre_order)
-            
-        if not pre_order:
-            visitor.visit(node)
+            walk_tree(node, enter=lambda current: visitor.visit(current) is not False)
+        else:
+            walk_tree(node, leave=visitor.visit)
     
     def _simple_traverse(self, node: Node, depth: int = 0) -> None:
         """
@@ -118,12 +348,16 @@ class ASTTraverser:
             node: 当前节点
             depth: 深度
         """
-        indent = "  " * depth
-        text = self.get_node_text(node)
-        print(f"{indent}{node.type}: {text[:50] if text else ''}")
+        levels = [depth]
         
-        for child in node.children:
-            self._simple_traverse(child, depth + 1)
+        def enter(current: Node) -> bool:
+            indent = "  " * levels[-1]
+            text = self.get_node_text(current)
+            print(f"{indent}{current.type}: {text[:50] if text else ''}")
+            levels.append(levels[-1] + 1)
+            return True
+        
+        walk_tree(node, enter, lambda current: levels.pop())
     
     def get_node_text(self, node: Node) -> str:
         """
@@ -135,7 +369,7 @@ class ASTTraverser:
         Returns:
             节点对应的源代码文本
         """
-        return self.source_code[node.start_byte:node.end_byte].decode('utf-8')
+        return self.source_index.get_text(node.start_byte, node.end_byte)
     
     def find_nodes_by_type(self, 
                            tree: Tree, 
@@ -150,27 +384,7 @@ class ASTTraverser:
         Returns:
             匹配的节点列表
         """
-        results = []
-        self._find_nodes_recursive(tree.root_node, node_type, results)
-        return results
-    
-    def _find_nodes_recursive(self, 
-                               node: Node, 
-                               node_type: str, 
-                               results: List[Node]) -> None:
-        """
-        递归查找节点
-        
-        Args:
-            node: 当前节点
-            node_type: 要查找的节点类型
-            results: 结果列表
-        """
-        if node.type == node_type:
-            results.append(node)
-            
-        for child in node.children:
-            self._find_nodes_recursive(child, node_type, results)
+        return [node for node in iter_nodes(tree.root_node) if node.type == node_type]
     
     def find_node_at_position(self, 
                                tree: Tree, 
@@ -204,24 +418,32 @@ class ASTTraverser:
         Returns:
             最深层节点
         """
-        # 检查当前节点是否包含该位置
-        if not (node.start_point[0] <= line <= node.end_point[0]):
-            return None
-            
-        if node.start_point[0] == line and node.start_point[1] > column:
-            return None
-            
-        if node.end_point[0] == line and node.end_point[1] < column:
+        if not self._node_contains(node, line, column):
             return None
         
-        # 递归查找子节点
-        for child in node.children:
-            result = self._find_deepest_node(child, line, column)
-            if result:
-                return result
+        # 逐层下探到第一个包含该位置的子节点
+        cursor = node.walk()
+        while cursor.goto_first_child():
+            while not self._node_contains(cursor.node, line, column):
+                if not cursor.goto_next_sibling():
+                    # 没有子节点匹配，返回当前节点
+                    cursor.goto_parent()
+                    return cursor.node
         
-        # 如果没有子节点匹配，返回当前节点
-        return node
+        return cursor.node
+    
+    @staticmethod
+    def _node_contains(node: Node, line: int, column: int) -> bool:
+        """检查节点是否包含该位置（首尾均为闭区间）"""
+        start_line, start_column = node.start_point
+        end_line, end_column = node.end_point
+        if not (start_line <= line <= end_line):
+            return False
+        if start_line == line and start_column > column:
+            return False
+        if end_line == line and end_column < column:
+            return False
+        return True
     
     def get_parent_of_type(self, 
                            node: Node, 
@@ -0,0 +1,164 @@
+"""
+文件间依赖
+
+提供导入模块路径解析、导入名称到被导入文件符号的解析，以及判断文件的
+对外接口是否变化所用的接口指纹。文件依赖图本身保存在数据库中
+（file_dependencies 表），由 SymbolService 在写入文件时维护。
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Iterable, List, Optional
+
+from ..models import Symbol, SymbolType, TypeInfo, Visibility
+
+
+# 可以通过继承/实现名称跨文件解析的符号类型
+HERITAGE_TYPES = (SymbolType.CLASS, SymbolType.INTERFACE)
+
+# 对外接口中包含成员签名的导出类型
+CONTAINER_TYPES = (SymbolType.CLASS, SymbolType.INTERFACE, SymbolType.ENUM, SymbolType.COMPONENT)
+
+# 成员符号类型（局部变量、参数和嵌套函数不属于对外接口）
+MEMBER_TYPES = (
+    SymbolType.PROPERTY, SymbolType.METHOD, SymbolType.CONSTRUCTOR, SymbolType.ENUM_MEMBER,
+    SymbolType.BUILD_METHOD, SymbolType.LIFECYCLE_METHOD,
+)
+
+# 源文件扩展名（无扩展名的模块说明符依次尝试）
+SOURCE_SUFFIXES = (".ets", ".ts")
+
+
+def resolve_module_path(file_path: str, module: str) -> Optional[str]:
+    """
+    将相对模块说明符解析为文件路径
+
+    依次尝试 .ets、.ts 和目录下的 index 文件，取第一个存在的文件；都不存在时
+    返回第一个候选路径，该文件之后被索引时仍能通过依赖边找到导入方。
+
+    Args:
+        file_path: 导入方文件路径
+        module: 模块说明符（如 ./model/User）
+
+    Returns:
+        文件路径；非相对路径的模块（如 @ohos.router）返回None
+    """
+    if not module.startswith(("./", "../")):
+        return None
+
+    base = os.path.normpath(os.path.join(os.path.dirname(file_path), module))
+    if base.endswith(SOURCE_SUFFIXES):
+        return base
+
+    candidates = [base + suffix for suffix in SOURCE_SUFFIXES]
+    candidates.extend(os.path.join(base, "index" + suffix) for suffix in SOURCE_SUFFIXES)
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return candidates[0]
+
+
+def find_export(symbols: Iterable[Symbol], imported_name: str) -> Optional[Symbol]:
+    """
+    在被导入文件的符号中查找导入名称对应的导出符号
+
+    Args:
+        symbols: 被导入文件的符号
+        imported_name: 导入名称（default 表示默认导出）
+
+    Returns:
+        符号；命名空间导入或未找到时返回None
+    """
+    if imported_name == "*":
+        return None
+    for symbol in symbols:
+        if not symbol.is_exported:
+            continue
+        if imported_name == "default" and symbol.is_export_default:
+            return symbol
+        if symbol.name == imported_name and not symbol.is_export_default:
+            return symbol
+    return None
+
+
+def _type_text(type_info: Optional[TypeInfo]) -> Optional[str]:
+    """类型的字符串表示"""
+    return type_info.to_string() if type_info is not None else None
+
+
+def _signature(symbol: Symbol) -> List[Any]:
+    """符号对外可见的签名（不含位置，函数体和初始值不影响结果）"""
+    return [
+        symbol.symbol_type.value,
+        symbol.name,
+        symbol.is_exported,
+        symbol.is_export_default,
+        symbol.visibility.value,
+        symbol.is_static,
+        symbol.is_abstract,
+        symbol.is_readonly,
+        symbol.is_async,
+        _type_text(symbol.type_info),
+        _type_text(symbol.return_type),
+        [[p.name, _type_text(p.type_info)] for p in symbol.parameters],
+        sorted(symbol.decorators),
+        sorted([name, repr(arguments)] for name, arguments in symbol.arkui_decorators.items()),
+        symbol.component_type,
+        list(symbol.extends),
+        list(symbol.implements),
+    ]
+
+
+def _is_within(inner: Symbol, outer: Symbol) -> bool:
+    """inner 的范围是否位于 outer 的范围之内"""
+    start, end = outer.range.start, outer.range.end
+    return ((start.line, start.column) <= (inner.range.start.line, inner.range.start.column)
+            and (inner.range.end.line, inner.range.end.column) <= (end.line, end.column))
+
+
+def api_fingerprint(symbols: Iterable[Symbol]) -> str:
+    """
+    计算文件对外接口的指纹
+
+    指纹覆盖其他文件能够解析到的部分：
+
+    - 导出符号的签名（类型、参数、返回类型、修饰符、装饰器）
+    - 导出的类、接口、枚举和 @Component struct 的非私有成员签名，
+      以及 struct 中带状态装饰器（@Prop、@Link 等）的属性
+    - 未导出的类和接口的声明（继承/实现名称按项目范围解析）
+
+    只修改函数体或私有成员时指纹不变，下游工作可以据此提前结束。
+    成员按签名排序，源代码位置不参与计算。
+
+    Args:
+        symbols: 文件的符号列表
+
+    Returns:
+        blake2b（16字节）摘要的十六进制字符串
+    """
+    symbols = list(symbols)
+    containers = [s for s in symbols if s.is_exported or s.symbol_type in HERITAGE_TYPES]
+
+    records = []
+    for container in containers:
+        members = []
+        if container.is_exported and container.symbol_type in CONTAINER_TYPES:
+            for symbol in symbols:
+                if symbol is container or symbol.symbol_type not in MEMBER_TYPES:
+                    continue
+                if not _is_within(symbol, container):
+                    continue
+                if symbol.visibility == Visibility.PRIVATE and not (
+                        container.symbol_type == SymbolType.COMPONENT and symbol.arkui_decorators):
+                    continue
+                members.append(_signature(symbol))
+        records.append([_signature(container), sorted(members, key=json.dumps)])
+    records.sort(key=json.dumps)
+
+    payload = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# 没有对外接口的文件的指纹
+EMPTY_API_FINGERPRINT = api_fingerprint([])
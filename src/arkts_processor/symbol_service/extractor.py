@@ -10,7 +10,9 @@ from tree_sitter import Node, Tree
 from ..models import (
     Symbol, SymbolType, Position, Range, TypeInfo, Visibility
 )
-from .ast_traverser import ASTVisitor, ASTTraverser, NodeHelper
+from ..source_index import SourceIndex
+from ..symbol_ids import assign_symbol_ids
+from .ast_traverser import ASTVisitor, ASTTraverser, FusedTraverser, NodeHelper, iter_nodes
 
 
 class SymbolExtractor(ASTVisitor):
@@ -37,6 +39,9 @@ class SymbolExtractor(ASTVisitor):
         "build_method": SymbolType.BUILD_METHOD,  # build() 方法
     }
     
+    # 根节点只做子节点分发，融合遍历时由遍历引擎直接下探
+    FUSED_PASSTHROUGH_TYPES = frozenset({"source_file", "program"})
+    
     # ArkUI 装饰器类型
     ARKUI_DECORATORS = {
         # 组件装饰器
@@ -58,17 +63,18 @@ class SymbolExtractor(ASTVisitor):
         "onBackPress", "onLayout", "onMeasure",
     }
     
-    def __init__(self, file_path: str, source_code: bytes):
+    def __init__(self, file_path: str, source_code: bytes, source_index: Optional[SourceIndex] = None):
         """
         初始化符号提取器
         
         Args:
             file_path: 文件路径
             source_code: 源代码字节
+            source_index: 共享的源代码索引（None 表示按需创建）
         """
         self.file_path = file_path
         self.source_code = source_code
-        self.traverser = ASTTraverser(source_code)
+        self.traverser = ASTTraverser(source_code, source_index)
         self.symbols: List[Symbol] = []
         self.current_scope_id: Optional[int] = None
         
@@ -111,7 +117,19 @@ class SymbolExtractor(ASTVisitor):
             符号列表
         """
         self.symbols = []
-        self.visit(tree.root_node)
+        FusedTraverser([self]).walk(tree.root_node)
+        return self.finish()
+    
+    def finish(self) -> List[Symbol]:
+        """
+        结束提取，为符号分配确定性ID
+        
+        ID由文件路径、限定名、符号类型和起始偏移计算，引用和关系在写入数据库前即可指向符号。
+        
+        Returns:
+            符号列表
+        """
+        assign_symbol_ids(self.file_path, self.symbols)
         return self.symbols
     
     # ========== 根节点和通用节点处理 ==========
@@ -805,13 +823,18 @@ class SymbolExtractor(ASTVisitor):
                 if i + 1 < len(node.children):
                     next_node = node.children[i + 1]
                     if next_node.type == "type_annotation":
-                        # 获取 type_annotation 中的 identifier
+                        # 获取 type_annotation 中的 identifier（可能包在 primary_type 中）
                         base_class_node = self._get_child_by_type(next_node, "identifier")
+                        if base_class_node is None:
+                            primary_type = self._get_child_by_type(next_node, "primary_type")
+                            if primary_type:
+                                base_class_node = self._get_child_by_type(primary_type, "identifier")
                         if base_class_node:
                             base_class = self.traverser.get_node_text(base_class_node)
                             symbol.extends.append(base_class)
         
-        # 注意：implements 可能被解析为 ERROR 节点，暂时无法准确提取
+        # implements 子句
+        self._extract_heritage(node, symbol)
     
     def _extract_interface_heritage(self, node: Node, symbol: Symbol) -> None:
         """
@@ -832,6 +855,9 @@ class SymbolExtractor(ASTVisitor):
                         if base_interface_node:
                             base_interface = self.traverser.get_node_text(base_interface_node)
                             symbol.extends.append(base_interface)
+        
+        # extends 子句（extends A, B）
+        self._extract_heritage(node, symbol)
     
     def _extract_return_type(self, node: Node) -> Optional[TypeInfo]:
         """
@@ -1061,38 +1087,38 @@ class SymbolExtractor(ASTVisitor):
     
     def _traverse_ui_tree(self, node: Node, symbol: Symbol) -> None:
         """
-        递归遍历 UI 树，提取样式和事件绑定
+        遍历 UI 树，提取样式和事件绑定
+        
+        使用显式栈前序遍历，深层嵌套的 UI 构建代码不会触发递归深度限制。
         """
-        # 检查当前节点
-        node_text = self.traverser.get_node_text(node)
+        source_code = self.source_code
         
-        # 提取样式绑定（以 . 开头的方法调用）
-        if node.type == "member_expression":
-            # 检查是否为样式方法（如 .width(), .height()）
-            member_name = self._get_member_name(node)
-            if member_name and self._is_style_method(member_name):
-                if member_name not in symbol.style_bindings:
-                    symbol.style_bindings.append(member_name)
-        
-        # 提取事件处理器（如 .onClick(handler)）
-        elif node.type == "call_expression":
-            call_text = self.traverser.get_node_text(node)
-            if ".on" in call_text or ".onClick" in call_text:
-                # 提取事件名和处理器
-                event_info = self._extract_event_handler(node)
-                if event_info:
-                    event_name, handler = event_info
-                    symbol.event_handlers[event_name] = handler
-        
-        # 提取资源引用（$r('app.media.icon')）
-        if "$r(" in node_text or "$rawfile(" in node_text:
-            resource_ref = self._extract_resource_reference(node)
-            if resource_ref and resource_ref not in symbol.resource_refs:
-                symbol.resource_refs.append(resource_ref)
-        
-        # 递归遍历子节点
-        for child in node.children:
-            self._traverse_ui_tree(child, symbol)
+        for current in iter_nodes(node):
+            # 在字节层面做文本检查，避免对每个子树解码
+            node_bytes = source_code[current.start_byte:current.end_byte]
+            
+            # 提取样式绑定（以 . 开头的方法调用）
+            if current.type == "member_expression":
+                # 检查是否为样式方法（如 .width(), .height()）
+                member_name = self._get_member_name(current)
+                if member_name and self._is_style_method(member_name):
+                    if member_name not in symbol.style_bindings:
+                        symbol.style_bindings.append(member_name)
+            
+            # 提取事件处理器（如 .onClick(handler)）
+            elif current.type == "call_expression":
+                if b".on" in node_bytes:
+                    # 提取事件名和处理器
+                    event_info = self._extract_event_handler(current)
+                    if event_info:
+                        event_name, handler = event_info
+                        symbol.event_handlers[event_name] = handler
+            
+            # 提取资源引用（$r('app.media.icon')）
+            if b"$r(" in node_bytes or b"$rawfile(" in node_bytes:
+                resource_ref = self._extract_resource_reference(current)
+                if resource_ref and resource_ref not in symbol.resource_refs:
+                    symbol.resource_refs.append(resource_ref)
     
     def _get_member_name(self, member_expression_node: Node) -> Optional[str]:
         """获取成员表达式的成员名"""
@@ -0,0 +1,200 @@
+"""
+模糊搜索索引
+
+为符号名称维护三元组（trigram）倒排表，用于在模糊搜索前快速筛选候选名称，
+并提供按单词边界、驼峰、前缀和符号类型打分的模糊排序器。
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..models import SymbolType
+
+
+# 符号类型权重：类型定义和可调用符号在工作区搜索中优先
+KIND_WEIGHTS: Dict[SymbolType, float] = {
+    SymbolType.CLASS: 3.0,
+    SymbolType.INTERFACE: 3.0,
+    SymbolType.COMPONENT: 3.0,
+    SymbolType.ENUM: 2.5,
+    SymbolType.TYPE_ALIAS: 2.5,
+    SymbolType.NAMESPACE: 2.0,
+    SymbolType.MODULE: 2.0,
+    SymbolType.FUNCTION: 2.0,
+    SymbolType.STYLE_FUNCTION: 1.5,
+    SymbolType.EXTEND_FUNCTION: 1.5,
+    SymbolType.METHOD: 1.5,
+    SymbolType.CONSTRUCTOR: 1.0,
+    SymbolType.BUILD_METHOD: 1.0,
+    SymbolType.LIFECYCLE_METHOD: 1.0,
+    SymbolType.PROPERTY: 1.0,
+    SymbolType.ENUM_MEMBER: 1.0,
+    SymbolType.VARIABLE: 0.5,
+    SymbolType.PARAMETER: 0.0,
+}
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    获取文本（小写）的所有三元组
+
+    Args:
+        text: 文本
+
+    Returns:
+        三元组集合，文本不足3个字符时为空
+    """
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _is_boundary(name: str, index: int) -> bool:
+    """判断位置是否为单词边界（开头、'_'/'$' 之后、驼峰大写、字母后的数字）"""
+    if index == 0:
+        return True
+    previous = name[index - 1]
+    char = name[index]
+    if previous in "_$":
+        return True
+    if char.isupper() and not previous.isupper():
+        return True
+    return char.isdigit() and not previous.isdigit()
+
+
+def fuzzy_score(pattern: str, name: str) -> Optional[float]:
+    """
+    计算模糊匹配得分
+
+    模式中的字符须按顺序（不区分大小写）出现在名称中，否则不匹配。
+    命中单词边界/驼峰位置、连续命中、完全匹配和前缀匹配加分，
+    跳过的字符和过长的名称减分。
+
+    Args:
+        pattern: 搜索模式
+        name: 符号名称
+
+    Returns:
+        得分，不匹配时返回None
+    """
+    if not pattern:
+        return 0.0
+
+    lower_name = name.lower()
+    lower_pattern = pattern.lower()
+
+    score = 0.0
+    position = 0
+    previous = -2
+    for char in lower_pattern:
+        index = lower_name.find(char, position)
+        if index < 0:
+            return None
+        score += 1.0
+        if index == previous + 1:
+            score += 2.0
+        if _is_boundary(name, index):
+            score += 3.0
+        # 跳过的字符减分（封顶，避免长名称被过度惩罚）
+        score -= min(index - position, 5) * 0.2
+        previous = index
+        position = index + 1
+
+    if lower_name == lower_pattern:
+        score += 10.0
+        if name == pattern:
+            score += 2.0
+    elif lower_name.startswith(lower_pattern):
+        score += 5.0
+
+    score -= len(name) * 0.01
+    return score
+
+
+class TrigramIndex:
+    """
+    三元组倒排索引
+
+    键为名称（小写）的三元组，值为包含该三元组的名称集合。
+    """
+
+    def __init__(self):
+        """初始化三元组索引"""
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add(self, name: str) -> None:
+        """
+        加入名称
+
+        Args:
+            name: 符号名称
+        """
+        for gram in trigrams(name):
+            self._postings.setdefault(gram, set()).add(name)
+
+    def discard(self, name: str) -> None:
+        """
+        移除名称
+
+        Args:
+            name: 符号名称
+        """
+        for gram in trigrams(name):
+            names = self._postings.get(gram)
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                del self._postings[gram]
+
+    def clear(self) -> None:
+        """清空索引"""
+        self._postings.clear()
+
+    def postings(self, grams: Iterable[str]) -> List[Set[str]]:
+        """
+        获取三元组的倒排表（按大小升序，缺失的三元组对应空集合）
+
+        Args:
+            grams: 三元组
+
+        Returns:
+            倒排表列表
+        """
+        return sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+
+    def candidates(self, pattern: str) -> Set[str]:
+        """
+        获取至少包含模式中一个三元组的名称
+
+        Args:
+            pattern: 搜索模式（至少3个字符）
+
+        Returns:
+            候选名称集合
+        """
+        result: Set[str] = set()
+        for names in self.postings(trigrams(pattern)):
+            result |= names
+        return result
+
+    def containing(self, text: str) -> Set[str]:
+        """
+        获取包含模式中全部三元组的名称（子串查询的候选集）
+
+        Args:
+            text: 子串（至少3个字符）
+
+        Returns:
+            候选名称集合
+        """
+        postings = self.postings(trigrams(text))
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for names in postings[1:]:
+            if not result:
+                break
+            result &= names
+        return result
@@ -0,0 +1,246 @@
+"""
+基于 git diff 的增量索引
+
+由 `git diff --name-status -M` 得到两个版本之间（或工作区相对 HEAD）变化的
+.ets/.ts 文件，只对这些文件调用刷新、删除或重命名操作：
+
+- 新增/修改：重新处理文件
+- 删除：删除文件的符号和 Chunk
+- 重命名：按新路径移动已有数据，相似度不足 100% 时再刷新新路径
+
+文件内容从工作区读取，比较两个版本时工作区应已检出到目标版本。
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .service import SymbolService
+
+if TYPE_CHECKING:
+    from ..chunk_service.service import ChunkService
+
+
+SOURCE_EXTENSIONS: Tuple[str, ...] = (".ets", ".ts")
+
+
+@dataclass(frozen=True)
+class GitChange:
+    """git diff 报告的单个文件变化（路径相对于仓库目录）"""
+    status: str  # A / M / D / R
+    path: str
+    old_path: Optional[str] = None  # 重命名前的路径
+    similarity: Optional[int] = None  # 重命名相似度（百分比）
+
+
+def _run_git(repo_root: str, args: Sequence[str]) -> bytes:
+    """在仓库目录中执行 git 命令并返回标准输出"""
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=repo_root, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except FileNotFoundError:
+        raise RuntimeError("git executable not found") from None
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"git {args[0]} failed: {message}") from None
+    return completed.stdout
+
+
+def parse_name_status(output: bytes) -> List[GitChange]:
+    """
+    解析 `git diff --name-status -z` 的输出
+
+    复制（C）视为新增，类型变化（T）视为修改。
+
+    Args:
+        output: git 输出（NUL 分隔）
+
+    Returns:
+        文件变化列表
+    """
+    fields = output.decode("utf-8", errors="surrogateescape").split("\0")
+    changes: List[GitChange] = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i]
+        kind = status[0]
+        if kind in ("R", "C"):
+            old_path, path = fields[i + 1], fields[i + 2]
+            i += 3
+            if kind == "R":
+                changes.append(GitChange("R", path, old_path, int(status[1:] or 100)))
+            else:
+                changes.append(GitChange("A", path))
+            continue
+
+        path = fields[i + 1]
+        i += 2
+        if kind == "T":
+            kind = "M"
+        if kind in ("A", "M", "D"):
+            changes.append(GitChange(kind, path))
+    return changes
+
+
+def filter_source_changes(changes: List[GitChange],
+                          extensions: Tuple[str, ...] = SOURCE_EXTENSIONS) -> List[GitChange]:
+    """
+    只保留源文件的变化
+
+    重命名跨越扩展名时按一侧处理：只有新路径是源文件视为新增，只有原路径是源文件视为删除。
+
+    Args:
+        changes: 文件变化列表
+        extensions: 源文件扩展名
+
+    Returns:
+        源文件变化列表
+    """
+    result = []
+    for change in changes:
+        is_source = change.path.endswith(extensions)
+        if change.status != "R":
+            if is_source:
+                result.append(change)
+            continue
+
+        was_source = change.old_path.endswith(extensions)
+        if is_source and was_source:
+            result.append(change)
+        elif is_source:
+            result.append(GitChange("A", change.path))
+        elif was_source:
+            result.append(GitChange("D", change.old_path))
+    return result
+
+
+def git_changed_files(repo_root: str,
+                      base: Optional[str] = None,
+                      target: Optional[str] = None,
+                      extensions: Tuple[str, ...] = SOURCE_EXTENSIONS) -> List[GitChange]:
+    """
+    获取两个版本之间变化的源文件
+
+    Args:
+        repo_root: 仓库目录（路径相对于该目录，只包含该目录下的文件）
+        base: 基准版本（默认 HEAD）
+        target: 目标版本（为None时比较工作区，未跟踪的文件视为新增）
+        extensions: 源文件扩展名
+
+    Returns:
+        源文件变化列表
+    """
+    args = ["diff", "--name-status", "-M", "-z", "--relative", "--no-ext-diff", base or "HEAD"]
+    if target is not None:
+        args.append(target)
+    args.append("--")
+    changes = parse_name_status(_run_git(repo_root, args))
+
+    if target is None:
+        untracked = _run_git(repo_root, ["ls-files", "--others", "--exclude-standard", "-z"])
+        changes.extend(
+            GitChange("A", path)
+            for path in untracked.decode("utf-8", errors="surrogateescape").split("\0") if path
+        )
+    return filter_source_changes(changes, extensions)
+
+
+class GitIncrementalIndexer:
+    """按 git diff 结果增量更新符号数据和 Chunk"""
+
+    def __init__(self,
+                 symbol_service: SymbolService,
+                 chunk_service: Optional["ChunkService"] = None,
+                 extensions: Tuple[str, ...] = SOURCE_EXTENSIONS):
+        """
+        初始化增量索引器
+
+        Args:
+            symbol_service: 符号服务
+            chunk_service: Chunk 服务（可选，提供时同时维护 Chunk）
+            extensions: 源文件扩展名
+        """
+        self.symbol_service = symbol_service
+        self.chunk_service = chunk_service
+        self.extensions = extensions
+
+    def index_changes(self,
+                      repo_root: str,
+                      base: Optional[str] = None,
+                      target: Optional[str] = None) -> Dict[str, Any]:
+        """
+        按 git diff 结果更新索引
+
+        文件路径为 repo_root 与 git 相对路径的拼接，应与索引时使用的路径形式一致。
+
+        Args:
+            repo_root: 仓库目录
+            base: 基准版本（默认 HEAD）
+            target: 目标版本（为None时比较工作区）
+
+        Returns:
+            汇总结果字典（added / modified / deleted / renamed / errors 计数和逐文件 results）
+        """
+        changes = git_changed_files(repo_root, base, target, self.extensions)
+        return self.apply_changes(repo_root, changes)
+
+    def apply_changes(self, repo_root: str, changes: List[GitChange]) -> Dict[str, Any]:
+        """
+        应用文件变化
+
+        Args:
+            repo_root: 仓库目录
+            changes: 文件变化列表
+
+        Returns:
+            汇总结果字典
+        """
+        summary: Dict[str, Any] = {
+            "added": 0, "modified": 0, "deleted": 0, "renamed": 0,
+            "errors": 0, "results": []
+        }
+        counters = {"A": "added", "M": "modified", "D": "deleted", "R": "renamed"}
+
+        for change in changes:
+            path = os.path.join(repo_root, change.path)
+            try:
+                if change.status == "D":
+                    self._delete(path)
+                elif change.status == "R":
+                    self._rename(os.path.join(repo_root, change.old_path), path,
+                                 change.similarity == 100)
+                else:
+                    self._refresh(path)
+            except Exception as e:
+                summary["errors"] += 1
+                summary["results"].append({"file_path": path, "status": change.status, "error": str(e)})
+                continue
+            summary[counters[change.status]] += 1
+            summary["results"].append({"file_path": path, "status": change.status})
+        return summary
+
+    def _refresh(self, file_path: str) -> None:
+        """重新处理文件"""
+        if self.chunk_service is not None:
+            self.chunk_service.refresh_file(file_path)
+        else:
+            self.symbol_service.refresh_file(file_path)
+
+    def _delete(self, file_path: str) -> None:
+        """删除文件的数据"""
+        self.symbol_service.delete_file(file_path)
+        if self.chunk_service is not None:
+            self.chunk_service.delete_chunks_by_file(file_path)
+
+    def _rename(self, old_path: str, new_path: str, exact: bool) -> None:
+        """移动文件的数据，内容有变化时刷新新路径"""
+        if self.chunk_service is not None:
+            self.chunk_service.rename_file(old_path, new_path)
+        else:
+            self.symbol_service.rename_file(old_path, new_path)
+        # 原路径未索引过时没有可移动的数据，按新增处理
+        if not exact or self.symbol_service.repository.get_file_fingerprint(new_path) is None:
+            self._refresh(new_path)
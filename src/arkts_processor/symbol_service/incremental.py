@@ -0,0 +1,340 @@
+"""
+增量重解析器
+
+基于 tree-sitter 的编辑接口对文件进行增量解析：保留上一次的语法树，
+应用 tree.edit() 后以旧树为基础重新解析，只对与变更范围重叠的顶层声明
+重新提取符号，其余顶层声明的符号按编辑偏移量平移后复用。
+"""
+
+import bisect
+import copy
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import tree_sitter
+from tree_sitter import Node, Tree
+
+from ..models import Symbol, Position, Range, TextEdit
+from .extractor import SymbolExtractor
+
+
+@dataclass
+class _EditRecord:
+    """已应用的编辑（字节偏移基于应用该编辑之前的文档）"""
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    old_end_point: Tuple[int, int]
+    new_end_point: Tuple[int, int]
+
+
+@dataclass
+class IncrementalParseResult:
+    """增量解析结果"""
+    source_code: bytes
+    tree: Tree
+    symbols: List[Symbol]
+    reextracted: int  # 重新提取的顶层声明数量
+    reused: int  # 平移复用的顶层声明数量
+
+
+class IncrementalReparser:
+    """增量重解析器"""
+
+    # 会影响下一个兄弟声明提取结果的节点类型（装饰器、文档注释）
+    LEADING_NODE_TYPES = {"decorator", "comment"}
+
+    def __init__(self, parser: tree_sitter.Parser):
+        """
+        初始化增量重解析器
+
+        Args:
+            parser: tree-sitter解析器
+        """
+        self.parser = parser
+
+    def reparse(self,
+                file_path: str,
+                old_source: bytes,
+                old_tree: Tree,
+                old_symbols: Optional[List[Symbol]],
+                edits: List[TextEdit]) -> IncrementalParseResult:
+        """
+        应用编辑并增量重解析
+
+        所有编辑先校验并换算为字节偏移，全部有效后才应用到 old_tree 的副本上；
+        任一编辑无效时抛出 ValueError，old_tree 保持不变。
+
+        Args:
+            file_path: 文件路径
+            old_source: 编辑前的源代码
+            old_tree: 编辑前的语法树
+            old_symbols: 编辑前提取的符号（None 表示全部重新提取）
+            edits: 按顺序应用的编辑列表
+
+        Returns:
+            增量解析结果
+        """
+        source = old_source
+        records: List[_EditRecord] = []
+        start_points: List[Tuple[int, int]] = []
+        # 受编辑影响的字节范围（始终以当前文档为坐标）
+        dirty_ranges: List[List[int]] = []
+        # 当前文档每行起始的字节偏移，随编辑增量更新
+        line_starts = self._line_starts(source)
+
+        for edit in edits:
+            start_byte = self._offset_at(source, line_starts, edit.range.start)
+            old_end_byte = self._offset_at(source, line_starts, edit.range.end)
+            if old_end_byte < start_byte:
+                raise ValueError(f"Invalid edit range: {edit.range}")
+
+            new_bytes = edit.new_text.encode('utf-8')
+            new_end_byte = start_byte + len(new_bytes)
+            start_point = (edit.range.start.line, edit.range.start.column)
+            old_end_point = (edit.range.end.line, edit.range.end.column)
+            new_end_point = self._advance_point(start_point, new_bytes)
+
+            source = source[:start_byte] + new_bytes + source[old_end_byte:]
+            self._update_line_starts(line_starts, start_byte, old_end_byte, new_bytes)
+
+            # 将之前记录的脏范围映射到新坐标
+            for dirty in dirty_ranges:
+                dirty[0] = self._map_offset(dirty[0], start_byte, old_end_byte, new_end_byte)
+                dirty[1] = self._map_offset(dirty[1], start_byte, old_end_byte, new_end_byte)
+            dirty_ranges.append([start_byte, new_end_byte])
+
+            start_points.append(start_point)
+            records.append(_EditRecord(
+                start_byte=start_byte,
+                old_end_byte=old_end_byte,
+                new_end_byte=new_end_byte,
+                old_end_point=old_end_point,
+                new_end_point=new_end_point
+            ))
+
+        # 缓存中的旧树可能被其他调用继续使用，编辑应用在副本上
+        edited_tree = old_tree.copy()
+        for start_point, record in zip(start_points, records):
+            edited_tree.edit(
+                start_byte=record.start_byte,
+                old_end_byte=record.old_end_byte,
+                new_end_byte=record.new_end_byte,
+                start_point=start_point,
+                old_end_point=record.old_end_point,
+                new_end_point=record.new_end_point
+            )
+
+        new_tree = self.parser.parse(source, edited_tree)
+
+        # 语法结构发生变化的范围（不含仅文本变化的部分，因此与编辑范围取并集）
+        for changed in edited_tree.changed_ranges(new_tree):
+            dirty_ranges.append([changed.start_byte, changed.end_byte])
+
+        top_level_nodes = new_tree.root_node.children
+        dirty_flags = self._mark_dirty_nodes(top_level_nodes, dirty_ranges, old_symbols is None)
+
+        # 将旧符号平移到新坐标，并按所属顶层声明分桶
+        buckets: List[List[Symbol]] = [[] for _ in top_level_nodes]
+        if old_symbols:
+            node_starts = [node.start_byte for node in top_level_nodes]
+            for symbol in old_symbols:
+                shifted = self._shift_symbol(symbol, records)
+                if shifted is None:
+                    continue
+                index = bisect.bisect_right(node_starts, shifted.range.start.offset) - 1
+                if index < 0 or dirty_flags[index]:
+                    continue
+                if shifted.range.start.offset >= top_level_nodes[index].end_byte:
+                    continue
+                buckets[index].append(shifted)
+
+        # 按顶层声明顺序拼接符号，保持与完整提取相同的顺序
+        extractor = SymbolExtractor(file_path, source)
+        symbols: List[Symbol] = []
+        reextracted = 0
+        for index, node in enumerate(top_level_nodes):
+            if dirty_flags[index]:
+                extractor.symbols = []
+                extractor.visit(node)
+                symbols.extend(extractor.symbols)
+                reextracted += 1
+            else:
+                symbols.extend(buckets[index])
+
+        return IncrementalParseResult(
+            source_code=source,
+            tree=new_tree,
+            symbols=symbols,
+            reextracted=reextracted,
+            reused=len(top_level_nodes) - reextracted
+        )
+
+    def _mark_dirty_nodes(self,
+                          nodes: List[Node],
+                          dirty_ranges: List[List[int]],
+                          all_dirty: bool) -> List[bool]:
+        """
+        标记与脏范围重叠（含相邻）的顶层节点
+
+        装饰器和注释会影响下一个兄弟声明的提取结果，因此其脏标记向后传播。
+
+        Args:
+            nodes: 顶层节点列表
+            dirty_ranges: 脏字节范围列表
+            all_dirty: 是否全部标记为脏
+
+        Returns:
+            与 nodes 对应的脏标记列表
+        """
+        if all_dirty:
+            return [True] * len(nodes)
+
+        flags = []
+        for node in nodes:
+            flags.append(any(
+                start <= node.end_byte and node.start_byte <= end
+                for start, end in dirty_ranges
+            ))
+
+        for i in range(len(nodes) - 1):
+            if flags[i] and nodes[i].type in self.LEADING_NODE_TYPES:
+                flags[i + 1] = True
+
+        return flags
+
+    def _shift_symbol(self, symbol: Symbol, records: List[_EditRecord]) -> Optional[Symbol]:
+        """
+        将符号（含参数）平移到编辑后的坐标
+
+        Args:
+            symbol: 编辑前的符号
+            records: 编辑记录
+
+        Returns:
+            平移后的符号副本；与任一编辑重叠时返回None
+        """
+        new_range = self._shift_range(symbol.range, records)
+        if new_range is None:
+            return None
+
+        shifted = copy.deepcopy(symbol)
+        shifted.range = new_range
+        # 与完整提取保持一致：ID和作用域在后续阶段重新分配
+        shifted.id = None
+        shifted.scope_id = None
+        for param in shifted.parameters:
+            param_range = self._shift_range(param.range, records)
+            if param_range is None:
+                return None
+            param.range = param_range
+            param.id = None
+            param.scope_id = None
+        return shifted
+
+    def _shift_range(self, range_: Range, records: List[_EditRecord]) -> Optional[Range]:
+        """按顺序应用编辑记录平移范围，与编辑重叠时返回None"""
+        start = range_.start
+        end = range_.end
+        for record in records:
+            if end.offset <= record.start_byte:
+                continue
+            if start.offset < record.old_end_byte:
+                return None
+            start = self._shift_position(start, record)
+            end = self._shift_position(end, record)
+        return Range(start=start, end=end)
+
+    def _shift_position(self, position: Position, record: _EditRecord) -> Position:
+        """平移位于编辑之后的位置"""
+        old_row, old_column = record.old_end_point
+        new_row, new_column = record.new_end_point
+
+        column = position.column
+        if position.line == old_row:
+            column = new_column + (position.column - old_column)
+
+        return Position(
+            line=position.line + (new_row - old_row),
+            column=column,
+            offset=position.offset + (record.new_end_byte - record.old_end_byte)
+        )
+
+    @staticmethod
+    def _map_offset(offset: int, start_byte: int, old_end_byte: int, new_end_byte: int) -> int:
+        """将编辑前的字节偏移映射到编辑后"""
+        if offset <= start_byte:
+            return offset
+        if offset >= old_end_byte:
+            return offset + (new_end_byte - old_end_byte)
+        return new_end_byte
+
+    @staticmethod
+    def _advance_point(start_point: Tuple[int, int], text: bytes) -> Tuple[int, int]:
+        """计算插入文本后的结束位置"""
+        newlines = text.count(b'\n')
+        if newlines == 0:
+            return (start_point[0], start_point[1] + len(text))
+        return (start_point[0] + newlines, len(text) - text.rindex(b'\n') - 1)
+
+    @staticmethod
+    def _line_starts(source: bytes) -> List[int]:
+        """计算每行起始的字节偏移"""
+        line_starts = [0]
+        offset = source.find(b'\n')
+        while offset >= 0:
+            line_starts.append(offset + 1)
+            offset = source.find(b'\n', offset + 1)
+        return line_starts
+
+    @staticmethod
+    def _update_line_starts(line_starts: List[int],
+                            start_byte: int,
+                            old_end_byte: int,
+                            new_bytes: bytes) -> None:
+        """
+        按一次编辑原地更新行起始偏移表
+
+        Args:
+            line_starts: 编辑前文档的行起始偏移
+            start_byte: 编辑起始偏移
+            old_end_byte: 被替换文本的结束偏移
+            new_bytes: 插入的文本
+        """
+        delta = start_byte + len(new_bytes) - old_end_byte
+        low = bisect.bisect_right(line_starts, start_byte)
+        high = bisect.bisect_right(line_starts, old_end_byte)
+
+        inserted = []
+        newline = new_bytes.find(b'\n')
+        while newline >= 0:
+            inserted.append(start_byte + newline + 1)
+            newline = new_bytes.find(b'\n', newline + 1)
+
+        line_starts[low:] = inserted + [start + delta for start in line_starts[high:]]
+
+    @staticmethod
+    def _offset_at(source: bytes, line_starts: List[int], position: Position) -> int:
+        """
+        根据行号和字节列计算字节偏移
+
+        Args:
+            source: 源代码
+            line_starts: 源代码每行起始的字节偏移
+            position: 位置（行号和字节列）
+
+        Returns:
+            字节偏移
+        """
+        if position.line >= len(line_starts):
+            raise ValueError(f"Line {position.line} out of range")
+
+        offset = line_starts[position.line]
+        if position.line + 1 < len(line_starts):
+            line_end = line_starts[position.line + 1] - 1
+        else:
+            line_end = len(source)
+        if offset + position.column > line_end:
+            raise ValueError(f"Column {position.column} out of range on line {position.line}")
+
+        return offset + position.column
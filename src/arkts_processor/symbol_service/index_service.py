@@ -4,11 +4,19 @@
 提供高效的符号查询和检索功能。
 """
 
-from typing import List, Optional, Dict, Set, Callable, Any
+from typing import List, Optional, Dict, Set, Callable, Any, Iterator, Iterable, Tuple
 from enum import Enum
+from itertools import groupby
+import heapq
 
-from ..models import Symbol, SymbolType, Scope, Reference, Position
+from ..models import Symbol, SymbolType, Scope, Reference, Position, Visibility
+from ..symbol_ids import assign_symbol_ids
 from ..database.repository import SymbolRepository, DatabaseManager
+from .prefix_index import PrefixIndex
+from .fuzzy_index import TrigramIndex, KIND_WEIGHTS, fuzzy_score
+from .regex_filter import RegexPlan, compile_regex
+from .query_planner import Predicate, plan_query, execute_plan
+from .interval_index import IntervalIndex
 
 
 class QueryOperator(Enum):
@@ -49,43 +57,240 @@ class SymbolIndexService:
         """
         self.repository = repository
         
-        # 内存索引（可选，用于性能优化）
-        self._symbol_name_index: Dict[str, List[Symbol]] = {}
-        self._symbol_type_index: Dict[SymbolType, List[Symbol]] = {}
+        # 内存索引（项目级，按文件增量维护）
+        # 名称/类型索引的值按文件分组，移除文件时只需处理该文件的符号
+        self._symbol_name_index: Dict[str, Dict[str, List[Symbol]]] = {}
+        self._symbol_type_index: Dict[SymbolType, Dict[str, List[Symbol]]] = {}
         self._file_index: Dict[str, List[Symbol]] = {}
         
+        # 属性倒排表：(属性, 取值) -> 文件 -> 符号，供查询计划选择驱动集合
+        self._attribute_index: Dict[Tuple[str, Any], Dict[str, List[Symbol]]] = {}
+        self._file_attribute_keys: Dict[str, Set[Tuple[str, Any]]] = {}
+        
+        # 名称前缀/后缀索引（与名称索引的键保持一致）
+        self._prefix_index = PrefixIndex()
+        
+        # 名称三元组倒排索引（用于子串和模糊搜索的候选筛选）
+        self._trigram_index = TrigramIndex()
+        
+        # 按文件的符号位置区间索引（首次位置查询时构建，文件变化时丢弃）
+        self._position_index: Dict[str, IntervalIndex[Symbol]] = {}
+        
         # 索引是否已构建
         self._indexed = False
     
     def build_index(self, symbols: List[Symbol]) -> None:
         """
-        构建内存索引
+        重建内存索引（清空后按文件重新加入所有符号）
         
         Args:
             symbols: 符号列表
         """
-        self._symbol_name_index.clear()
-        self._symbol_type_index.clear()
-        self._file_index.clear()
+        self.clear()
         
+        by_file: Dict[str, List[Symbol]] = {}
         for symbol in symbols:
+            by_file.setdefault(symbol.file_path, []).append(symbol)
+        for file_path, file_symbols in by_file.items():
+            self.add_file(file_path, file_symbols)
+        
+        self._indexed = True
+    
+    def add_file(self, file_path: str, symbols: List[Symbol]) -> None:
+        """
+        将文件的符号加入索引（已索引的文件会先移除旧符号）
+        
+        Args:
+            file_path: 文件路径
+            symbols: 文件的符号列表
+        """
+        self.remove_file(file_path)
+        
+        file_symbols = list(symbols)
+        self._file_index[file_path] = file_symbols
+        attribute_keys = self._file_attribute_keys[file_path] = set()
+        
+        for symbol in file_symbols:
             # 按名称索引
-            if symbol.name not in self._symbol_name_index:
-                self._symbol_name_index[symbol.name] = []
-            self._symbol_name_index[symbol.name].append(symbol)
+            by_file = self._symbol_name_index.get(symbol.name)
+            if by_file is None:
+                by_file = self._symbol_name_index[symbol.name] = {}
+                self._prefix_index.add(symbol.name)
+                self._trigram_index.add(symbol.name)
+            by_file.setdefault(file_path, []).append(symbol)
             
             # 按类型索引
-            if symbol.symbol_type not in self._symbol_type_index:
-                self._symbol_type_index[symbol.symbol_type] = []
-            self._symbol_type_index[symbol.symbol_type].append(symbol)
+            by_file = self._symbol_type_index.setdefault(symbol.symbol_type, {})
+            by_file.setdefault(file_path, []).append(symbol)
+            
+            # 按属性索引
+            for key in self._attribute_keys(symbol):
+                by_file = self._attribute_index.setdefault(key, {})
+                by_file.setdefault(file_path, []).append(symbol)
+                attribute_keys.add(key)
+    
+    def remove_file(self, file_path: str) -> int:
+        """
+        从索引中移除文件的所有符号
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            移除的符号数量
+        """
+        file_symbols = self._file_index.pop(file_path, None)
+        attribute_keys = self._file_attribute_keys.pop(file_path, set())
+        self._position_index.pop(file_path, None)
+        if not file_symbols:
+            return 0
+        
+        for symbol in file_symbols:
+            by_file = self._symbol_name_index.get(symbol.name)
+            if by_file is not None:
+                by_file.pop(file_path, None)
+                if not by_file:
+                    del self._symbol_name_index[symbol.name]
+                    self._prefix_index.discard(symbol.name)
+                    self._trigram_index.discard(symbol.name)
+            
+            by_file = self._symbol_type_index.get(symbol.symbol_type)
+            if by_file is not None:
+                by_file.pop(file_path, None)
+                if not by_file:
+                    del self._symbol_type_index[symbol.symbol_type]
+        
+        # 属性倒排表按加入时记录的键移除
+        for key in attribute_keys:
+            by_file = self._attribute_index.get(key)
+            if by_file is not None:
+                by_file.pop(file_path, None)
+                if not by_file:
+                    del self._attribute_index[key]
+        
+        return len(file_symbols)
+    
+    def rename_file(self, old_path: str, new_path: str) -> int:
+        """
+        将文件的符号移动到新路径（符号对象原地修改 file_path 和 ID）
+        
+        Args:
+            old_path: 原文件路径
+            new_path: 新文件路径
+        
+        Returns:
+            移动的符号数量
+        """
+        file_symbols = self._file_index.get(old_path)
+        self.remove_file(old_path)
+        if file_symbols is None:
+            self.remove_file(new_path)
+            return 0
+        
+        for symbol in file_symbols:
+            symbol.file_path = new_path
+        # 符号ID包含文件路径，与数据库中的重新计算保持一致
+        assign_symbol_ids(new_path, file_symbols)
+        self.add_file(new_path, file_symbols)
+        return len(file_symbols)
+    
+    @staticmethod
+    def _attribute_keys(symbol: Symbol) -> Iterator[Tuple[str, Any]]:
+        """获取符号在属性倒排表中的键"""
+        yield ("scope_id", symbol.scope_id)
+        yield ("visibility", symbol.visibility)
+        yield ("is_static", bool(symbol.is_static))
+        yield ("is_abstract", bool(symbol.is_abstract))
+        yield ("has_type", symbol.type_info is not None)
+        for base in set(symbol.extends):
+            yield ("extends", base)
+        for interface in set(symbol.implements):
+            yield ("implements", interface)
+    
+    def load_from_repository(self, batch_size: int = 1000) -> int:
+        """
+        从数据库批量预热索引（用于启动时恢复项目级索引）
+        
+        Args:
+            batch_size: 每批从数据库读取的行数
             
-            # 按文件索引
-            if symbol.file_path not in self._file_index:
-                self._file_index[symbol.file_path] = []
-            self._file_index[symbol.file_path].append(symbol)
+        Returns:
+            加载的符号数量
+        """
+        self.clear()
+        
+        count = 0
+        symbols = self.repository.iter_all_symbols(batch_size)
+        for file_path, file_symbols in groupby(symbols, key=lambda s: s.file_path):
+            file_symbols = list(file_symbols)
+            self.add_file(file_path, file_symbols)
+            count += len(file_symbols)
+        
+        self._indexed = True
+        return count
+    
+    def ensure_loaded(self, batch_size: int = 1000) -> None:
+        """
+        确保内存索引覆盖数据库中的全部文件
+        
+        未预热时 add_file 只加入本次会话处理过的文件，此时从数据库补全其余文件，
+        已在索引中的文件保持不变。之后的查询只使用内存索引。
+        
+        Args:
+            batch_size: 每批从数据库读取的行数
+        """
+        if self._indexed:
+            return
+        
+        symbols = self.repository.iter_all_symbols(batch_size)
+        for file_path, file_symbols in groupby(symbols, key=lambda s: s.file_path):
+            if file_path not in self._file_index:
+                self.add_file(file_path, list(file_symbols))
         
         self._indexed = True
     
+    def clear(self) -> None:
+        """清空索引"""
+        self._symbol_name_index.clear()
+        self._symbol_type_index.clear()
+        self._file_index.clear()
+        self._attribute_index.clear()
+        self._file_attribute_keys.clear()
+        self._prefix_index.clear()
+        self._trigram_index.clear()
+        self._position_index.clear()
+        self._indexed = False
+    
+    def get_indexed_files(self) -> List[str]:
+        """获取已索引的文件列表"""
+        return list(self._file_index.keys())
+    
+    def has_file(self, file_path: str) -> bool:
+        """文件是否已索引"""
+        return file_path in self._file_index
+    
+    def get_file_symbols(self, file_path: str) -> Optional[List[Symbol]]:
+        """获取已索引文件的符号（文件未索引时返回None）"""
+        return self._file_index.get(file_path)
+    
+    def _iter_grouped(self, 
+                      by_file: Dict[str, List[Symbol]], 
+                      file_path: Optional[str] = None) -> Iterator[Symbol]:
+        """遍历按文件分组的符号（指定文件时只取该文件）"""
+        if file_path:
+            yield from by_file.get(file_path, [])
+        else:
+            for symbols in by_file.values():
+                yield from symbols
+    
+    def _iter_all_symbols(self, file_path: Optional[str] = None) -> Iterator[Symbol]:
+        """遍历索引中的所有符号"""
+        if file_path:
+            yield from self._file_index.get(file_path, [])
+        else:
+            for symbols in self._file_index.values():
+                yield from symbols
+    
     def query(self, query: SymbolQuery) -> List[Symbol]:
         """
         查询符号
@@ -96,89 +301,219 @@ class SymbolIndexService:
         Returns:
             符号列表
         """
-        # 优先使用内存索引
+        # 内存索引覆盖全部文件时使用内存索引，否则查询数据库
         if self._indexed:
             return self._query_from_index(query)
         else:
             return self._query_from_database(query)
     
     def _query_from_index(self, query: SymbolQuery) -> List[Symbol]:
-        """从内存索引查询"""
-        results: Set[Symbol] = set()
+        """从内存索引查询（以最小的倒排表为驱动集合，其余条件依次过滤）"""
+        plan = plan_query(self._build_predicates(query))
+        return list(execute_plan(plan, lambda: self._iter_all_symbols(query.file_path)))
+    
+    def explain(self, query: SymbolQuery) -> List[str]:
+        """
+        获取内存查询的执行计划（用于调试）
         
-        # 按名称查询
-        if query.name:
-            if query.name_operator == QueryOperator.EQUALS:
-                results.update(self._symbol_name_index.get(query.name, []))
-            elif query.name_operator == QueryOperator.CONTAINS:
-                for name, symbols in self._symbol_name_index.items():
-                    if query.name in name:
-                        results.update(symbols)
-            elif query.name_operator == QueryOperator.STARTS_WITH:
-                for name, symbols in self._symbol_name_index.items():
-                    if name.startswith(query.name):
-                        results.update(symbols)
-            elif query.name_operator == QueryOperator.ENDS_WITH:
-                for name, symbols in self._symbol_name_index.items():
-                    if name.endswith(query.name):
-                        results.update(symbols)
+        Args:
+            query: 查询条件
+            
+        Returns:
+            依次执行的步骤
+        """
+        return plan_query(self._build_predicates(query)).describe()
+    
+    def _grouped_predicate(self, 
+                           name: str, 
+                           groups: List[Dict[str, List[Symbol]]], 
+                           test: Callable[[Symbol], bool],
+                           file_path: Optional[str]) -> Predicate:
+        """由按文件分组的倒排表构造谓词（指定文件时只取该文件的分组）"""
+        if file_path:
+            size = sum(len(by_file.get(file_path, ())) for by_file in groups)
         else:
-            # 如果没有名称过滤，从所有符号开始
-            for symbols in self._symbol_name_index.values():
-                results.update(symbols)
+            size = sum(len(symbols) for by_file in groups for symbols in by_file.values())
+        
+        def candidates() -> Iterator[Symbol]:
+            for by_file in groups:
+                yield from self._iter_grouped(by_file, file_path)
+        
+        return Predicate(name, size, test, candidates)
+    
+    def _attribute_predicate(self, 
+                             attribute: str, 
+                             values: List[Any], 
+                             test: Callable[[Symbol], bool],
+                             file_path: Optional[str]) -> Predicate:
+        """由属性倒排表构造谓词（多个取值时取并集）"""
+        groups = [self._attribute_index.get((attribute, value), {}) for value in values]
+        return self._grouped_predicate(attribute, groups, test, file_path)
+    
+    def _build_predicates(self, query: SymbolQuery) -> List[Predicate]:
+        """将查询条件拆分为谓词"""
+        predicates: List[Predicate] = []
+        file_path = query.file_path
         
-        # 按类型过滤
+        # 按名称
+        if query.name:
+            if query.name_operator == QueryOperator.EQUALS:
+                name = query.name
+                groups = [self._symbol_name_index.get(name, {})]
+                predicates.append(self._grouped_predicate(
+                    "name", groups, lambda s: s.name == name, file_path))
+            else:
+                names = set(self._match_names(query.name, query.name_operator))
+                groups = [self._symbol_name_index[n] for n in names]
+                predicates.append(self._grouped_predicate(
+                    "name", groups, lambda s: s.name in names, file_path))
+        
+        # 按类型
         if query.symbol_types:
-            results = {s for s in results if s.symbol_type in query.symbol_types}
+            types = set(query.symbol_types)
+            groups = [self._symbol_type_index.get(t, {}) for t in types]
+            predicates.append(self._grouped_predicate(
+                "symbol_type", groups, lambda s: s.symbol_type in types, file_path))
         
-        # 按文件过滤
-        if query.file_path:
-            results = {s for s in results if s.file_path == query.file_path}
+        # 按文件
+        if file_path:
+            file_symbols = self._file_index.get(file_path, [])
+            predicates.append(Predicate(
+                "file_path", len(file_symbols), lambda s: s.file_path == file_path,
+                lambda: file_symbols))
         
-        # 按作用域过滤
+        # 按作用域
         if query.scope_id is not None:
-            results = {s for s in results if s.scope_id == query.scope_id}
+            scope_id = query.scope_id
+            predicates.append(self._attribute_predicate(
+                "scope_id", [scope_id], lambda s: s.scope_id == scope_id, file_path))
         
-        # 按可见性过滤
+        # 按可见性
         if query.is_public is not None:
-            from ..models import Visibility
-            results = {s for s in results if (s.visibility == Visibility.PUBLIC) == query.is_public}
-        
-        # 按静态属性过滤
+            is_public = query.is_public
+            if is_public:
+                values = [Visibility.PUBLIC]
+            else:
+                values = [v for v in Visibility if v != Visibility.PUBLIC]
+            predicates.append(self._attribute_predicate(
+                "visibility", values, 
+                lambda s: (s.visibility == Visibility.PUBLIC) == is_public, file_path))
+        
+        # 按静态/抽象属性和类型信息
         if query.is_static is not None:
-            results = {s for s in results if s.is_static == query.is_static}
-        
-        # 按抽象属性过滤
+            is_static = query.is_static
+            predicates.append(self._attribute_predicate(
+                "is_static", [is_static], lambda s: s.is_static == is_static, file_path))
         if query.is_abstract is not None:
-            results = {s for s in results if s.is_abstract == query.is_abstract}
-        
-        # 按类型信息过滤
+            is_abstract = query.is_abstract
+            predicates.append(self._attribute_predicate(
+                "is_abstract", [is_abstract], lambda s: s.is_abstract == is_abstract, file_path))
         if query.has_type is not None:
-            results = {s for s in results if (s.type_info is not None) == query.has_type}
+            has_type = query.has_type
+            predicates.append(self._attribute_predicate(
+                "has_type", [has_type], lambda s: (s.type_info is not None) == has_type, file_path))
         
-        # 按继承过滤
+        # 按继承和实现
         if query.extends:
-            results = {s for s in results if query.extends in s.extends}
-        
-        # 按实现过滤
+            extends = query.extends
+            predicates.append(self._attribute_predicate(
+                "extends", [extends], lambda s: extends in s.extends, file_path))
         if query.implements:
-            results = {s for s in results if query.implements in s.implements}
+            implements = query.implements
+            predicates.append(self._attribute_predicate(
+                "implements", [implements], lambda s: implements in s.implements, file_path))
         
-        return list(results)
+        return predicates
     
-    def _query_from_database(self, query: SymbolQuery) -> List[Symbol]:
-        """从数据库查询"""
-        # 使用数据库仓库进行查询
-        if query.name and query.name_operator == QueryOperator.EQUALS:
-            return self.repository.get_symbols_by_name(query.name, query.file_path)
-        elif query.symbol_types and len(query.symbol_types) == 1:
-            return self.repository.get_symbols_by_type(query.symbol_types[0], query.file_path)
-        elif query.file_path:
-            return self.repository.get_symbols_by_file(query.file_path)
+    def _match_names(self, pattern: str, operator: QueryOperator) -> Iterable[str]:
+        """
+        获取满足名称条件的名称
+        
+        Args:
+            pattern: 名称模式
+            operator: 操作符
+            
+        Returns:
+            名称迭代器
+        """
+        if operator == QueryOperator.EQUALS:
+            return [pattern] if pattern in self._symbol_name_index else []
+        if operator == QueryOperator.STARTS_WITH:
+            return self._prefix_index.iter_prefix(pattern)
+        if operator == QueryOperator.ENDS_WITH:
+            return self._prefix_index.iter_suffix(pattern)
+        if operator == QueryOperator.REGEX:
+            return self._match_regex(compile_regex(pattern))
+        
+        # 包含：三元组倒排表筛选候选后再确认子串
+        if len(pattern) >= 3:
+            candidates: Iterable[str] = self._trigram_index.containing(pattern)
         else:
-            # 复杂查询需要加载所有符号后过滤
-            # 这里简化处理
-            return []
+            candidates = self._symbol_name_index.keys()
+        return [name for name in candidates if pattern in name]
+    
+    def _match_regex(self, plan: RegexPlan) -> Iterator[str]:
+        """
+        获取完全匹配正则表达式的名称
+        
+        区分大小写且有固定前缀时从前缀索引取候选；否则用长度不少于3的字面量
+        求三元组倒排表的交集；都不可用时遍历全部名称。候选先检查字面量，再执行 fullmatch。
+        
+        Args:
+            plan: 正则查询计划
+            
+        Returns:
+            名称迭代器
+        """
+        literals = [literal for literal in plan.literals if len(literal) >= 3]
+        
+        if plan.prefix and not plan.ignore_case:
+            candidates: Iterable[str] = self._prefix_index.iter_prefix(plan.prefix)
+        elif literals:
+            candidates = set.intersection(*(self._trigram_index.containing(literal) 
+                                            for literal in literals))
+        else:
+            candidates = list(self._symbol_name_index.keys())
+        
+        check_literals = () if plan.ignore_case else plan.literals
+        for name in candidates:
+            if all(literal in name for literal in check_literals) and plan.matches(name):
+                yield name
+    
+    def _query_from_database(self, query: SymbolQuery) -> List[Symbol]:
+        """从数据库查询（整个查询条件编译为一条 SQL 语句）"""
+        filters: Dict[str, Any] = {}
+        
+        if query.name:
+            operator = query.name_operator
+            if operator == QueryOperator.EQUALS:
+                filters["name"] = query.name
+            elif operator == QueryOperator.STARTS_WITH:
+                filters["name_prefix"] = query.name
+            elif operator == QueryOperator.ENDS_WITH:
+                filters["name_suffix"] = query.name
+            elif operator == QueryOperator.CONTAINS:
+                filters["name_contains"] = [query.name]
+            elif operator == QueryOperator.REGEX:
+                # 先用必须出现的前缀和字面量过滤，再执行正则
+                plan = compile_regex(query.name)
+                if not plan.ignore_case:
+                    filters["name_prefix"] = plan.prefix
+                    filters["name_contains"] = list(plan.literals)
+                filters["name_regex"] = query.name
+        
+        return self.repository.query_symbols(
+            symbol_types=query.symbol_types,
+            file_path=query.file_path,
+            scope_id=query.scope_id,
+            is_public=query.is_public,
+            is_static=query.is_static,
+            is_abstract=query.is_abstract,
+            has_type=query.has_type,
+            extends=query.extends,
+            implements=query.implements,
+            **filters
+        )
     
     def find_symbol_by_name(self, name: str, file_path: Optional[str] = None) -> List[Symbol]:
         """
@@ -197,17 +532,38 @@ class SymbolIndexService:
         query.file_path = file_path
         return self.query(query)
     
-    def find_symbols_by_prefix(self, prefix: str, file_path: Optional[str] = None) -> List[Symbol]:
+    def find_symbols_by_prefix(self, 
+                               prefix: str, 
+                               file_path: Optional[str] = None,
+                               limit: Optional[int] = None,
+                               ignore_case: bool = False,
+                               camel_case: bool = False) -> List[Symbol]:
         """
         按前缀查找符号（用于代码补全）
         
+        结果按名称字典序返回；指定 limit 时取到足够数量即停止，不会展开全部匹配。
+        
         Args:
             prefix: 名称前缀
             file_path: 文件路径（可选）
+            limit: 结果数量限制（可选）
+            ignore_case: 是否不区分大小写
+            camel_case: 是否同时按驼峰首字母匹配（如 gSN 匹配 getSymbolName）
             
         Returns:
             符号列表
         """
+        if self._indexed:
+            results: List[Symbol] = []
+            names = self._prefix_index.iter_completions(prefix, ignore_case, camel_case)
+            for name in names:
+                by_file = self._symbol_name_index[name]
+                for symbol in self._iter_grouped(by_file, file_path):
+                    results.append(symbol)
+                    if limit is not None and len(results) >= limit:
+                        return results
+            return results
+        
         query = SymbolQuery()
         query.name = prefix
         query.name_operator = QueryOperator.STARTS_WITH
@@ -251,7 +607,9 @@ class SymbolIndexService:
     
     def find_symbol_at_position(self, file_path: str, line: int, column: int) -> Optional[Symbol]:
         """
-        查找指定位置的符号
+        查找包含指定位置的最内层符号
+        
+        已索引的文件使用按文件缓存的区间索引（二分查找），否则查询数据库。
         
         Args:
             file_path: 文件路径
@@ -261,7 +619,15 @@ class SymbolIndexService:
         Returns:
             符号或None
         """
-        return self.repository.get_symbol_at_position(file_path, line, column)
+        file_symbols = self._file_index.get(file_path)
+        if file_symbols is None:
+            return self.repository.get_symbol_at_position(file_path, line, column)
+        
+        position_index = self._position_index.get(file_path)
+        if position_index is None:
+            position_index = IntervalIndex((symbol.range, symbol) for symbol in file_symbols)
+            self._position_index[file_path] = position_index
+        return position_index.find_innermost(Position(line=line, column=column, offset=0))
     
     def find_symbols_in_scope(self, scope: Scope) -> List[Symbol]:
         """
@@ -282,6 +648,8 @@ class SymbolIndexService:
         """
         模糊搜索符号
         
+        使用模糊匹配时结果按相关度从高到低排序。
+        
         Args:
             pattern: 搜索模式
             fuzzy: 是否使用模糊匹配
@@ -290,49 +658,61 @@ class SymbolIndexService:
         Returns:
             符号列表
         """
-        results: List[Symbol] = []
-        
         if fuzzy:
-            # 模糊匹配：检查模式字符是否按顺序出现
-            pattern_lower = pattern.lower()
-            for name, symbols in self._symbol_name_index.items():
-                if self._fuzzy_match(pattern_lower, name.lower()):
-                    results.extend(symbols)
-                    if len(results) >= limit:
-                        break
-        else:
-            # 包含匹配
-            query = SymbolQuery()
-            query.name = pattern
-            query.name_operator = QueryOperator.CONTAINS
-            results = self.query(query)
+            return self._search_fuzzy(pattern, limit)
         
-        return results[:limit]
+        # 包含匹配
+        query = SymbolQuery()
+        query.name = pattern
+        query.name_operator = QueryOperator.CONTAINS
+        return self.query(query)[:limit]
     
-    def _fuzzy_match(self, pattern: str, text: str) -> bool:
+    def _search_fuzzy(self, pattern: str, limit: int) -> List[Symbol]:
         """
-        模糊匹配
+        模糊搜索并按得分返回前 limit 个符号
+        
+        模式不少于3个字符时，先用三元组倒排表和驼峰首字母索引筛选候选名称；
+        候选中匹配的符号不足 limit 个时（如 clctr 这类缩写只按子序列匹配），
+        再补充首字母与模式相同（不区分大小写）的名称，不遍历全部名称。
+        模式较短时不使用三元组，只取驼峰首字母和首字母候选。候选按 fuzzy_score
+        加符号类型权重打分，用堆取前 limit 个，得分相同时按候选顺序。
         
         Args:
-            pattern: 模式
-            text: 文本
+            pattern: 搜索模式
+            limit: 结果数量限制
             
         Returns:
-            是否匹配
+            符号列表
         """
-        pattern_idx = 0
-        text_idx = 0
-        
-        while pattern_idx < len(pattern) and text_idx < len(text):
-            if pattern[pattern_idx] == text[text_idx]:
-                pattern_idx += 1
-            text_idx += 1
-        
-        return pattern_idx == len(pattern)
+        # 模糊排序只在内存中进行，先补全未加入索引的文件
+        self.ensure_loaded()
+        
+        def scored(names: Iterable[str]) -> Iterator[Tuple[float, Symbol]]:
+            for name in names:
+                score = fuzzy_score(pattern, name)
+                if score is None:
+                    continue
+                for symbol in self._iter_grouped(self._symbol_name_index[name]):
+                    yield score + KIND_WEIGHTS.get(symbol.symbol_type, 0.0), symbol
+        
+        candidates = set(self._prefix_index.iter_humps(pattern))
+        if len(pattern) >= 3:
+            candidates.update(self._trigram_index.candidates(pattern))
+        matches = list(scored(sorted(candidates)))
+        
+        if len(matches) < limit:
+            # 子序列匹配的补充候选：首字母相同的名称（有序数组中的一段连续区间）
+            matches.extend(scored(
+                name for name in self._prefix_index.iter_prefix(pattern[:1], ignore_case=True)
+                if name not in candidates
+            ))
+        
+        top = heapq.nlargest(limit, matches, key=lambda item: item[0])
+        return [symbol for _, symbol in top]
     
     def get_symbol_hierarchy(self, symbol: Symbol) -> Dict[str, Any]:
         """
-        获取符号层次结构
+        获取符号层次结构（直接基类、接口、完整祖先链和成员）
         
         Args:
             symbol: 符号
@@ -344,9 +724,22 @@ class SymbolIndexService:
             "symbol": symbol,
             "extends": [],
             "implements": [],
-            "members": []
+            "ancestors": [],
+            "members": symbol.members
         }
         
+        if symbol.id is not None:
+            # 已保存的符号直接使用持久化的关系（递归查询完整祖先链）
+            ancestors = self.repository.get_ancestors(symbol.id)
+            by_id = {s.id: s for s in ancestors}
+            for relation in self.repository.get_relations(symbol.id, ["extends", "implements"]):
+                target = by_id.get(relation.to_symbol_id)
+                if target is not None:
+                    hierarchy[relation.relation_type].append(target)
+            hierarchy["ancestors"] = ancestors
+            return hierarchy
+        
+        # 未保存的符号按名称在本文件中解析一层
         # 获取继承的类
         for base_name in symbol.extends:
             base_symbols = self.find_symbol_by_name(base_name, symbol.file_path)
@@ -359,9 +752,6 @@ class SymbolIndexService:
             if interface_symbols:
                 hierarchy["implements"].append(interface_symbols[0])
         
-        # 获取成员
-        hierarchy["members"] = symbol.members
-        
         return hierarchy
     
     def get_statistics(self, file_path: Optional[str] = None) -> Dict[str, int]:
@@ -374,14 +764,10 @@ class SymbolIndexService:
         Returns:
             统计字典
         """
+        self.ensure_loaded()
         stats = {}
         
-        if file_path:
-            symbols = self._file_index.get(file_path, [])
-        else:
-            symbols = []
-            for symbol_list in self._symbol_name_index.values():
-                symbols.extend(symbol_list)
+        symbols = list(self._iter_all_symbols(file_path))
         
         # 按类型统计
         for symbol_type in SymbolType:
@@ -0,0 +1,102 @@
+"""
+区间索引
+
+将一组（可嵌套的）源代码范围预处理为按位置排序的基本段，
+每个基本段记录覆盖它的最内层区间，位置查询通过二分查找在 O(log n) 内完成。
+"""
+
+import bisect
+import heapq
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from ..models import Position, Range
+
+
+T = TypeVar("T")
+
+# 位置键：(行号, 列号)
+PositionKey = Tuple[int, int]
+
+
+def position_key(position: Position) -> PositionKey:
+    """
+    将位置转换为可比较的键
+
+    Args:
+        position: 位置
+
+    Returns:
+        (行号, 列号)
+    """
+    return (position.line, position.column)
+
+
+class IntervalIndex(Generic[T]):
+    """
+    嵌套区间索引
+
+    区间为半开区间 [start, end)，与 Range.contains 的语义一致。
+    最内层区间定义为起始位置最靠后的区间；起始位置相同时取结束位置最靠前的；
+    范围完全相同时取最先加入的。对于语法树产生的嵌套范围，这与
+    “包含该位置的最小范围”一致。
+    """
+
+    def __init__(self, items: Iterable[Tuple[Range, T]]):
+        """
+        构建区间索引
+
+        Args:
+            items: (范围, 值) 列表
+        """
+        entries = []
+        for order, (range_, value) in enumerate(items):
+            start = position_key(range_.start)
+            end = position_key(range_.end)
+            if start < end:
+                entries.append((start, end, order, value))
+
+        self._size = len(entries)
+
+        # 基本段：相邻边界点之间的区间，记录覆盖该段的最内层值
+        boundaries = sorted({e[0] for e in entries} | {e[1] for e in entries})
+        entries.sort(key=lambda e: e[0])
+
+        self._segment_starts: List[PositionKey] = []
+        self._segment_values: List[Optional[T]] = []
+
+        # 活动区间堆：起始位置越靠后、结束位置越靠前、加入越早的越优先
+        active: List[Tuple[Tuple[int, int], PositionKey, int, int]] = []
+        next_entry = 0
+        for boundary in boundaries:
+            while next_entry < len(entries) and entries[next_entry][0] <= boundary:
+                start, end, order, _ = entries[next_entry]
+                heapq.heappush(active, ((-start[0], -start[1]), end, order, next_entry))
+                next_entry += 1
+
+            # 惰性移除已结束的区间
+            while active and active[0][1] <= boundary:
+                heapq.heappop(active)
+
+            value = entries[active[0][3]][3] if active else None
+            if self._segment_values and self._segment_values[-1] is value:
+                continue
+            self._segment_starts.append(boundary)
+            self._segment_values.append(value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def find_innermost(self, position: Position) -> Optional[T]:
+        """
+        查找包含指定位置的最内层区间的值
+
+        Args:
+            position: 位置
+
+        Returns:
+            值或None
+        """
+        index = bisect.bisect_right(self._segment_starts, position_key(position)) - 1
+        if index < 0:
+            return None
+        return self._segment_values[index]
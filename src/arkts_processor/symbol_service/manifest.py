@@ -0,0 +1,154 @@
+"""
+文件清单
+
+为已索引的文件记录大小、修改时间（纳秒）和内容摘要。重新索引时先比较
+stat 信息，一致则直接跳过；不一致时再计算内容摘要，摘要相同的文件
+（如仅被 touch 过）同样跳过，只更新清单中的 stat 信息。
+"""
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models import FileFingerprint
+
+
+# 修改时间距记录时刻小于该值（纳秒）的文件视为“可能仍在变化”
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+# 可能仍在变化的文件记录的修改时间（与任何 stat 都不一致）
+RACY_MTIME = -1
+
+
+def content_hash(data: bytes) -> str:
+    """
+    计算文件内容摘要
+
+    Args:
+        data: 文件内容
+
+    Returns:
+        blake2b（16字节）摘要的十六进制字符串
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def fingerprint(file_path: str, data: bytes, stat: os.stat_result) -> FileFingerprint:
+    """
+    根据已读取的内容和 stat 信息生成文件指纹
+
+    Args:
+        file_path: 文件路径
+        data: 文件内容
+        stat: 读取时的 stat 信息
+
+    Returns:
+        文件指纹
+    """
+    return FileFingerprint(file_path, stat.st_size, _recorded_mtime(stat), content_hash(data))
+
+
+def _recorded_mtime(stat: os.stat_result) -> int:
+    """
+    获取写入清单的修改时间
+
+    修改时间距当前时刻太近时，文件可能在同一时间粒度内再次被修改而 stat 不变，
+    此时记为 RACY_MTIME，下次比较时总是计算内容摘要。
+    """
+    if time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS:
+        return RACY_MTIME
+    return stat.st_mtime_ns
+
+
+def read_with_fingerprint(file_path: str) -> Tuple[bytes, FileFingerprint]:
+    """
+    读取文件并生成指纹（stat 信息取自同一个打开的文件）
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        (文件内容, 文件指纹)
+    """
+    with open(file_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    return data, fingerprint(file_path, data, stat)
+
+
+def stat_matches(entry: FileFingerprint, stat: os.stat_result) -> bool:
+    """判断 stat 信息是否与清单记录一致"""
+    return entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns
+
+
+@dataclass
+class ManifestDiff:
+    """待索引文件与文件清单的比较结果"""
+    added: List[str] = field(default_factory=list)  # 不在清单中
+    changed: List[str] = field(default_factory=list)  # 内容摘要不同
+    unchanged: List[str] = field(default_factory=list)  # 可以跳过
+    removed: List[str] = field(default_factory=list)  # 在清单中但文件已不存在
+    missing: List[str] = field(default_factory=list)  # 不在清单中且文件不存在
+    touched: List[FileFingerprint] = field(default_factory=list)  # 内容未变、stat 信息需要更新
+
+
+def diff_manifest(file_paths: Iterable[str],
+                  manifest: Dict[str, FileFingerprint],
+                  purge_missing: bool = True) -> ManifestDiff:
+    """
+    比较待索引文件与文件清单
+
+    Args:
+        file_paths: 待索引的文件路径
+        manifest: 文件清单（文件路径 -> 指纹）
+        purge_missing: 是否将清单中不在 file_paths 内且已不存在的文件也计入 removed
+
+    Returns:
+        比较结果
+    """
+    diff = ManifestDiff()
+    requested = set()
+    for file_path in file_paths:
+        if file_path in requested:
+            continue
+        requested.add(file_path)
+
+        entry = manifest.get(file_path)
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            (diff.removed if entry is not None else diff.missing).append(file_path)
+            continue
+
+        if entry is None:
+            diff.added.append(file_path)
+        elif stat_matches(entry, stat):
+            diff.unchanged.append(file_path)
+        else:
+            current = _hash_file(file_path)
+            if current is None:
+                diff.removed.append(file_path)
+            elif current == entry.content_hash:
+                diff.unchanged.append(file_path)
+                touched = FileFingerprint(file_path, stat.st_size, _recorded_mtime(stat), current)
+                if touched != entry:
+                    diff.touched.append(touched)
+            else:
+                diff.changed.append(file_path)
+
+    if purge_missing:
+        for file_path in manifest:
+            if file_path not in requested and not os.path.exists(file_path):
+                diff.removed.append(file_path)
+    return diff
+
+
+def _hash_file(file_path: str) -> Optional[str]:
+    """计算文件内容摘要（文件已不存在时返回None）"""
+    try:
+        with open(file_path, 'rb') as f:
+            return content_hash(f.read())
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,110 @@
+"""
+并行索引器
+
+使用进程池并行执行解析和分析阶段。每个工作进程持有独立的 tree-sitter
+解析器，分析结果按输入顺序返回给主进程，由单一写入方提交到数据库。
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import List, Optional, Iterator, Deque
+
+from .pipeline import AnalysisPipeline, FileAnalysis, ParserFactory
+
+
+# 工作进程内的分析流水线（由 _init_worker 初始化）
+_worker_pipeline: Optional[AnalysisPipeline] = None
+
+
+def _init_worker(parser_factory: ParserFactory) -> None:
+    """
+    工作进程初始化：创建进程私有的解析器
+
+    Args:
+        parser_factory: 解析器工厂（需可被 pickle）
+    """
+    global _worker_pipeline
+    _worker_pipeline = AnalysisPipeline(parser_factory())
+
+
+def _analyze_batch(file_paths: List[str]) -> List[FileAnalysis]:
+    """
+    在工作进程中分析一批文件
+
+    单个文件失败不会影响同批其他文件，错误信息记录在结果中。
+
+    Args:
+        file_paths: 文件路径列表
+
+    Returns:
+        分析结果列表（与输入顺序一致）
+    """
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append(_worker_pipeline.analyze_file(file_path))
+        except Exception as e:
+            results.append(FileAnalysis(file_path=file_path, error=str(e)))
+    return results
+
+
+class ParallelIndexer:
+    """并行索引器"""
+
+    def __init__(self,
+                 parser_factory: ParserFactory,
+                 workers: Optional[int] = None,
+                 chunksize: int = 16):
+        """
+        初始化并行索引器
+
+        Args:
+            parser_factory: 解析器工厂，在每个工作进程中调用一次
+            workers: 工作进程数（None 表示使用 CPU 核数）
+            chunksize: 每个任务包含的文件数
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1")
+
+        self.parser_factory = parser_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+
+    def analyze(self, file_paths: List[str]) -> Iterator[FileAnalysis]:
+        """
+        并行分析文件，按输入顺序逐个产出结果
+
+        同时在途的任务数限制为工作进程数的两倍，避免写入方较慢时
+        结果在内存中无限堆积。
+
+        Args:
+            file_paths: 文件路径列表
+
+        Yields:
+            分析结果
+        """
+        batches = [
+            file_paths[i:i + self.chunksize]
+            for i in range(0, len(file_paths), self.chunksize)
+        ]
+        if not batches:
+            return
+
+        max_in_flight = self.workers * 2
+
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.parser_factory,)) as executor:
+            pending: Deque[Future] = deque()
+            next_batch = 0
+
+            while next_batch < len(batches) or pending:
+                # 补充在途任务
+                while next_batch < len(batches) and len(pending) < max_in_flight:
+                    pending.append(executor.submit(_analyze_batch, batches[next_batch]))
+                    next_batch += 1
+
+                # 按提交顺序取回结果，保证写入顺序与输入一致
+                for analysis in pending.popleft().result():
+                    yield analysis
@@ -0,0 +1,150 @@
+"""
+符号分析流水线
+
+将单个文件的解析与四个分析阶段（符号提取、作用域分析、类型推导、引用解析）
+封装为与数据库无关的处理单元，供顺序处理和并行工作进程共用。
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Callable
+
+import tree_sitter
+from tree_sitter import Tree
+
+from ..models import Symbol, Scope, Reference, SymbolRelation, FileFingerprint, ImportBinding
+from ..source_index import SourceIndex
+from ..symbol_ids import assign_symbol_ids
+from .ast_traverser import ASTVisitor, FusedTraverser
+from .extractor import SymbolExtractor
+from .scope_analyzer import ScopeAnalyzer
+from .type_inference import TypeInferenceEngine
+from .reference_resolver import ReferenceResolver
+from .manifest import read_with_fingerprint
+
+
+ParserFactory = Callable[[], tree_sitter.Parser]
+
+
+def create_default_parser() -> tree_sitter.Parser:
+    """
+    创建默认的 ArkTS 解析器
+
+    依赖 tree-sitter-arkts-open 包（模块名 tree_sitter_arkts），
+    在调用时才导入，未安装时抛出 ImportError。
+
+    Returns:
+        配置好 ArkTS 语言的 tree-sitter 解析器
+    """
+    import tree_sitter_arkts
+
+    language = tree_sitter.Language(tree_sitter_arkts.language())
+    return tree_sitter.Parser(language)
+
+
+@dataclass
+class FileAnalysis:
+    """单个文件的分析结果（符号ID在提取时确定，可跨进程传递）"""
+    file_path: str
+    symbols: List[Symbol] = field(default_factory=list)
+    scopes: List[Scope] = field(default_factory=list)
+    references: List[Reference] = field(default_factory=list)
+    relations: List[SymbolRelation] = field(default_factory=list)
+    imports: List[ImportBinding] = field(default_factory=list)
+
+    # 读取文件时的指纹（内容不来自磁盘时为None）
+    fingerprint: Optional[FileFingerprint] = None
+
+    # 处理失败时的错误信息
+    error: Optional[str] = None
+
+
+class AnalysisPipeline:
+    """符号分析流水线"""
+
+    def __init__(self, parser: Optional[tree_sitter.Parser] = None):
+        """
+        初始化分析流水线
+
+        Args:
+            parser: tree-sitter解析器（仅 analyze_file 需要）
+        """
+        self.parser = parser
+
+    def analyze_file(self, file_path: str) -> FileAnalysis:
+        """
+        读取、解析并分析单个文件
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            分析结果
+        """
+        if not self.parser:
+            raise RuntimeError("Parser not initialized. Pass AnalysisPipeline(parser=create_default_parser()).")
+
+        source_code, file_fingerprint = read_with_fingerprint(file_path)
+
+        tree = self.parser.parse(source_code)
+        analysis = self.analyze(file_path, source_code, tree)
+        analysis.fingerprint = file_fingerprint
+        return analysis
+
+    def analyze(self,
+                file_path: str,
+                source_code: bytes,
+                tree: Tree,
+                symbols: Optional[List[Symbol]] = None) -> FileAnalysis:
+        """
+        对已解析的语法树执行四个分析阶段
+
+        Args:
+            file_path: 文件路径
+            source_code: 源代码字节
+            tree: 语法树
+            symbols: 已提取的符号（增量解析时提供，跳过符号提取阶段）
+
+        Returns:
+            分析结果
+        """
+        # 各阶段共享同一份源代码索引，整个文件只解码一次
+        source_index = SourceIndex(source_code)
+        scope_analyzer = ScopeAnalyzer(file_path, source_code, source_index)
+        reference_resolver = ReferenceResolver(file_path, source_code, source_index)
+
+        # 符号提取、作用域构建和引用候选收集共用一次语法树遍历
+        handlers: List[ASTVisitor] = []
+        extractor = None
+        if symbols is None:
+            extractor = SymbolExtractor(file_path, source_code, source_index)
+            handlers.append(extractor)
+        handlers.extend([scope_analyzer, reference_resolver])
+
+        scope_analyzer.begin(tree)
+        reference_resolver.begin()
+        FusedTraverser(handlers).walk(tree.root_node)
+
+        # 第一步：提取符号（复用的符号位置已平移，按新位置重新计算ID）
+        if extractor is not None:
+            symbols = extractor.finish()
+        else:
+            assign_symbol_ids(file_path, symbols)
+
+        # 第二步：作用域分析
+        scopes = scope_analyzer.finish(symbols)
+
+        # 第三步：类型推导
+        type_engine = TypeInferenceEngine(source_code, source_index)
+        type_engine.infer_types(symbols, scopes)
+
+        # 第四步：引用解析
+        references, relations = reference_resolver.finish(symbols, scopes, scope_analyzer)
+
+        return FileAnalysis(
+            file_path=file_path,
+            symbols=symbols,
+            scopes=scopes,
+            references=references,
+            relations=relations,
+            imports=reference_resolver.imports
+        )
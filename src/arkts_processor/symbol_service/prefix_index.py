@@ -0,0 +1,234 @@
+"""
+名称前缀索引
+
+将符号名称维护为若干有序数组，前缀查询通过二分查找定位起点后顺序遍历，
+支持区分/不区分大小写的前缀匹配、驼峰首字母匹配，以及基于反转名称的后缀匹配。
+"""
+
+import bisect
+from typing import Any, Callable, Dict, Iterator, Set
+
+
+def camel_humps(name: str) -> str:
+    """
+    提取名称的驼峰首字母（小写）
+
+    首字符、小写字母或数字之后的大写字母、连续大写字母中后接小写字母的最后一个、
+    以及 '_'/'$' 之后的字母都视为一个驼峰的开头。
+    例如 getSymbolName -> gsn，HTTPServer -> hs，MAX_VALUE -> mv。
+
+    Args:
+        name: 符号名称
+
+    Returns:
+        驼峰首字母
+    """
+    humps = []
+    previous = ""
+    length = len(name)
+    for i, char in enumerate(name):
+        if not char.isalnum():
+            previous = char
+            continue
+        if (not previous or previous in "_$"
+                or (char.isupper() and not previous.isupper())
+                or (char.isupper() and previous.isupper()
+                    and i + 1 < length and name[i + 1].islower())):
+            humps.append(char.lower())
+        previous = char
+    return "".join(humps)
+
+
+class PrefixIndex:
+    """
+    名称前缀索引
+
+    名称的增删先记入待处理集合，在下一次查询时合并：变化较少时逐个二分插入/删除，
+    变化较多（如全量构建）时直接重新排序。各有序数组在首次被查询时才构建。
+    """
+
+    # 各有序数组的排序键
+    KEY_FUNCTIONS: Dict[str, Callable[[str], Any]] = {
+        "sorted": lambda name: name,
+        "folded": lambda name: (name.lower(), name),
+        "reversed": lambda name: name[::-1],
+        "humps": lambda name: (camel_humps(name), name),
+    }
+
+    def __init__(self):
+        """初始化前缀索引"""
+        self._names: Set[str] = set()
+
+        # 有序数组，首次使用时才构建
+        self._arrays: Dict[str, list] = {}
+
+        # 待合并的变化
+        self._pending_add: Set[str] = set()
+        self._pending_remove: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def add(self, name: str) -> None:
+        """
+        加入名称
+
+        Args:
+            name: 符号名称
+        """
+        if name in self._names:
+            return
+        self._names.add(name)
+        if name in self._pending_remove:
+            self._pending_remove.discard(name)
+        else:
+            self._pending_add.add(name)
+
+    def discard(self, name: str) -> None:
+        """
+        移除名称（不存在时忽略）
+
+        Args:
+            name: 符号名称
+        """
+        if name not in self._names:
+            return
+        self._names.discard(name)
+        if name in self._pending_add:
+            self._pending_add.discard(name)
+        else:
+            self._pending_remove.add(name)
+
+    def clear(self) -> None:
+        """清空索引"""
+        self._names.clear()
+        self._arrays.clear()
+        self._pending_add.clear()
+        self._pending_remove.clear()
+
+    def _array(self, kind: str) -> list:
+        """
+        获取合并了待处理变化的有序数组
+
+        Args:
+            kind: 数组类型（KEY_FUNCTIONS 的键）
+
+        Returns:
+            有序数组
+        """
+        changes = len(self._pending_add) + len(self._pending_remove)
+        if changes:
+            if changes > len(self._names) // 8 + 64:
+                # 变化较多时丢弃已构建的数组，按需重新排序
+                self._arrays.clear()
+            else:
+                for array_kind, items in self._arrays.items():
+                    key = self.KEY_FUNCTIONS[array_kind]
+                    for name in self._pending_remove:
+                        self._remove_sorted(items, key(name))
+                    for name in self._pending_add:
+                        bisect.insort(items, key(name))
+            self._pending_add.clear()
+            self._pending_remove.clear()
+
+        items = self._arrays.get(kind)
+        if items is None:
+            key = self.KEY_FUNCTIONS[kind]
+            items = self._arrays[kind] = sorted(key(name) for name in self._names)
+        return items
+
+    @staticmethod
+    def _remove_sorted(items: list, item) -> None:
+        """从有序数组中删除一个元素"""
+        index = bisect.bisect_left(items, item)
+        if index < len(items) and items[index] == item:
+            del items[index]
+
+    def iter_prefix(self, prefix: str, ignore_case: bool = False) -> Iterator[str]:
+        """
+        按字典序遍历以指定前缀开头的名称
+
+        Args:
+            prefix: 前缀
+            ignore_case: 是否不区分大小写
+
+        Returns:
+            名称迭代器
+        """
+        if ignore_case:
+            folded = prefix.lower()
+            items = self._array("folded")
+            index = bisect.bisect_left(items, (folded,))
+            while index < len(items) and items[index][0].startswith(folded):
+                yield items[index][1]
+                index += 1
+        else:
+            items = self._array("sorted")
+            index = bisect.bisect_left(items, prefix)
+            while index < len(items) and items[index].startswith(prefix):
+                yield items[index]
+                index += 1
+
+    def iter_suffix(self, suffix: str) -> Iterator[str]:
+        """
+        遍历以指定后缀结尾的名称（按反转名称排序）
+
+        Args:
+            suffix: 后缀
+
+        Returns:
+            名称迭代器
+        """
+        reversed_suffix = suffix[::-1]
+        items = self._array("reversed")
+        index = bisect.bisect_left(items, reversed_suffix)
+        while index < len(items) and items[index].startswith(reversed_suffix):
+            yield items[index][::-1]
+            index += 1
+
+    def iter_humps(self, pattern: str) -> Iterator[str]:
+        """
+        遍历驼峰首字母以指定模式开头的名称（不区分大小写）
+
+        Args:
+            pattern: 驼峰首字母模式，如 gSN 或 gsn
+
+        Returns:
+            名称迭代器
+        """
+        folded = pattern.lower()
+        items = self._array("humps")
+        index = bisect.bisect_left(items, (folded,))
+        while index < len(items) and items[index][0].startswith(folded):
+            yield items[index][1]
+            index += 1
+
+    def iter_completions(self,
+                         prefix: str,
+                         ignore_case: bool = False,
+                         camel_case: bool = False) -> Iterator[str]:
+        """
+        遍历补全候选名称：先返回前缀匹配，再返回驼峰首字母匹配（去重）
+
+        Args:
+            prefix: 输入前缀
+            ignore_case: 前缀匹配是否不区分大小写
+            camel_case: 是否追加驼峰首字母匹配
+
+        Returns:
+            名称迭代器
+        """
+        if not camel_case or not prefix:
+            yield from self.iter_prefix(prefix, ignore_case)
+            return
+
+        seen: Set[str] = set()
+        for name in self.iter_prefix(prefix, ignore_case):
+            seen.add(name)
+            yield name
+        for name in self.iter_humps(prefix):
+            if name not in seen:
+                yield name
@@ -0,0 +1,86 @@
+"""
+符号查询计划
+
+将查询条件拆分为若干谓词，每个谓词给出结果规模估计、候选生成方式（倒排表）
+和逐个判定函数。执行时以规模最小的倒排表作为驱动集合，
+其余谓词按规模从小到大依次过滤，避免从全部符号开始逐条件缩小。
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Set
+
+from ..models import Symbol
+
+
+@dataclass
+class Predicate:
+    """查询谓词"""
+    name: str
+    size: float  # 满足该谓词的符号数量估计（无倒排表时为 inf）
+    test: Callable[[Symbol], bool]
+    candidates: Optional[Callable[[], Iterable[Symbol]]] = None  # 倒排表
+
+    @property
+    def has_postings(self) -> bool:
+        """是否可以作为驱动集合"""
+        return self.candidates is not None
+
+
+@dataclass
+class QueryPlan:
+    """查询计划：驱动谓词和按顺序执行的过滤谓词"""
+    driver: Optional[Predicate]
+    filters: List[Predicate]
+
+    def describe(self) -> List[str]:
+        """
+        获取计划的文字描述（用于调试）
+
+        Returns:
+            依次执行的谓词名称，驱动谓词在前
+        """
+        steps = [f"scan {self.driver.name}" if self.driver else "scan all"]
+        steps.extend(f"filter {p.name}" for p in self.filters)
+        return steps
+
+
+def plan_query(predicates: List[Predicate]) -> QueryPlan:
+    """
+    生成查询计划
+
+    Args:
+        predicates: 谓词列表
+
+    Returns:
+        查询计划
+    """
+    ordered = sorted(predicates, key=lambda p: p.size)
+    driver = next((p for p in ordered if p.has_postings), None)
+    filters = [p for p in ordered if p is not driver]
+    return QueryPlan(driver, filters)
+
+
+def execute_plan(plan: QueryPlan, all_symbols: Callable[[], Iterable[Symbol]]) -> Set[Symbol]:
+    """
+    执行查询计划
+
+    Args:
+        plan: 查询计划
+        all_symbols: 没有可用倒排表时遍历全部符号的函数
+
+    Returns:
+        符号集合
+    """
+    if plan.driver is not None:
+        if plan.driver.size == 0:
+            return set()
+        results = set(plan.driver.candidates())
+    else:
+        results = set(all_symbols())
+
+    for predicate in plan.filters:
+        if not results:
+            break
+        test = predicate.test
+        results = {s for s in results if test(s)}
+    return results
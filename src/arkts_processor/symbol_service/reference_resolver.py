@@ -4,31 +4,46 @@
 建立符号间的引用关系，支持查找定义、查找引用等功能。
 """
 
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, Set, Tuple
 from tree_sitter import Node, Tree
 
 from ..models import (
     Symbol, Reference, ReferenceType, Position, 
-    SymbolRelation, Scope
+    SymbolRelation, Scope, ImportBinding
 )
-from .ast_traverser import ASTVisitor, ASTTraverser, NodeHelper
+from ..source_index import SourceIndex
+from .ast_traverser import ASTVisitor, ASTTraverser, FusedTraverser, NodeHelper
 from .scope_analyzer import ScopeAnalyzer
+from .interval_index import IntervalIndex
+from .dependencies import resolve_module_path
 
 
 class ReferenceResolver(ASTVisitor):
     """引用解析器"""
     
-    def __init__(self, file_path: str, source_code: bytes):
+    # 可能产生引用的节点类型及其处理方法
+    REFERENCE_NODE_HANDLERS = {
+        "identifier": "_resolve_identifier_reference",
+        "type_identifier": "_resolve_type_reference",
+        "call_expression": "_resolve_call_reference",
+        "member_expression": "_resolve_member_reference",
+        "import_statement": "_resolve_import_reference",
+        "import_declaration": "_collect_import_bindings",
+        "export_statement": "_resolve_export_reference",
+    }
+    
+    def __init__(self, file_path: str, source_code: bytes, source_index: Optional[SourceIndex] = None):
         """
         初始化引用解析器
         
         Args:
             file_path: 文件路径
             source_code: 源代码字节
+            source_index: 共享的源代码索引（None 表示按需创建）
         """
         self.file_path = file_path
         self.source_code = source_code
-        self.traverser = ASTTraverser(source_code)
+        self.traverser = ASTTraverser(source_code, source_index)
         
         # 符号表和作用域
         self.symbols: Dict[str, Symbol] = {}
@@ -39,11 +54,20 @@ class ReferenceResolver(ASTVisitor):
         # 引用列表
         self.references: List[Reference] = []
         
+        # 导入绑定（跨文件引用由 SymbolService 按导入绑定解析）
+        self.imports: List[ImportBinding] = []
+        
+        # 引用位置索引（find_definition 首次调用时构建）
+        self._reference_index: Optional[IntervalIndex[Reference]] = None
+        
         # 符号关系
         self.relations: List[SymbolRelation] = []
         
         # 当前作用域
         self.current_scope: Optional[Scope] = None
+        
+        # 遍历阶段收集的候选节点（按前序顺序）
+        self._candidate_nodes: List[Node] = []
     
     def resolve(self, 
                 tree: Tree, 
@@ -59,6 +83,50 @@ class ReferenceResolver(ASTVisitor):
             scopes: 作用域列表
             scope_analyzer: 作用域分析器
             
+        Returns:
+            (引用列表, 符号关系列表)
+        """
+        self.begin()
+        FusedTraverser([self]).walk(tree.root_node)
+        return self.finish(symbols, scopes, scope_analyzer)
+    
+    def begin(self) -> None:
+        """
+        开始收集候选节点
+        
+        作为融合遍历的阶段处理器使用时，需在遍历前调用。
+        """
+        self._candidate_nodes = []
+    
+    def enter_node(self, node: Node) -> bool:
+        """
+        进入节点：收集可能产生引用的节点
+        
+        引用解析依赖完整的作用域和符号表，因此遍历时只收集节点，
+        在 finish() 中统一解析。
+        
+        Args:
+            node: AST节点
+            
+        Returns:
+            始终继续访问子节点
+        """
+        if node.type in self.REFERENCE_NODE_HANDLERS:
+            self._candidate_nodes.append(node)
+        return True
+    
+    def finish(self, 
+               symbols: List[Symbol], 
+               scopes: List[Scope],
+               scope_analyzer: ScopeAnalyzer) -> tuple[List[Reference], List[SymbolRelation]]:
+        """
+        解析已收集的候选节点并建立符号关系
+        
+        Args:
+            symbols: 符号列表
+            scopes: 作用域列表
+            scope_analyzer: 作用域分析器
+            
         Returns:
             (引用列表, 符号关系列表)
         """
@@ -67,41 +135,20 @@ class ReferenceResolver(ASTVisitor):
         self.scopes = scopes
         self.scope_analyzer = scope_analyzer
         self.references = []
+        self.imports = []
         self.relations = []
+        self._reference_index = None
         
-        # 遍历AST查找引用
-        self._resolve_references(tree.root_node)
+        # 按遍历顺序解析引用
+        for node in self._candidate_nodes:
+            getattr(self, self.REFERENCE_NODE_HANDLERS[node.type])(node)
+        self._candidate_nodes = []
         
         # 建立符号关系
         self._build_symbol_relations(symbols)
         
         return self.references, self.relations
     
-    def _resolve_references(self, node: Node) -> None:
-        """
-        递归解析引用
-        
-        Args:
-            node: AST节点
-        """
-        # 处理不同类型的引用
-        if node.type == "identifier":
-            self._resolve_identifier_reference(node)
-        elif node.type == "type_identifier":
-            self._resolve_type_reference(node)
-        elif node.type == "call_expression":
-            self._resolve_call_reference(node)
-        elif node.type == "member_expression":
-            self._resolve_member_reference(node)
-        elif node.type == "import_statement":
-            self._resolve_import_reference(node)
-        elif node.type == "export_statement":
-            self._resolve_export_reference(node)
-        
-        # 递归处理子节点
-        for child in node.children:
-            self._resolve_references(child)
-    
     def _resolve_identifier_reference(self, node: Node) -> None:
         """解析标识符引用"""
         name = self.traverser.get_node_text(node)
@@ -129,6 +176,7 @@ class ReferenceResolver(ASTVisitor):
                         file_path=self.file_path,
                         position=position,
                         reference_type=ref_type,
+                        end_column=self._end_column(node),
                         context=self._get_reference_context(node)
                     )
                     
@@ -154,6 +202,7 @@ class ReferenceResolver(ASTVisitor):
                     file_path=self.file_path,
                     position=position,
                     reference_type=ReferenceType.TYPE_REFERENCE,
+                    end_column=self._end_column(node),
                     context=self._get_reference_context(node)
                 )
                 
@@ -185,6 +234,7 @@ class ReferenceResolver(ASTVisitor):
                         file_path=self.file_path,
                         position=position,
                         reference_type=ReferenceType.CALL,
+                        end_column=self._end_column(function_node),
                         context=self._get_reference_context(node)
                     )
                     
@@ -216,6 +266,7 @@ class ReferenceResolver(ASTVisitor):
                     file_path=self.file_path,
                     position=position,
                     reference_type=ref_type,
+                    end_column=self._end_column(property_node),
                     context=self._get_reference_context(node)
                 )
                 
@@ -248,11 +299,48 @@ class ReferenceResolver(ASTVisitor):
                             file_path=self.file_path,
                             position=position,
                             reference_type=ReferenceType.IMPORT,
+                            end_column=self._end_column(child),
                             context=self._get_reference_context(node)
                         )
                         
                         self.references.append(reference)
     
+    def _collect_import_bindings(self, node: Node) -> None:
+        """收集导入声明中的导入绑定"""
+        module_node = next((c for c in node.children if c.type == "string_literal"), None)
+        if module_node is None:
+            return
+        module = self.traverser.get_node_text(module_node).strip("'\"")
+        target_path = resolve_module_path(self.file_path, module)
+        
+        bindings: List[Tuple[Node, str]] = []
+        namespace = False
+        for child in node.children:
+            if child.type == "import_specifier":
+                names = [c for c in child.children if c.type == "identifier"]
+                if names:
+                    bindings.append((names[-1], self.traverser.get_node_text(names[0])))
+            elif child.type == "*":
+                namespace = True
+            elif child.type == "identifier":
+                # import X from / import * as X from
+                bindings.append((child, "*" if namespace else "default"))
+        
+        for name_node, imported_name in bindings:
+            self.imports.append(ImportBinding(
+                file_path=self.file_path,
+                local_name=self.traverser.get_node_text(name_node),
+                imported_name=imported_name,
+                module=module,
+                position=Position(
+                    line=name_node.start_point[0],
+                    column=name_node.start_point[1],
+                    offset=name_node.start_byte
+                ),
+                end_column=self._end_column(name_node),
+                target_path=target_path
+            ))
+    
     def _resolve_export_reference(self, node: Node) -> None:
         """解析导出引用"""
         # 提取导出的符号
@@ -276,11 +364,19 @@ class ReferenceResolver(ASTVisitor):
                             file_path=self.file_path,
                             position=position,
                             reference_type=ReferenceType.EXPORT,
+                            end_column=self._end_column(name_node),
                             context=self._get_reference_context(node)
                         )
                         
                         self.references.append(reference)
     
+    @staticmethod
+    def _end_column(node: Node) -> Optional[int]:
+        """获取节点的结束列（节点跨行时返回None）"""
+        if node.end_point[0] != node.start_point[0]:
+            return None
+        return node.end_point[1]
+    
     def _determine_reference_type(self, node: Node) -> ReferenceType:
         """
         确定引用类型（读取或写入）
@@ -328,15 +424,8 @@ class ReferenceResolver(ASTVisitor):
         line_start = node.start_point[0]
         line_end = node.end_point[0]
         
-        # 获取所在行的代码
-        lines = self.source_code.decode('utf-8').split('\n')
-        if line_start < len(lines):
-            if line_start == line_end:
-                return lines[line_start].strip()
-            else:
-                return '\n'.join(lines[line_start:line_end+1]).strip()
-        
-        return ""
+        # 通过行偏移索引直接切片获取所在行的代码
+        return self.traverser.source_index.get_lines(line_start, line_end).strip()
     
     def _build_symbol_relations(self, symbols: List[Symbol]) -> None:
         """
@@ -385,17 +474,16 @@ class ReferenceResolver(ASTVisitor):
         Returns:
             符号定义或None
         """
-        # 查找该位置的引用
-        position = Position(line=line, column=column, offset=0)
-        
-        for ref in self.references:
-            if (ref.file_path == file_path and 
-                ref.position.line == line and 
-                ref.position.column <= column):
-                # 返回引用的符号
-                return self.symbol_by_id.get(ref.symbol_id)
-        
-        return None
+        if file_path != self.file_path:
+            return None
+        
+        # 引用按位置建立区间索引（首次查询时构建），二分查找覆盖该位置的引用
+        if self._reference_index is None:
+            self._reference_index = IntervalIndex((ref.span, ref) for ref in self.references)
+        ref = self._reference_index.find_innermost(Position(line=line, column=column, offset=0))
+        if ref is None:
+            return None
+        return self.symbol_by_id.get(ref.symbol_id)
     
     def find_references(self, symbol: Symbol) -> List[Reference]:
         """
@@ -0,0 +1,235 @@
+"""
+正则查询预筛选
+
+从正则表达式中提取任何匹配都必须包含的字面量（以及必须出现在开头的前缀），
+先用名称索引缩小候选范围，再对剩余名称执行 re.fullmatch。
+编译结果按模式字符串缓存。
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+# 量词：前一个字符可能不出现
+_OPTIONAL_QUANTIFIERS = "*?{"
+
+# 表示单个字面字符的字母转义
+_CHAR_ESCAPES = {"a": "\a", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+# 十六进制转义的位数
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+
+
+@dataclass(frozen=True)
+class RegexPlan:
+    """正则查询计划"""
+    pattern: "re.Pattern[str]"
+    prefix: Optional[str] = None  # 匹配必须以此开头（区分大小写时可用前缀索引）
+    literals: Tuple[str, ...] = field(default_factory=tuple)  # 匹配必须包含的字面量
+
+    @property
+    def ignore_case(self) -> bool:
+        """是否不区分大小写"""
+        return bool(self.pattern.flags & re.IGNORECASE)
+
+    def matches(self, name: str) -> bool:
+        """
+        判断名称是否完全匹配
+
+        Args:
+            name: 符号名称
+
+        Returns:
+            是否匹配
+        """
+        return self.pattern.fullmatch(name) is not None
+
+
+def _skip_class(pattern: str, index: int) -> int:
+    """跳过字符类 [...]，返回其后的位置"""
+    index += 1
+    if index < len(pattern) and pattern[index] == "^":
+        index += 1
+    if index < len(pattern) and pattern[index] == "]":
+        index += 1
+    while index < len(pattern) and pattern[index] != "]":
+        index += 2 if pattern[index] == "\\" else 1
+    return index + 1
+
+
+def _skip_group(pattern: str, index: int) -> int:
+    """跳过分组 (...)（含嵌套分组和字符类），返回其后的位置"""
+    depth = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            index = _skip_class(pattern, index)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return index
+
+
+def _read_escape(pattern: str, index: int) -> Tuple[Optional[str], int]:
+    """
+    读取 index 处以反斜杠开头的完整转义序列
+
+    \\xhh、\\uXXXX、\\UXXXXXXXX、\\N{...}、八进制和单字符转义解码为对应的字符；
+    \\d、\\b 等字符类和断言以及反向引用不表示确定的字符。
+
+    Args:
+        pattern: 正则表达式
+        index: 反斜杠的位置
+
+    Returns:
+        (转义表示的字符或None, 转义序列之后的位置)
+    """
+    escaped = pattern[index + 1:index + 2]
+    if not escaped:
+        return None, index + 1
+    if not escaped.isalnum():
+        return escaped, index + 2
+    if escaped in _CHAR_ESCAPES:
+        return _CHAR_ESCAPES[escaped], index + 2
+
+    digits = _HEX_ESCAPES.get(escaped)
+    if digits:
+        end = index + 2 + digits
+        return chr(int(pattern[index + 2:end], 16)), end
+
+    if escaped == "N":
+        closing = pattern.find("}", index)
+        if closing < 0:
+            return None, len(pattern)
+        try:
+            return unicodedata.lookup(pattern[index + 3:closing]), closing + 1
+        except KeyError:
+            return None, closing + 1
+
+    if escaped.isdigit():
+        # \0 后最多两位八进制数字，或三位八进制数字；其余为反向引用
+        octal = re.match(r"0[0-7]{0,2}|[0-7]{3}", pattern[index + 1:])
+        if octal:
+            return chr(int(octal.group(), 8)), index + 1 + octal.end()
+        reference = re.match(r"\d{1,2}", pattern[index + 1:])
+        return None, index + 1 + reference.end()
+
+    return None, index + 2
+
+
+def extract_literals(pattern: str) -> Tuple[Optional[str], List[str]]:
+    """
+    提取正则表达式中必须出现的字面量
+
+    只分析顶层的连续普通字符；分组、字符类、转义类等一律视为未知片段，
+    带有可选量词的字符不计入字面量。顶层存在 '|' 时无法确定，返回空结果。
+
+    Args:
+        pattern: 正则表达式
+
+    Returns:
+        (必须的前缀或None, 字面量列表)
+    """
+    literals: List[str] = []
+    prefix: Optional[str] = None
+    current = ""
+    at_start = True
+    index = 0
+    length = len(pattern)
+
+    def end_run() -> None:
+        nonlocal current, at_start, prefix
+        if current:
+            if at_start:
+                prefix = current
+            literals.append(current)
+        current = ""
+        at_start = False
+
+    while index < length:
+        char = pattern[index]
+        literal: Optional[str] = None
+
+        if char == "\\":
+            literal, index = _read_escape(pattern, index)
+            if literal is None:
+                # \d、\w、\b、反向引用等
+                end_run()
+                continue
+        elif char == "[":
+            end_run()
+            index = _skip_class(pattern, index)
+            continue
+        elif char == "(":
+            end_run()
+            index = _skip_group(pattern, index)
+            continue
+        elif char == "|":
+            return None, []
+        elif char == "^" and index == 0:
+            # fullmatch 下开头的 ^ 不影响前缀
+            index += 1
+            continue
+        elif char == "{":
+            end_run()
+            closing = pattern.find("}", index)
+            index = closing + 1 if closing >= 0 else length
+            continue
+        elif char in ".^$*+?)":
+            end_run()
+            index += 1
+            continue
+        else:
+            literal = char
+            index += 1
+
+        following = pattern[index:index + 1]
+        if following and following in _OPTIONAL_QUANTIFIERS:
+            # 该字符可能不出现
+            end_run()
+        elif following == "+":
+            current += literal
+            end_run()
+        else:
+            current += literal
+
+    end_run()
+    return prefix, literals
+
+
+@lru_cache(maxsize=256)
+def compile_regex(pattern: str) -> RegexPlan:
+    """
+    编译正则表达式并生成查询计划（结果按模式缓存）
+
+    Args:
+        pattern: 正则表达式
+
+    Returns:
+        查询计划
+
+    Raises:
+        re.error: 正则表达式无效
+    """
+    compiled = re.compile(pattern)
+    if compiled.flags & re.VERBOSE:
+        # 详细模式下空白和注释不是字面量
+        return RegexPlan(compiled)
+
+    prefix, literals = extract_literals(pattern)
+    if compiled.flags & re.IGNORECASE:
+        # 三元组索引按 str.lower 折叠大小写，仅对ASCII字面量与正则的忽略大小写规则一致
+        prefix = None
+        literals = [literal for literal in literals if literal.isascii()]
+    return RegexPlan(compiled, prefix, tuple(literals))
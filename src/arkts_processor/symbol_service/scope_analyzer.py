@@ -4,11 +4,13 @@
 构建嵌套作用域层次结构，管理符号的可见性和生命周期。
 """
 
-from typing import List, Optional, Dict, Set, Any
+from typing import List, Optional, Dict, Set, Any, Tuple
 from tree_sitter import Node, Tree
 
-from ..models import Scope, ScopeType, Symbol, Position, Range
-from .ast_traverser import ASTVisitor, ASTTraverser, NodeHelper
+from ..models import Scope, ScopeType, Symbol, SymbolTableVersion, Position, Range
+from ..source_index import SourceIndex
+from .ast_traverser import ASTVisitor, ASTTraverser, FusedTraverser, NodeHelper
+from .interval_index import IntervalIndex
 
 
 class ScopeAnalyzer(ASTVisitor):
@@ -28,17 +30,18 @@ class ScopeAnalyzer(ASTVisitor):
         "namespace_declaration": ScopeType.NAMESPACE,
     }
     
-    def __init__(self, file_path: str, source_code: bytes):
+    def __init__(self, file_path: str, source_code: bytes, source_index: Optional[SourceIndex] = None):
         """
         初始化作用域分析器
         
         Args:
             file_path: 文件路径
             source_code: 源代码字节
+            source_index: 共享的源代码索引（None 表示按需创建）
         """
         self.file_path = file_path
         self.source_code = source_code
-        self.traverser = ASTTraverser(source_code)
+        self.traverser = ASTTraverser(source_code, source_index)
         
         # 作用域相关
         self.scopes: List[Scope] = []
@@ -48,6 +51,17 @@ class ScopeAnalyzer(ASTVisitor):
         # 符号到作用域的映射
         self.symbol_scope_map: Dict[Symbol, Scope] = {}
         
+        # 按位置查找最内层作用域的区间索引和ID映射（与 _indexed_scopes 对应）
+        self._scope_index: Optional[IntervalIndex[Scope]] = None
+        self._scope_by_id: Dict[int, Scope] = {}
+        self._indexed_scopes: Optional[List[Scope]] = None
+        self._indexed_count = 0
+        
+        # 名称查找缓存：(id(作用域), 名称) -> (作用域, 符号)，对应 _lookup_cache_tree 的符号表版本
+        self._lookup_cache: Dict[Tuple[int, str], Tuple[Scope, Optional[Symbol]]] = {}
+        self._lookup_cache_tree: Optional[SymbolTableVersion] = None
+        self._lookup_cache_version = 0
+        
     def analyze(self, tree: Tree, symbols: List[Symbol]) -> List[Scope]:
         """
         分析作用域
@@ -59,47 +73,98 @@ class ScopeAnalyzer(ASTVisitor):
         Returns:
             作用域列表
         """
+        self.begin(tree)
+        
+        # 遍历AST构建作用域树
+        FusedTraverser([self]).walk(tree.root_node)
+        
+        return self.finish(symbols)
+    
+    def begin(self, tree: Tree) -> None:
+        """
+        开始分析：重置状态并创建全局作用域
+        
+        作为融合遍历的阶段处理器使用时，需在遍历前调用。
+        
+        Args:
+            tree: 语法树
+        """
         self.scopes = []
         self.scope_stack = []
         self.current_scope = None
+        self._lookup_cache.clear()
         
         # 创建全局作用域
         global_scope = self._create_scope(tree.root_node, ScopeType.GLOBAL)
         self._enter_scope(global_scope)
+    
+    def finish(self, symbols: List[Symbol]) -> List[Scope]:
+        """
+        结束分析：将符号分配到作用域
         
-        # 遍历AST构建作用域树
-        self._build_scope_tree(tree.root_node)
-        
-        # 将符号分配到作用域
+        Args:
+            symbols: 符号列表
+            
+        Returns:
+            作用域列表
+        """
+        # 作用域树已完整，构建区间索引供后续按位置查询
+        self.build_scope_index()
         self._assign_symbols_to_scopes(symbols)
-        
         return self.scopes
     
-    def _build_scope_tree(self, node: Node) -> None:
+    def build_scope_index(self) -> None:
+        """构建作用域区间索引和ID映射"""
+        self._scope_index = IntervalIndex((scope.range, scope) for scope in self.scopes)
+        self._scope_by_id = {scope.id: scope for scope in self.scopes if scope.id is not None}
+        self._indexed_scopes = self.scopes
+        self._indexed_count = len(self.scopes)
+    
+    def _ensure_scope_index(self) -> None:
+        """作用域列表被替换或追加后重建索引"""
+        if (self._scope_index is None
+                or self._indexed_scopes is not self.scopes
+                or self._indexed_count != len(self.scopes)):
+            self.build_scope_index()
+    
+    def get_scope_by_id(self, scope_id: int) -> Optional[Scope]:
+        """
+        根据ID获取作用域
+        
+        Args:
+            scope_id: 作用域ID
+            
+        Returns:
+            作用域或None
+        """
+        self._ensure_scope_index()
+        return self._scope_by_id.get(scope_id)
+    
+    def enter_node(self, node: Node) -> bool:
         """
-        构建作用域树
+        进入节点：需要时创建并进入新作用域
         
         Args:
             node: AST节点
+            
+        Returns:
+            始终继续访问子节点
         """
-        # 检查是否需要创建新作用域
         scope_type = self.SCOPE_TYPE_MAPPING.get(node.type)
-        
         if scope_type:
-            # 创建新作用域
             new_scope = self._create_scope(node, scope_type)
             self._enter_scope(new_scope)
-            
-            # 递归处理子节点
-            for child in node.children:
-                self._build_scope_tree(child)
-            
-            # 退出作用域
+        return True
+    
+    def leave_node(self, node: Node) -> None:
+        """
+        离开节点：退出该节点创建的作用域
+        
+        Args:
+            node: AST节点
+        """
+        if node.type in self.SCOPE_TYPE_MAPPING:
             self._exit_scope()
-        else:
-            # 不创建新作用域，继续遍历子节点
-            for child in node.children:
-                self._build_scope_tree(child)
     
     def _create_scope(self, node: Node, scope_type: ScopeType) -> Scope:
         """
@@ -130,7 +195,8 @@ class ScopeAnalyzer(ASTVisitor):
                     offset=node.end_byte
                 )
             ),
-            parent_id=parent_id
+            parent_id=parent_id,
+            parent=self.current_scope
         )
         
         # 添加到作用域列表
@@ -176,42 +242,24 @@ class ScopeAnalyzer(ASTVisitor):
         """
         查找包含指定位置的最小作用域
         
+        通过区间索引二分查找，复杂度为 O(log n)。
+        
         Args:
             position: 位置
             
         Returns:
             作用域对象或None
         """
-        # 从所有作用域中查找
-        containing_scopes = [
-            scope for scope in self.scopes
-            if scope.range.contains(position)
-        ]
-        
-        # 返回最小的作用域（即最深层的作用域）
-        if containing_scopes:
-            return min(containing_scopes, key=lambda s: self._scope_size(s))
-        
-        return None
-    
-    def _scope_size(self, scope: Scope) -> int:
-        """
-        计算作用域大小（用于比较）
-        
-        Args:
-            scope: 作用域
-            
-        Returns:
-            作用域大小
-        """
-        start = scope.range.start
-        end = scope.range.end
-        return (end.line - start.line) * 1000 + (end.column - start.column)
+        self._ensure_scope_index()
+        return self._scope_index.find_innermost(position)
     
     def get_scope_chain(self, scope: Scope) -> List[Scope]:
         """
         获取作用域链
         
+        优先沿父作用域引用向上查找；从数据库加载的作用域没有父引用时，
+        通过ID映射按 parent_id 查找。
+        
         Args:
             scope: 起始作用域
             
@@ -221,14 +269,16 @@ class ScopeAnalyzer(ASTVisitor):
         chain = [scope]
         current = scope
         
-        while current.parent_id is not None:
-            # 查找父作用域
-            parent = next((s for s in self.scopes if s.id == current.parent_id), None)
-            if parent:
-                chain.append(parent)
-                current = parent
-            else:
-                break
+        while True:
+            parent = current.parent
+            if parent is None:
+                if current.parent_id is None:
+                    break
+                parent = self.get_scope_by_id(current.parent_id)
+                if parent is None:
+                    break
+            chain.append(parent)
+            current = parent
         
         return chain
     
@@ -236,6 +286,9 @@ class ScopeAnalyzer(ASTVisitor):
         """
         在作用域链中查找符号
         
+        结果按 (作用域, 名称) 缓存，同一作用域树中任一作用域的符号表发生变化时
+        缓存失效（其他文件或其他分析器的修改不影响），同一函数内重复出现的标识符只需解析一次。
+        
         Args:
             name: 符号名称
             scope: 起始作用域
@@ -243,15 +296,26 @@ class ScopeAnalyzer(ASTVisitor):
         Returns:
             找到的符号或None
         """
-        # 获取作用域链
-        scope_chain = self.get_scope_chain(scope)
+        version = scope.symbol_table_version
+        if self._lookup_cache_tree is not version or self._lookup_cache_version != version.value:
+            self._lookup_cache.clear()
+            self._lookup_cache_tree = version
+            self._lookup_cache_version = version.value
+        
+        key = (id(scope), name)
+        cached = self._lookup_cache.get(key)
+        if cached is not None and cached[0] is scope:
+            return cached[1]
         
         # 在作用域链中查找
-        for s in scope_chain:
+        result = None
+        for s in self.get_scope_chain(scope):
             if name in s.symbols:
-                return s.symbols[name]
+                result = s.symbols[name]
+                break
         
-        return None
+        self._lookup_cache[key] = (scope, result)
+        return result
     
     def get_visible_symbols(self, scope: Scope) -> List[Symbol]:
         """
@@ -4,43 +4,77 @@
 整合符号提取、作用域分析、类型推导和引用解析功能，提供统一的符号服务接口。
 """
 
-from typing import List, Optional, Dict, Tuple, Any
+from typing import Callable, List, Optional, Dict, Set, Tuple, Any, Union
 from pathlib import Path
+import os
+from collections import OrderedDict
 import tree_sitter
 
-from ..models import Symbol, Scope, Reference, SymbolRelation, Position
+from ..models import (
+    Symbol, Scope, Reference, ReferenceType, SymbolRelation, SymbolType, Position, TextEdit, FileFingerprint,
+    ImportBinding
+)
+from ..symbol_ids import assign_symbol_ids
 from ..database.repository import SymbolRepository, DatabaseManager
+from ..database.profiles import EngineProfile
 from .extractor import SymbolExtractor
 from .scope_analyzer import ScopeAnalyzer
 from .type_inference import TypeInferenceEngine
 from .reference_resolver import ReferenceResolver
-from .index_service import SymbolIndexService
+from .index_service import SymbolIndexService, SymbolQuery
+from .pipeline import AnalysisPipeline, FileAnalysis, ParserFactory, create_default_parser
+from .parallel import ParallelIndexer
+from .incremental import IncrementalReparser
+from .interval_index import IntervalIndex
+from .manifest import diff_manifest, read_with_fingerprint, stat_matches
+from .dependencies import EMPTY_API_FINGERPRINT, HERITAGE_TYPES, api_fingerprint, find_export
 
 
 class SymbolService:
     """符号表服务主类"""
     
-    def __init__(self, db_path: str = "arkts_symbols.db"):
+    def __init__(self, 
+                 db_path: str = "arkts_symbols.db", 
+                 parse_cache_size: int = 64,
+                 warm_index: bool = True,
+                 db_profile: Union[str, EngineProfile] = "safe"):
         """
         初始化符号服务
         
         Args:
             db_path: 数据库文件路径
+            parse_cache_size: 为增量解析保留语法树的文件数量上限
+            warm_index: 是否在启动时从数据库批量预热项目级内存索引
+                （False 时在首次写入文件或模糊搜索前加载，此前的查询直接访问数据库）
+            db_profile: SQLite 引擎性能配置（bulk_load / serving / safe），
+                可通过 db_manager.set_profile 在全量索引后切换
         """
         # 初始化数据库
-        self.db_manager = DatabaseManager(db_path)
+        self.db_manager = DatabaseManager(db_path, profile=db_profile)
         self.db_manager.create_tables()
         self.repository = SymbolRepository(self.db_manager)
+        self.repository.warm_type_cache()
         
         # 初始化索引服务
         self.index_service = SymbolIndexService(self.repository)
+        if warm_index:
+            self.index_service.load_from_repository()
         
         # Tree-sitter解析器（需要外部初始化）
         self.parser: Optional[tree_sitter.Parser] = None
         
+        # 并行索引时工作进程使用的解析器工厂
+        self.parser_factory: Optional[ParserFactory] = None
+        
         # 缓存
         self._file_symbols: Dict[str, List[Symbol]] = {}
         self._file_scopes: Dict[str, List[Scope]] = {}
+        self._file_scope_index: Dict[str, IntervalIndex[Scope]] = {}
+        self._file_reference_index: Dict[str, IntervalIndex[Reference]] = {}
+        
+        # 增量解析缓存：文件路径 -> (源代码, 语法树)，按最近使用淘汰
+        self._parse_cache: "OrderedDict[str, Tuple[bytes, tree_sitter.Tree]]" = OrderedDict()
+        self.parse_cache_size = parse_cache_size
     
     def set_parser(self, parser: tree_sitter.Parser) -> None:
         """
@@ -51,12 +85,44 @@ class SymbolService:
         """
         self.parser = parser
     
-    def process_file(self, file_path: str) -> Dict[str, Any]:
+    def set_parser_factory(self, parser_factory: ParserFactory) -> None:
         """
-        处理单个文件，提取并分析所有符号信息
+        设置并行索引使用的解析器工厂
+        
+        工厂会在每个工作进程中调用一次，因此必须是可 pickle 的
+        模块级函数。
+        
+        Args:
+            parser_factory: 返回配置好的tree-sitter解析器的无参函数
+        """
+        self.parser_factory = parser_factory
+    
+    def process_file(self, file_path: str, skip_unchanged: bool = False) -> Dict[str, Any]:
+        """
+        处理单个文件，提取并分析所有符号信息（已索引的文件替换旧数据）
+        
+        文件的对外接口变化时，依赖该文件的其他文件（传递闭包）随即重新解析引用和关系。
         
         Args:
             file_path: 文件路径
+            skip_unchanged: 文件与文件清单中的记录一致时跳过
+            
+        Returns:
+            处理结果字典（跳过时只包含 file_path 和 skipped）
+        """
+        return self._process_file(file_path, skip_unchanged)
+    
+    def _process_file(self, 
+                      file_path: str, 
+                      skip_unchanged: bool = False,
+                      pending: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        处理单个文件
+        
+        Args:
+            file_path: 文件路径
+            skip_unchanged: 文件与文件清单中的记录一致时跳过
+            pending: 批量处理时收集待重新解析的依赖文件（为None时立即重新解析）
             
         Returns:
             处理结果字典
@@ -64,99 +130,563 @@ class SymbolService:
         if not self.parser:
             raise RuntimeError("Parser not initialized. Call set_parser() first.")
         
+        entry = self.repository.get_file_fingerprint(file_path) if skip_unchanged else None
+        if entry is not None and stat_matches(entry, os.stat(file_path)):
+            return {"file_path": file_path, "skipped": True}
+        
         # 读取文件
-        with open(file_path, 'rb') as f:
-            source_code = f.read()
+        source_code, file_fingerprint = read_with_fingerprint(file_path)
+        if entry is not None and entry.content_hash == file_fingerprint.content_hash:
+            # 内容未变，只更新清单中的 stat 信息
+            self.repository.save_file_fingerprints([file_fingerprint])
+            return {"file_path": file_path, "skipped": True}
         
         # 解析AST
         tree = self.parser.parse(source_code)
         
-        # 第一步：提取符号
-        extractor = SymbolExtractor(file_path, source_code)
-        symbols = extractor.extract(tree)
+        analysis = AnalysisPipeline().analyze(file_path, source_code, tree)
+        analysis.fingerprint = file_fingerprint
+        result = self._commit_analysis(analysis, pending=pending)
+        self._remember_tree(file_path, source_code, tree)
+        return result
+    
+    def update_file_content(self, file_path: str, edits: List[TextEdit]) -> Dict[str, Any]:
+        """
+        增量更新文件内容（用于编辑器实时同步）
+        
+        保留上一次的语法树，应用编辑后以旧树为基础增量重解析，
+        只重新提取与变更范围重叠的顶层声明。内容仅来自编辑，不读写磁盘。
+        
+        Args:
+            file_path: 文件路径
+            edits: 按顺序应用的编辑列表（范围基于编辑前的内容）
+            
+        Returns:
+            处理结果字典（额外包含 reextracted 和 reused 顶层声明数）
+        """
+        if not self.parser:
+            raise RuntimeError("Parser not initialized. Call set_parser() first.")
+        
+        cached = self._parse_cache.get(file_path)
+        if cached:
+            old_source, old_tree = cached
+            old_symbols = self._file_symbols.get(file_path)
+        else:
+            # 没有缓存的语法树时，以磁盘内容作为编辑前的版本
+            with open(file_path, 'rb') as f:
+                old_source = f.read()
+            old_tree = self.parser.parse(old_source)
+            old_symbols = None
         
-        # 第二步：作用域分析
-        scope_analyzer = ScopeAnalyzer(file_path, source_code)
-        scopes = scope_analyzer.analyze(tree, symbols)
+        reparser = IncrementalReparser(self.parser)
+        parsed = reparser.reparse(file_path, old_source, old_tree, old_symbols, edits)
         
-        # 第三步：类型推导
-        type_engine = TypeInferenceEngine(source_code)
-        type_engine.infer_types(symbols, scopes)
+        analysis = AnalysisPipeline().analyze(
+            file_path, parsed.source_code, parsed.tree, symbols=parsed.symbols
+        )
         
-        # 第四步：引用解析
-        reference_resolver = ReferenceResolver(file_path, source_code)
-        references, relations = reference_resolver.resolve(tree, symbols, scopes, scope_analyzer)
+        # 替换文件的旧数据
+        result = self._commit_analysis(analysis, replace=True)
+        self._remember_tree(file_path, parsed.source_code, parsed.tree)
         
-        # 保存到数据库
-        self._save_to_database(symbols, scopes, references)
+        result["reextracted"] = parsed.reextracted
+        result["reused"] = parsed.reused
+        return result
+    
+    def _remember_tree(self, file_path: str, source_code: bytes, tree: tree_sitter.Tree) -> None:
+        """
+        缓存文件的语法树供增量解析使用
+        
+        Args:
+            file_path: 文件路径
+            source_code: 源代码
+            tree: 语法树
+        """
+        self._parse_cache[file_path] = (source_code, tree)
+        self._parse_cache.move_to_end(file_path)
+        while len(self._parse_cache) > self.parse_cache_size:
+            self._parse_cache.popitem(last=False)
+    
+    def _commit_analysis(self, 
+                         analysis: FileAnalysis, 
+                         replace: bool = False,
+                         pending: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        提交单个文件的分析结果（写入数据库、缓存和索引）
+        
+        顺序处理与并行处理共用此方法，保证两种模式的输出一致。
+        
+        Args:
+            analysis: 分析结果
+            replace: 是否在同一事务中先删除该文件的旧数据（已索引的文件总是替换）
+            pending: 批量处理时收集待重新解析的依赖文件（为None时立即重新解析）
+            
+        Returns:
+            处理结果字典
+        """
+        file_path = analysis.file_path
+        symbols = analysis.symbols
+        scopes = analysis.scopes
+        replace = replace or self._is_known_file(file_path)
+        
+        # 写入事务中的跨文件解析读取内存索引，需覆盖全部文件（在事务开始前加载）
+        self.index_service.ensure_loaded()
+        
+        # 对外接口指纹与上次记录的比较（旧版本数据库没有记录时视为变化）
+        old_api = self.repository.get_api_fingerprint(file_path) if replace else EMPTY_API_FINGERPRINT
+        api_hash = api_fingerprint(symbols)
+        
+        # 保存到数据库（文件指纹和接口指纹在同一事务中写入）
+        relation_count = self._save_to_database(file_path, symbols, scopes, analysis.references,
+                                                imports=analysis.imports,
+                                                replace=replace,
+                                                fingerprint=analysis.fingerprint,
+                                                api_hash=api_hash)
         
         # 缓存结果
         self._file_symbols[file_path] = symbols
         self._file_scopes[file_path] = scopes
+        self._file_scope_index.pop(file_path, None)
+        self._file_reference_index.pop(file_path, None)
+        # 缓存的语法树对应旧内容（并行处理和重建索引不经过 _remember_tree），由调用方按需重新登记
+        self._parse_cache.pop(file_path, None)
+        
+        # 增量更新项目级索引
+        self.index_service.add_file(file_path, symbols)
         
-        # 更新索引
-        self.index_service.build_index(symbols)
+        # 对外接口变化时，依赖本文件的文件需要重新解析
+        dependents: List[str] = []
+        api_changed = api_hash != old_api
+        if pending is not None:
+            pending.discard(file_path)
+        if api_changed:
+            dependents = self.repository.get_dependent_files([file_path], transitive=True)
+            if pending is not None:
+                pending.update(dependents)
+            else:
+                self.reresolve_files(dependents)
         
         return {
             "file_path": file_path,
             "symbols": len(symbols),
             "scopes": len(scopes),
-            "references": len(references),
-            "relations": len(relations)
+            "references": len(analysis.references),
+            "relations": relation_count,
+            "api_changed": api_changed,
+            "dependents": len(dependents)
+        }
+    
+    def _stored_symbols(self, file_path: str) -> List[Symbol]:
+        """获取文件已索引的符号（优先使用内存索引）"""
+        symbols = self.index_service.get_file_symbols(file_path)
+        if symbols is None:
+            symbols = self.repository.get_symbols_by_file(file_path)
+        return symbols
+    
+    def _is_known_file(self, file_path: str) -> bool:
+        """文件是否已在索引或文件清单中"""
+        return (self.index_service.has_file(file_path)
+                or self.repository.get_file_fingerprint(file_path) is not None)
+    
+    def reindex(self,
+                file_paths: List[str],
+                workers: Optional[int] = 1,
+                chunksize: int = 16,
+                parser_factory: Optional[ParserFactory] = None,
+                purge_missing: bool = True) -> Dict[str, Any]:
+        """
+        按文件清单重新索引：跳过未变化的文件，只处理新增和变化的文件，并清除已删除的文件
+        
+        未变化的判断先比较大小和修改时间，不一致时再比较内容摘要，
+        未变化的文件不会被读取或解析。
+        
+        Args:
+            file_paths: 文件路径列表（通常为工作区内的全部源文件）
+            workers: 工作进程数（同 process_files）
+            chunksize: 并行模式下每个任务包含的文件数
+            parser_factory: 工作进程使用的解析器工厂
+            purge_missing: 是否清除清单中不在 file_paths 内且已不存在的文件
+            
+        Returns:
+            统计字典：added/changed/skipped/removed/errors 数量和 results（处理结果列表）
+        """
+        diff = diff_manifest(file_paths, self.repository.get_file_manifest(), purge_missing)
+        
+        # 内容未变但 stat 信息变化的文件只更新清单
+        self.repository.save_file_fingerprints(diff.touched)
+        
+        for file_path in diff.removed:
+            self.delete_file(file_path)
+        
+        results = self._process_batch(diff.added + diff.changed, workers, chunksize, parser_factory)
+        results.extend({"file_path": file_path, "error": "File not found"} for file_path in diff.missing)
+        
+        return {
+            "added": len(diff.added),
+            "changed": len(diff.changed),
+            "skipped": len(diff.unchanged),
+            "removed": len(diff.removed),
+            "errors": sum(1 for result in results if "error" in result),
+            "results": results
         }
     
-    def process_files(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+    def process_files(self,
+                      file_paths: List[str],
+                      workers: Optional[int] = 1,
+                      chunksize: int = 16,
+                      parser_factory: Optional[ParserFactory] = None,
+                      skip_unchanged: bool = True) -> List[Dict[str, Any]]:
         """
         批量处理文件
         
+        默认先按文件清单比较大小、修改时间和内容摘要，未变化的文件不读取解析，
+        结果中记为 skipped。workers 大于 1（或为 None）时启用并行模式：工作进程
+        各自持有解析器并执行四个分析阶段，主进程作为唯一写入方按输入顺序提交结果，
+        输出与顺序模式完全一致。
+        
+        Args:
+            file_paths: 文件路径列表
+            workers: 工作进程数（1 表示顺序处理，None 表示使用 CPU 核数）
+            chunksize: 并行模式下每个任务包含的文件数
+            parser_factory: 工作进程使用的解析器工厂（默认使用
+                set_parser_factory 设置的工厂或 create_default_parser）
+            skip_unchanged: 是否跳过与文件清单中的记录一致的文件
+            
+        Returns:
+            处理结果列表（与输入顺序一致，跳过的文件只包含 file_path 和 skipped）
+        """
+        if not skip_unchanged:
+            return self._process_batch(file_paths, workers, chunksize, parser_factory)
+        
+        diff = diff_manifest(file_paths, self.repository.get_file_manifest(), purge_missing=False)
+        self.repository.save_file_fingerprints(diff.touched)
+        unchanged = set(diff.unchanged)
+        if not unchanged:
+            return self._process_batch(file_paths, workers, chunksize, parser_factory)
+        
+        processed = iter(self._process_batch(
+            [file_path for file_path in file_paths if file_path not in unchanged],
+            workers, chunksize, parser_factory
+        ))
+        return [
+            {"file_path": file_path, "skipped": True} if file_path in unchanged else next(processed)
+            for file_path in file_paths
+        ]
+    
+    def _process_batch(self,
+                       file_paths: List[str],
+                       workers: Optional[int],
+                       chunksize: int,
+                       parser_factory: Optional[ParserFactory]) -> List[Dict[str, Any]]:
+        """
+        批量解析并提交文件（不检查文件清单）
+        
         Args:
             file_paths: 文件路径列表
+            workers: 工作进程数
+            chunksize: 并行模式下每个任务包含的文件数
+            parser_factory: 工作进程使用的解析器工厂
             
         Returns:
             处理结果列表
         """
+        # 依赖文件在全部文件提交后统一重新解析，每个文件最多一次
+        pending: Set[str] = set()
+        
+        if workers is not None and workers <= 1:
+            results = []
+            for file_path in file_paths:
+                try:
+                    result = self._process_file(file_path, pending=pending)
+                    results.append(result)
+                except Exception as e:
+                    results.append({
+                        "file_path": file_path,
+                        "error": str(e)
+                    })
+            self.reresolve_files(sorted(pending))
+            return results
+        
+        factory = parser_factory or self.parser_factory or create_default_parser
+        indexer = ParallelIndexer(factory, workers=workers, chunksize=chunksize)
+        
         results = []
-        for file_path in file_paths:
+        for analysis in indexer.analyze(file_paths):
+            if analysis.error is not None:
+                results.append({
+                    "file_path": analysis.file_path,
+                    "error": analysis.error
+                })
+                continue
             try:
-                result = self.process_file(file_path)
-                results.append(result)
+                results.append(self._commit_analysis(analysis, pending=pending))
             except Exception as e:
                 results.append({
-                    "file_path": file_path,
+                    "file_path": analysis.file_path,
                     "error": str(e)
                 })
+        self.reresolve_files(sorted(pending))
         return results
     
     def _save_to_database(self, 
+                          file_path: str,
                           symbols: List[Symbol], 
                           scopes: List[Scope],
-                          references: List[Reference]) -> None:
+                          references: List[Reference],
+                          imports: Optional[List[ImportBinding]] = None,
+                          replace: bool = False,
+                          fingerprint: Optional[FileFingerprint] = None,
+                          api_hash: Optional[str] = None) -> int:
         """
         保存到数据库
         
+        一个文件的所有写入（以及替换时对旧数据的删除）在同一个事务中完成。
+        
         Args:
+            file_path: 文件路径
             symbols: 符号列表
             scopes: 作用域列表
             references: 引用列表
+            imports: 导入绑定列表（可选）
+            replace: 是否先删除该文件的旧数据
+            fingerprint: 文件指纹（可选，写入文件清单）
+            api_hash: 对外接口指纹（可选）
+            
+        Returns:
+            保存的继承/实现关系数量
         """
-        # 保存作用域
-        for scope in scopes:
-            self.repository.save_scope(scope)
-        
-        # 更新符号的作用域ID
-        for symbol in symbols:
-            # 查找包含该符号的作用域
+        imports = imports or []
+        with self.db_manager.get_session() as session:
+            if replace:
+                self.repository.delete_file_data(file_path, session)
+            
+            # 批量保存作用域（父作用域ID在内存中映射为数据库ID）
+            self.repository.save_scopes_batch(scopes, session)
+            
+            # 更新符号的作用域ID：优先使用符号实际所在的作用域，否则取第一个同名符号所在的作用域
+            scope_by_symbol: Dict[int, Scope] = {}
+            scope_by_name: Dict[str, Scope] = {}
             for scope in scopes:
-                if symbol.name in scope.symbols:
+                for name, scope_symbol in scope.symbols.items():
+                    scope_by_symbol.setdefault(id(scope_symbol), scope)
+                    scope_by_name.setdefault(name, scope)
+            for symbol in symbols:
+                scope = scope_by_symbol.get(id(symbol)) or scope_by_name.get(symbol.name)
+                if scope:
                     symbol.scope_id = scope.id
-                    break
+            
+            # 批量保存符号和引用
+            self.repository.save_symbols_batch(symbols, session)
+            self.repository.save_references_batch(references, session)
+            self.repository.save_import_bindings(imports, session)
+            
+            # 符号获得数据库ID后解析跨文件的导入引用：本文件导入的符号，以及其他文件导入的本文件符号
+            incoming = [
+                binding for binding in self.repository.get_import_bindings(target_path=file_path, session=session)
+                if binding.file_path != file_path
+            ]
+            import_references = self._import_references(imports, self._indexed_symbols)
+            import_references.extend(self._import_references(incoming, lambda path: symbols))
+            self.repository.save_references_batch(import_references, session)
+            # 导入方的导入引用已指向新的符号ID，即使对外接口未变化也要丢弃其引用位置索引
+            for binding in incoming:
+                self._file_reference_index.pop(binding.file_path, None)
+            
+            # 建立继承/实现关系和文件依赖边
+            relations, edges = self._link_relations(
+                file_path, symbols, imports, incoming=incoming,
+                bindings_of=lambda path: self.repository.get_import_bindings(file_path=path, session=session)
+            )
+            relation_count = self.repository.save_relations_batch(relations, session)
+            edges.update((file_path, binding.target_path) for binding in imports if binding.target_path)
+            self.repository.save_file_dependencies(sorted(edges), session)
+            
+            if fingerprint is not None:
+                self.repository.save_file_fingerprints([fingerprint], session)
+            if api_hash is not None:
+                self.repository.save_api_fingerprint(file_path, api_hash, session)
+            return relation_count
+    
+    def _indexed_symbols(self, file_path: str) -> List[Symbol]:
+        """获取内存索引中文件的符号（写入事务中使用，不访问数据库）"""
+        return self.index_service.get_file_symbols(file_path) or []
+    
+    def _import_references(self, 
+                           bindings: List[ImportBinding], 
+                           symbols_of: Callable[[str], List[Symbol]]) -> List[Reference]:
+        """
+        将导入绑定解析为指向被导入文件符号的引用
         
-        # 批量保存符号
-        self.repository.save_symbols_batch(symbols)
+        Args:
+            bindings: 导入绑定列表
+            symbols_of: 获取被导入文件符号的函数
+            
+        Returns:
+            引用列表（无法解析的绑定不产生引用）
+        """
+        references = []
+        for binding in bindings:
+            if binding.target_path is None:
+                continue
+            target = find_export(symbols_of(binding.target_path), binding.imported_name)
+            if target is None or target.id is None:
+                continue
+            references.append(Reference(
+                id=None,
+                symbol_id=target.id,
+                file_path=binding.file_path,
+                position=binding.position,
+                reference_type=ReferenceType.IMPORT,
+                end_column=binding.end_column,
+                context=f"import from '{binding.module}'"
+            ))
+        return references
+    
+    def _link_relations(self, 
+                        file_path: str,
+                        symbols: List[Symbol],
+                        imports: Optional[List[ImportBinding]] = None,
+                        backfill: bool = True,
+                        incoming: Optional[List[ImportBinding]] = None,
+                        bindings_of: Optional[Callable[[str], List[ImportBinding]]] = None
+                        ) -> Tuple[List[SymbolRelation], Set[Tuple[str, str]]]:
+        """
+        为已保存的符号建立继承/实现关系
+        
+        基类/接口名称优先解析为本文件中的类或接口，其次为导入的类或接口，
+        否则解析为项目中其他文件的同名类或接口（取ID最小者）。backfill 为 True 时，
+        其他文件中继承/实现了本文件所定义类型的符号，按其所在文件的同一解析顺序
+        确认解析到本文件后，补建指向本文件的关系。
+        
+        Args:
+            file_path: 文件路径
+            symbols: 单个文件的符号列表（已分配ID）
+            imports: 文件的导入绑定（可选）
+            backfill: 是否补建其他文件指向本文件的关系
+            incoming: 其他文件从本文件导入的绑定（可选，补建通过别名导入的关系）
+            bindings_of: 获取其他文件导入绑定的函数（可选，默认查询数据库）
+            
+        Returns:
+            (关系列表, 关系涉及的跨文件依赖边 (依赖方文件, 被依赖文件) 集合)
+        """
+        edges: Set[Tuple[str, str]] = set()
+        if not symbols:
+            return [], edges
+        
+        local_types: Dict[str, Symbol] = {}
+        for symbol in symbols:
+            if symbol.symbol_type in HERITAGE_TYPES and symbol.id is not None:
+                local_types.setdefault(symbol.name, symbol)
+        
+        def symbols_of(path: str) -> List[Symbol]:
+            return symbols if path == file_path else self._indexed_symbols(path)
         
-        # 保存引用
-        for reference in references:
-            self.repository.save_reference(reference)
+        def local_type(path: str, name: str) -> Optional[Symbol]:
+            if path == file_path:
+                return local_types.get(name)
+            return next((
+                s for s in self.index_service.find_symbol_by_name(name, path)
+                if s.symbol_type in HERITAGE_TYPES and s.id is not None
+            ), None)
+        
+        resolved: Dict[Tuple[str, str], Optional[Symbol]] = {}
+        
+        def resolve(path: str, name: str, bindings: List[ImportBinding]) -> Optional[Symbol]:
+            """按 path 所在文件的解析顺序解析基类/接口名称"""
+            key = (path, name)
+            if key in resolved:
+                return resolved[key]
+            target = local_type(path, name)
+            if target is None:
+                binding = next((b for b in bindings if b.local_name == name and b.target_path), None)
+                if binding is not None and binding.target_path != path:
+                    target = find_export(symbols_of(binding.target_path), binding.imported_name)
+                    if target is not None and (target.symbol_type not in HERITAGE_TYPES or target.id is None):
+                        target = None
+            if target is None:
+                # 项目范围：本文件的类型使用新符号，其他文件使用内存索引
+                candidates = [
+                    s for s in self.index_service.find_symbol_by_name(name)
+                    if s.file_path not in (path, file_path) and s.id is not None
+                    and s.symbol_type in HERITAGE_TYPES
+                ]
+                if path != file_path and name in local_types:
+                    candidates.append(local_types[name])
+                target = min(candidates, key=lambda s: s.id) if candidates else None
+            resolved[key] = target
+            return target
+        
+        relations: List[SymbolRelation] = []
+        for symbol in symbols:
+            if symbol.id is None:
+                continue
+            for relation_type, names in (("extends", symbol.extends),
+                                         ("implements", symbol.implements)):
+                for name in names:
+                    target = resolve(file_path, name, imports or [])
+                    if target is not None and target.id != symbol.id:
+                        relations.append(SymbolRelation(symbol.id, target.id, relation_type))
+                        edges.add((file_path, target.file_path))
+        
+        if not backfill:
+            return relations, edges
+        
+        # 补建其他文件指向本文件类型的关系：同名引用，以及通过（可能带别名的）导入引用
+        if bindings_of is None:
+            bindings_of = lambda path: self.repository.get_import_bindings(file_path=path)
+        file_bindings: Dict[str, List[ImportBinding]] = {}
+        names = set(local_types)
+        names.update(binding.local_name for binding in incoming or [])
+        for name in sorted(names):
+            for relation_type in ("extends", "implements"):
+                query = SymbolQuery()
+                setattr(query, relation_type, name)
+                for symbol in self.index_service.query(query):
+                    if symbol.file_path == file_path or symbol.id is None:
+                        continue
+                    if symbol.file_path not in file_bindings:
+                        file_bindings[symbol.file_path] = bindings_of(symbol.file_path)
+                    target = resolve(symbol.file_path, name, file_bindings[symbol.file_path])
+                    if target is None or target.file_path != file_path:
+                        continue
+                    relations.append(SymbolRelation(symbol.id, target.id, relation_type))
+                    edges.add((symbol.file_path, file_path))
+        
+        return relations, edges
+    
+    def reresolve_files(self, file_paths: List[str]) -> int:
+        """
+        不重新解析源文件，重新建立文件的跨文件引用、继承/实现关系和依赖边
+        
+        使用已保存的符号和导入绑定，在依赖的文件变化后修正指向其符号的解析结果。
+        
+        Args:
+            file_paths: 文件路径列表
+            
+        Returns:
+            重新解析的文件数量
+        """
+        self.index_service.ensure_loaded()
+        count = 0
+        for file_path in file_paths:
+            if not self._is_known_file(file_path):
+                continue
+            symbols = self._stored_symbols(file_path)
+            imports = self.repository.get_import_bindings(file_path=file_path)
+            
+            with self.db_manager.get_session() as session:
+                self.repository.delete_resolution_data(file_path, session)
+                self.repository.save_references_batch(
+                    self._import_references(imports, self._indexed_symbols), session
+                )
+                relations, edges = self._link_relations(file_path, symbols, imports, backfill=False)
+                self.repository.save_relations_batch(relations, session)
+                edges.update((file_path, binding.target_path) for binding in imports if binding.target_path)
+                self.repository.save_file_dependencies(sorted(edges), session)
+            
+            self._file_reference_index.pop(file_path, None)
+            count += 1
+        return count
     
     # ========== 符号查询接口 ==========
     
@@ -199,6 +729,66 @@ class SymbolService:
         """
         return self.repository.get_references_by_symbol(symbol_id)
     
+    def find_subclasses(self, symbol_id: int) -> List[Symbol]:
+        """
+        查找类的所有（直接和间接）子类
+        
+        Args:
+            symbol_id: 类的符号ID
+            
+        Returns:
+            子类列表（由近及远）
+        """
+        return self.repository.get_subclasses(symbol_id)
+    
+    def find_implementors(self, symbol_id: int) -> List[Symbol]:
+        """
+        查找接口的所有实现类
+        
+        Args:
+            symbol_id: 接口的符号ID
+            
+        Returns:
+            实现类列表（由近及远）
+        """
+        return self.repository.get_implementors(symbol_id)
+    
+    def find_ancestors(self, symbol_id: int) -> List[Symbol]:
+        """
+        查找符号的完整祖先链（基类和接口）
+        
+        Args:
+            symbol_id: 符号ID
+            
+        Returns:
+            祖先列表（由近及远）
+        """
+        return self.repository.get_ancestors(symbol_id)
+    
+    def _reference_index(self, file_path: str) -> IntervalIndex[Reference]:
+        """获取文件的引用位置索引（按文件缓存，首次使用时从数据库加载）"""
+        reference_index = self._file_reference_index.get(file_path)
+        if reference_index is None:
+            references = self.repository.get_references_by_file(file_path)
+            reference_index = IntervalIndex((ref.span, ref) for ref in references)
+            self._file_reference_index[file_path] = reference_index
+        return reference_index
+    
+    def find_reference_at_position(self, file_path: str, line: int, column: int) -> Optional[Reference]:
+        """
+        查找覆盖指定位置的引用
+        
+        Args:
+            file_path: 文件路径
+            line: 行号（从0开始）
+            column: 列号（从0开始）
+            
+        Returns:
+            引用或None
+        """
+        position = Position(line=line, column=column, offset=0)
+        return self._reference_index(file_path).find_innermost(position)
+    
     def find_definition(self, file_path: str, line: int, column: int) -> Optional[Symbol]:
         """
         查找定义（Go to Definition）
@@ -211,19 +801,37 @@ class SymbolService:
         Returns:
             符号定义
         """
-        # 首先找到光标位置的符号
-        symbol = self.find_symbol_at_position(file_path, line, column)
-        if symbol:
-            return symbol
+        return self.find_definitions(file_path, [(line, column)])[0]
+    
+    def find_definitions(self, file_path: str, positions: List[Tuple[int, int]]) -> List[Optional[Symbol]]:
+        """
+        批量查找定义
+        
+        光标处有引用时返回引用的符号（所有引用的符号一次查询），
+        否则返回包含该位置的最内层符号。
         
-        # 如果不是定义位置，可能是引用，需要查找引用对应的定义
-        references = self.repository.get_references_by_file(file_path)
-        for ref in references:
-            if ref.position.line == line and ref.position.column <= column:
-                # 找到引用，返回对应的符号定义
-                return self.repository.get_symbol_by_id(ref.symbol_id)
+        Args:
+            file_path: 文件路径
+            positions: (行号, 列号) 列表
+            
+        Returns:
+            符号定义列表（与输入顺序一致）
+        """
+        reference_index = self._reference_index(file_path)
+        references = [
+            reference_index.find_innermost(Position(line=line, column=column, offset=0))
+            for line, column in positions
+        ]
+        targets = self.repository.get_symbols_by_ids(ref.symbol_id for ref in references if ref)
         
-        return None
+        results: List[Optional[Symbol]] = []
+        for (line, column), ref in zip(positions, references):
+            symbol = targets.get(ref.symbol_id) if ref else None
+            if symbol is None:
+                # 不是引用位置时可能是定义位置
+                symbol = self.find_symbol_at_position(file_path, line, column)
+            results.append(symbol)
+        return results
     
     def get_document_symbols(self, file_path: str) -> List[Symbol]:
         """
@@ -245,7 +853,7 @@ class SymbolService:
             query: 搜索查询
             
         Returns:
-            符号列表
+            符号列表（按相关度排序）
         """
         return self.index_service.search_symbols(query, fuzzy=True, limit=50)
     
@@ -267,12 +875,12 @@ class SymbolService:
             scopes = self._file_scopes[file_path]
             position = Position(line=line, column=column, offset=0)
             
-            # 找到包含该位置的作用域
-            current_scope = None
-            for scope in scopes:
-                if scope.range.contains(position):
-                    current_scope = scope
-                    break
+            # 找到包含该位置的最内层作用域（区间索引按文件缓存，首次查询时构建）
+            scope_index = self._file_scope_index.get(file_path)
+            if scope_index is None:
+                scope_index = IntervalIndex((scope.range, scope) for scope in scopes)
+                self._file_scope_index[file_path] = scope_index
+            current_scope = scope_index.find_innermost(position)
             
             if current_scope:
                 # 获取作用域内可见的符号
@@ -375,19 +983,80 @@ class SymbolService:
             file_path: 文件路径
             
         Returns:
-            处理结果
+            处理结果（文件已不存在时只包含 file_path 和删除的符号数量 deleted）
+        """
+        self._parse_cache.pop(file_path, None)
+        if not os.path.isfile(file_path):
+            return {"file_path": file_path, "deleted": self.delete_file(file_path)}
+        
+        # 已索引的文件在同一事务中替换旧数据，对外接口不变时不重新解析依赖文件
+        return self.process_file(file_path)
+    
+    def delete_file(self, file_path: str) -> int:
+        """
+        删除文件的所有数据（符号、作用域、引用、关系、文件清单记录、索引和缓存）
+        
+        依赖该文件对外接口的文件（传递闭包）随后重新解析引用和关系。
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            删除的符号数量
         """
-        # 删除旧数据
-        self.repository.delete_symbols_by_file(file_path)
+        old_api = self.repository.get_api_fingerprint(file_path)
+        count = self.repository.delete_file_data(file_path)
+        self.index_service.remove_file(file_path)
         
         # 清除缓存
-        if file_path in self._file_symbols:
-            del self._file_symbols[file_path]
-        if file_path in self._file_scopes:
-            del self._file_scopes[file_path]
+        self._file_symbols.pop(file_path, None)
+        self._file_scopes.pop(file_path, None)
+        self._file_scope_index.pop(file_path, None)
+        self._file_reference_index.pop(file_path, None)
+        self._parse_cache.pop(file_path, None)
         
-        # 重新处理
-        return self.process_file(file_path)
+        if old_api != EMPTY_API_FINGERPRINT:
+            self.reresolve_files(self.repository.get_dependent_files([file_path], transitive=True))
+        return count
+    
+    def rename_file(self, old_path: str, new_path: str) -> Dict[int, int]:
+        """
+        将文件的所有数据移动到新路径（内容未变化的重命名，不重新提取符号）
+        
+        Args:
+            old_path: 原文件路径
+            new_path: 新文件路径
+        
+        Returns:
+            移动的符号的ID映射（原ID -> 新ID，符号ID包含文件路径）
+        """
+        id_map = self.repository.rename_file_data(old_path, new_path)
+        self.index_service.rename_file(old_path, new_path)
+        
+        # 缓存按新路径重新登记，位置索引在下次查询时重建
+        for cache in (self._file_symbols, self._file_scopes):
+            cache.pop(new_path, None)
+            items = cache.pop(old_path, None)
+            if items is not None:
+                for item in items:
+                    item.file_path = new_path
+                cache[new_path] = items
+        if new_path in self._file_symbols:
+            assign_symbol_ids(new_path, self._file_symbols[new_path])
+        for cache in (self._file_scope_index, self._file_reference_index):
+            cache.pop(old_path, None)
+            cache.pop(new_path, None)
+        self._parse_cache.pop(new_path, None)
+        cached_tree = self._parse_cache.pop(old_path, None)
+        if cached_tree is not None:
+            self._parse_cache[new_path] = cached_tree
+        
+        # 原路径的导入方不再解析到这些符号，新路径的导入方开始解析到这些符号
+        if id_map:
+            self.reresolve_files(
+                self.repository.get_dependent_files([old_path, new_path], transitive=True)
+            )
+        return id_map
     
     def clear_database(self) -> None:
         """清空数据库"""
@@ -395,3 +1064,8 @@ class SymbolService:
         self.db_manager.create_tables()
         self._file_symbols.clear()
         self._file_scopes.clear()
+        self._file_scope_index.clear()
+        self._file_reference_index.clear()
+        self._parse_cache.clear()
+        self.index_service.clear()
+        self.repository.clear_type_cache()
@@ -8,6 +8,7 @@ from typing import Optional, Dict, List, Set
 from tree_sitter import Node
 
 from ..models import Symbol, TypeInfo, SymbolType, Scope
+from ..source_index import SourceIndex
 from .ast_traverser import ASTTraverser, NodeHelper
 
 
@@ -30,15 +31,16 @@ class TypeInferenceEngine:
         "undefined": "undefined",
     }
     
-    def __init__(self, source_code: bytes):
+    def __init__(self, source_code: bytes, source_index: Optional[SourceIndex] = None):
         """
         初始化类型推导引擎
         
         Args:
             source_code: 源代码字节
+            source_index: 共享的源代码索引（None 表示按需创建）
         """
         self.source_code = source_code
-        self.traverser = ASTTraverser(source_code)
+        self.traverser = ASTTraverser(source_code, source_index)
         
         # 类型缓存
         self.type_cache: Dict[str, TypeInfo] = {}
@@ -0,0 +1,97 @@
+"""
+对外接口指纹测试
+
+验证只修改函数体或私有成员时指纹不变，修改导出签名、装饰器或组件状态属性时指纹变化，
+以及指纹与文件的符号一同保存。
+"""
+
+import pytest
+
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import AnalysisPipeline, create_default_parser
+from arkts_processor.symbol_service.dependencies import EMPTY_API_FINGERPRINT, api_fingerprint
+
+
+BASE_SOURCE = """@Component
+export struct Card {
+  @Prop title: string = ''
+  private helper: number = 1
+  build() { Text(this.title) }
+}
+
+export class Service {
+  private secret: number = 0
+  public load(id: number): void { }
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return create_default_parser()
+
+
+def _fingerprint(parser, source):
+    data = source.encode("utf-8")
+    analysis = AnalysisPipeline().analyze("card.ets", data, parser.parse(data))
+    return api_fingerprint(analysis.symbols)
+
+
+class TestApiFingerprint:
+    """对外接口指纹测试"""
+
+    @pytest.mark.parametrize("edited", [
+        # 函数体
+        BASE_SOURCE.replace("public load(id: number): void { }", "public load(id: number): void { let x = id }"),
+        # 私有成员
+        BASE_SOURCE.replace("private secret: number = 0", "private secret: string = ''"),
+        BASE_SOURCE.replace("private helper: number = 1", "private helper: number = 2\n  private extra: number = 3"),
+        # 位置和成员顺序
+        "\n\n" + BASE_SOURCE.replace(
+            "  private secret: number = 0\n  public load(id: number): void { }\n",
+            "  public load(id: number): void { }\n  private secret: number = 0\n"
+        ),
+    ])
+    def test_unchanged(self, parser, edited):
+        """只修改函数体、私有成员或位置时指纹不变"""
+        assert _fingerprint(parser, edited) == _fingerprint(parser, BASE_SOURCE)
+
+    @pytest.mark.parametrize("edited", [
+        # 公共方法签名
+        BASE_SOURCE.replace("load(id: number)", "load(id: string)"),
+        BASE_SOURCE.replace("public load(id: number): void", "public load(id: number, force: boolean): void"),
+        # 组件状态属性的装饰器
+        BASE_SOURCE.replace("@Prop title", "@Link title"),
+        # 导出状态
+        BASE_SOURCE.replace("export class Service", "class Service"),
+    ])
+    def test_changed(self, parser, edited):
+        """修改导出签名、装饰器或导出状态时指纹变化"""
+        assert _fingerprint(parser, edited) != _fingerprint(parser, BASE_SOURCE)
+
+    def test_empty(self, parser):
+        """没有对外接口的文件得到固定的空指纹"""
+        assert _fingerprint(parser, "function local() {}\n") == EMPTY_API_FINGERPRINT
+
+    def test_stored_with_symbols(self, tmp_path):
+        """指纹随文件写入，只修改函数体时报告接口未变化"""
+        path = tmp_path / "card.ets"
+        path.write_text(BASE_SOURCE, encoding="utf-8")
+        service = SymbolService(db_path=str(tmp_path / "symbols.db"))
+        service.set_parser(create_default_parser())
+
+        first = service.process_file(str(path))
+        stored = service.repository.get_api_fingerprint(str(path))
+        assert first["api_changed"] is True
+        # 参数列表不写入数据库，指纹由提取结果计算后保存
+        assert stored == api_fingerprint(service.index_service.get_file_symbols(str(path)))
+
+        path.write_text(BASE_SOURCE.replace("{ }", "{ return }"), encoding="utf-8")
+        assert service.refresh_file(str(path))["api_changed"] is False
+
+        path.write_text(BASE_SOURCE.replace("@Prop", "@Link"), encoding="utf-8")
+        assert service.refresh_file(str(path))["api_changed"] is True
+        assert service.repository.get_api_fingerprint(str(path)) != stored
+
+        service.delete_file(str(path))
+        assert service.repository.get_api_fingerprint(str(path)) is None
@@ -0,0 +1,180 @@
+"""
+AST遍历器测试
+
+验证基于 TreeCursor 的迭代遍历与递归遍历结果一致，且不受递归深度限制。
+"""
+
+import sys
+
+from arkts_processor.symbol_service.ast_traverser import (
+    ASTVisitor, ASTTraverser, walk_tree, iter_nodes
+)
+from arkts_processor.symbol_service.extractor import SymbolExtractor
+from arkts_processor.symbol_service.pipeline import create_default_parser
+
+
+SOURCE = b"""class Point {
+  x: number = 0;
+
+  move(dx: number): void {
+    this.x = this.x + dx;
+  }
+}
+
+function twice(n: number): number {
+  return n * 2;
+}
+"""
+
+
+def _preorder(node):
+    """递归前序遍历（对照实现）"""
+    result = [(node.type, node.start_byte, node.end_byte)]
+    for child in node.children:
+        result.extend(_preorder(child))
+    return result
+
+
+def _postorder(node):
+    """递归后序遍历（对照实现）"""
+    result = []
+    for child in node.children:
+        result.extend(_postorder(child))
+    result.append((node.type, node.start_byte, node.end_byte))
+    return result
+
+
+def _key(node):
+    return (node.type, node.start_byte, node.end_byte)
+
+
+class _CountingVisitor(ASTVisitor):
+    """统计类声明和标识符的访问者"""
+
+    def __init__(self):
+        self.classes = []
+        self.identifiers = 0
+
+    def visit_class_declaration(self, node):
+        self.classes.append(node.start_byte)
+        self.generic_visit(node)
+
+    def visit_identifier(self, node):
+        self.identifiers += 1
+
+
+class TestWalkTree:
+    """迭代遍历测试"""
+
+    def setup_method(self):
+        self.tree = create_default_parser().parse(SOURCE)
+
+    def test_iter_nodes_orders(self):
+        """前序和后序迭代与递归遍历一致"""
+        root = self.tree.root_node
+        assert [_key(n) for n in iter_nodes(root)] == _preorder(root)
+        assert [_key(n) for n in iter_nodes(root, pre_order=False)] == _postorder(root)
+
+    def test_walk_tree_skip_subtree(self):
+        """enter 返回 False 时跳过子树，但仍调用 leave"""
+        entered, left = [], []
+
+        def enter(node):
+            entered.append(node.type)
+            return node.type != "class_declaration"
+
+        walk_tree(self.tree.root_node, enter, lambda node: left.append(node.type))
+
+        assert "class_declaration" in entered
+        assert "class_body" not in entered
+        assert "function_declaration" in entered or "expression_statement" in entered
+        assert sorted(entered) == sorted(left)
+
+    def test_traverse_post_order(self):
+        """ASTTraverser.traverse 的后序模式"""
+        visited = []
+
+        class Recorder(ASTVisitor):
+            def visit(self, node):
+                visited.append(_key(node))
+
+        ASTTraverser(SOURCE).traverse(self.tree, Recorder(), pre_order=False)
+        assert visited == _postorder(self.tree.root_node)
+
+    def test_traverse_pre_order_skip(self):
+        """前序模式下 visit() 返回 False 跳过子树"""
+        visited = []
+
+        class Recorder(ASTVisitor):
+            def visit(self, node):
+                visited.append(node.type)
+                return node.type != "class_declaration"
+
+        ASTTraverser(SOURCE).traverse(self.tree, Recorder())
+        assert "class_declaration" in visited
+        assert "class_body" not in visited
+
+    def test_generic_visit_dispatch(self):
+        """generic_visit 将定义了 visit_* 的节点交给对应方法处理"""
+        visitor = _CountingVisitor()
+        visitor.visit(self.tree.root_node)
+
+        identifiers = [n for n in iter_nodes(self.tree.root_node) if n.type == "identifier"]
+        assert len(visitor.classes) == 1
+        assert visitor.identifiers == len(identifiers)
+
+    def test_instance_visit_methods_take_priority(self):
+        """实例上设置的 visit_* 优先于类上的方法，未定义的节点类型也会分发"""
+        visitor = _CountingVisitor()
+        visited = []
+        visitor.visit_identifier = lambda node: visited.append(node.start_byte)
+        visitor.visit_method_declaration = lambda node: visited.append("method")
+        visitor.visit(self.tree.root_node)
+
+        assert visitor.identifiers == 0
+        assert "method" in visited
+        assert len(visitor.classes) == 1
+
+        # 其他实例不受影响
+        other = _CountingVisitor()
+        other.visit(self.tree.root_node)
+        assert other.identifiers > 0
+
+    def test_find_nodes_and_position(self):
+        """按类型查找节点和按位置查找最深节点"""
+        traverser = ASTTraverser(SOURCE)
+        classes = traverser.find_nodes_by_type(self.tree, "class_declaration")
+        assert len(classes) == 1
+
+        node = traverser.find_node_at_position(self.tree, 0, 7)
+        assert traverser.get_node_text(node) == "Point"
+        assert traverser.find_node_at_position(self.tree, 100, 0) is None
+
+
+class TestDeepNesting:
+    """深层嵌套测试"""
+
+    def test_deep_ui_tree_exceeds_recursion_limit(self):
+        """嵌套层数超过递归深度限制时仍能完成提取"""
+        depth = sys.getrecursionlimit()
+        body = "Image($r('app.media.icon'))"
+        for _ in range(depth // 4):
+            body = "Column() {\n" + body + "\n}"
+        source = (
+            "@Component\nstruct Deep {\n  build() {\n" + body + "\n  }\n}\n"
+        ).encode("utf-8")
+
+        tree = create_default_parser().parse(source)
+        max_depth = [0]
+        levels = [0]
+
+        def enter(node):
+            levels.append(levels[-1] + 1)
+            max_depth[0] = max(max_depth[0], levels[-1])
+
+        walk_tree(tree.root_node, enter, lambda node: levels.pop())
+        assert max_depth[0] > depth
+
+        symbols = SymbolExtractor("deep.ets", source).extract(tree)
+        build = next(s for s in symbols if s.name == "build")
+        assert build.resource_refs == ["app.media.icon"]
@@ -0,0 +1,111 @@
+"""
+定义查找测试
+
+验证按位置索引的引用查找、批量定义查找以及旧数据库的列补充。
+"""
+
+import sqlite3
+
+import pytest
+
+from arkts_processor.models import (
+    Symbol, SymbolType, Range, Position, Reference, ReferenceType
+)
+from arkts_processor.database.repository import DatabaseManager
+from arkts_processor.symbol_service.service import SymbolService
+
+
+def _symbol(name, symbol_type, start, end):
+    return Symbol(
+        id=None,
+        name=name,
+        symbol_type=symbol_type,
+        file_path="main.ets",
+        range=Range(Position(*start, 0), Position(*end, 0)),
+        scope_id=1
+    )
+
+
+def _reference(symbol, line, column, end_column):
+    return Reference(
+        id=None,
+        symbol_id=symbol.id,
+        file_path="main.ets",
+        position=Position(line, column, 0),
+        reference_type=ReferenceType.READ,
+        end_column=end_column
+    )
+
+
+class TestDefinitionLookup:
+    """定义查找测试"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        service = SymbolService(db_path=str(tmp_path / "symbols.db"))
+
+        symbols = [
+            _symbol("Counter", SymbolType.CLASS, (0, 0), (10, 1)),
+            _symbol("count", SymbolType.PROPERTY, (1, 2), (1, 20)),
+            _symbol("increment", SymbolType.METHOD, (3, 2), (6, 3)),
+            _symbol("step", SymbolType.PARAMETER, (3, 12), (3, 24)),
+        ]
+        service.repository.save_symbols_batch(symbols)
+        service.index_service.add_file("main.ets", symbols)
+        _, count, increment, step = symbols
+
+        # this.count += step;   （第4行）
+        # this.increment(count)  （第5行）
+        service.repository.save_references_batch([
+            _reference(step, 4, 18, 22),
+            _reference(count, 4, 9, 14),
+            _reference(increment, 5, 9, 18),
+            _reference(count, 5, 19, 24),
+        ])
+        return service, {s.name: s for s in symbols}
+
+    def test_reference_at_position(self, service):
+        """引用按 [起始列, 结束列) 匹配，不再取同一行的第一个引用"""
+        service, symbols = service
+        assert service.find_reference_at_position("main.ets", 4, 20).symbol_id == symbols["step"].id
+        assert service.find_reference_at_position("main.ets", 4, 9).symbol_id == symbols["count"].id
+        assert service.find_reference_at_position("main.ets", 4, 14) is None
+        assert service.find_reference_at_position("main.ets", 5, 24) is None
+
+        reference = service.repository.get_reference_at_position("main.ets", 5, 20)
+        assert reference.symbol_id == symbols["count"].id
+        assert reference.end_column == 24
+        assert service.repository.get_reference_at_position("main.ets", 5, 18) is None
+
+    def test_find_definitions_batch(self, service):
+        """批量查找与逐个查找结果一致，非引用位置返回最内层符号"""
+        service, _ = service
+        positions = [(4, 20), (4, 10), (5, 12), (5, 19), (3, 14), (4, 2), (20, 0)]
+        expected = ["step", "count", "increment", "count", "step", "increment", None]
+
+        results = service.find_definitions("main.ets", positions)
+        assert [s.name if s else None for s in results] == expected
+        assert [service.find_definition("main.ets", line, column) for line, column in positions] == results
+
+
+class TestSchemaUpgrade:
+    """旧数据库升级测试"""
+
+    def test_missing_nullable_columns_are_added(self, tmp_path):
+        """create_tables 为旧版本的引用表补充 end_column 列"""
+        path = str(tmp_path / "old.db")
+        manager = DatabaseManager(path)
+        manager.create_tables()
+        manager.engine.dispose()
+
+        connection = sqlite3.connect(path)
+        connection.execute('DROP INDEX idx_ref_position')
+        connection.execute('ALTER TABLE "references" DROP COLUMN end_column')
+        connection.commit()
+        connection.close()
+
+        upgraded = DatabaseManager(path)
+        upgraded.create_tables()
+        with upgraded.engine.connect() as connection:
+            columns = {row[1] for row in connection.exec_driver_sql('PRAGMA table_info("references")')}
+        assert "end_column" in columns
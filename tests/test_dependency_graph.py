@@ -0,0 +1,161 @@
+"""
+文件依赖图测试
+
+验证由导入和继承名称建立的文件依赖图、跨文件导入引用，以及文件变化后
+只在对外接口变化时重新解析依赖文件。
+"""
+
+import os
+
+import pytest
+
+from arkts_processor.models import ReferenceType
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import create_default_parser
+from arkts_processor.symbol_service.dependencies import resolve_module_path
+
+
+SAMPLE_SOURCES = {
+    "base.ets": "export class Base {\n  run(): void {}\n}\n",
+    "derived.ets": "import { Base } from './base'\n\nexport class Derived extends Base {}\n",
+    "leaf.ets": "import { Derived as Parent } from './derived'\n\nclass Leaf extends Parent {}\n",
+}
+
+
+class TestDependencyGraph:
+    """文件依赖图测试"""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        paths = {}
+        for name, content in SAMPLE_SOURCES.items():
+            path = tmp_path / name
+            path.write_text(content, encoding="utf-8")
+            paths[name] = str(path)
+        service = SymbolService(db_path=str(tmp_path / "symbols.db"))
+        service.set_parser(create_default_parser())
+        # 导入方先于被导入的文件处理
+        service.process_files([paths["leaf.ets"], paths["derived.ets"], paths["base.ets"]])
+        return service, paths
+
+    @staticmethod
+    def _write(path, content):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    @staticmethod
+    def _import_targets(service, path):
+        references = service.repository.get_references_by_file(path)
+        return [
+            service.repository.get_symbol_by_id(r.symbol_id).name
+            for r in references if r.reference_type == ReferenceType.IMPORT
+        ]
+
+    def _ancestors(self, service, name):
+        return [s.name for s in service.find_ancestors(service.find_symbol_by_name(name)[0].id)]
+
+    def test_graph_and_import_references(self, workspace):
+        """依赖边来自导入语句，导入引用指向被导入文件的导出符号"""
+        service, paths = workspace
+        repository = service.repository
+
+        assert repository.get_file_dependencies(paths["leaf.ets"]) == [paths["derived.ets"]]
+        assert repository.get_dependent_files([paths["base.ets"]]) == [paths["derived.ets"]]
+        assert repository.get_dependent_files([paths["base.ets"]], transitive=True) == [
+            paths["derived.ets"], paths["leaf.ets"]
+        ]
+
+        assert self._import_targets(service, paths["derived.ets"]) == ["Base"]
+        assert self._import_targets(service, paths["leaf.ets"]) == ["Derived"]
+        assert self._ancestors(service, "Leaf") == ["Derived", "Base"]
+
+    def test_body_edit_skips_dependents(self, workspace):
+        """只修改函数体时不重新解析依赖文件，导入引用和关系指向新的符号"""
+        service, paths = workspace
+        self._write(paths["base.ets"], "export class Base {\n  run(): void { let x = 1 }\n}\n")
+
+        result = service.refresh_file(paths["base.ets"])
+        assert result["dependents"] == 0
+        assert self._import_targets(service, paths["derived.ets"]) == ["Base"]
+        assert self._ancestors(service, "Leaf") == ["Derived", "Base"]
+
+    def test_body_edit_refreshes_importer_reference_index(self, workspace):
+        """接口未变但符号ID变化时，导入方的跳转定义指向新的符号"""
+        service, paths = workspace
+        assert service.find_definition(paths["derived.ets"], 0, 9).name == "Base"
+
+        # 前面插入空行使符号的起始偏移和ID变化，对外接口不变
+        self._write(paths["base.ets"], "\n" + SAMPLE_SOURCES["base.ets"])
+        assert service.refresh_file(paths["base.ets"])["api_changed"] is False
+
+        target = service.find_definition(paths["derived.ets"], 0, 9)
+        assert target is not None
+        assert (target.name, target.file_path, target.range.start.line) == ("Base", paths["base.ets"], 1)
+
+    def test_backfill_follows_aliased_import(self, workspace):
+        """被别名导入的文件只修改函数体时，导入方的继承关系指向新的符号"""
+        service, paths = workspace
+        self._write(paths["derived.ets"], "\n" + SAMPLE_SOURCES["derived.ets"])
+        assert service.refresh_file(paths["derived.ets"])["dependents"] == 0
+        assert self._ancestors(service, "Leaf") == ["Derived", "Base"]
+
+    def test_backfill_respects_import_bindings(self, workspace, tmp_path):
+        """同名类型在其他文件中出现时，不为导入了该名称的文件补建关系"""
+        service, paths = workspace
+        other = tmp_path / "other.ets"
+        other.write_text("export class Base {}\n", encoding="utf-8")
+        service.process_file(str(other))
+
+        assert service.repository.get_dependent_files([str(other)]) == []
+        self._write(str(other), "\nexport class Base {}\n")
+        service.refresh_file(str(other))
+        ancestors = service.find_ancestors(service.find_symbol_by_name("Derived")[0].id)
+        assert [(s.name, s.file_path) for s in ancestors] == [("Base", paths["base.ets"])]
+
+    def test_api_change_reresolves_closure(self, workspace):
+        """对外接口变化时重新解析依赖文件的传递闭包"""
+        service, paths = workspace
+        self._write(paths["base.ets"], "export class Root {}\n")
+
+        result = service.refresh_file(paths["base.ets"])
+        assert result["dependents"] == 2
+        assert self._import_targets(service, paths["derived.ets"]) == []
+        assert self._ancestors(service, "Leaf") == ["Derived"]
+
+        self._write(paths["base.ets"], SAMPLE_SOURCES["base.ets"])
+        assert service.refresh_file(paths["base.ets"])["dependents"] == 2
+        assert self._import_targets(service, paths["derived.ets"]) == ["Base"]
+        assert self._ancestors(service, "Leaf") == ["Derived", "Base"]
+
+    def test_delete_file_reresolves_dependents(self, workspace):
+        """删除文件后依赖文件的导入引用和关系被清除，依赖边保留"""
+        service, paths = workspace
+        service.delete_file(paths["base.ets"])
+
+        assert self._import_targets(service, paths["derived.ets"]) == []
+        assert self._ancestors(service, "Derived") == []
+        assert service.repository.get_dependent_files([paths["base.ets"]]) == [paths["derived.ets"]]
+
+    def test_refresh_deleted_file(self, workspace):
+        """刷新已从磁盘删除的文件时清除其数据并返回删除结果，不再解析"""
+        service, paths = workspace
+        os.remove(paths["base.ets"])
+        result = service.refresh_file(paths["base.ets"])
+
+        assert result == {"file_path": paths["base.ets"], "deleted": 2}
+        assert service.repository.get_symbols_by_file(paths["base.ets"]) == []
+        assert self._ancestors(service, "Derived") == []
+
+
+def test_resolve_module_path(tmp_path):
+    """相对模块按 .ets、.ts、index 文件的顺序解析，非相对模块不解析"""
+    importer = str(tmp_path / "pages" / "Index.ets")
+    (tmp_path / "model").mkdir()
+    (tmp_path / "model" / "User.ts").write_text("", encoding="utf-8")
+    (tmp_path / "common").mkdir()
+    (tmp_path / "common" / "index.ets").write_text("", encoding="utf-8")
+
+    assert resolve_module_path(importer, "../model/User") == str(tmp_path / "model" / "User.ts")
+    assert resolve_module_path(importer, "../common") == str(tmp_path / "common" / "index.ets")
+    assert resolve_module_path(importer, "./Missing") == str(tmp_path / "pages" / "Missing.ets")
+    assert resolve_module_path(importer, "@ohos.router") is None
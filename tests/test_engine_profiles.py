@@ -0,0 +1,88 @@
+"""
+SQLite 引擎配置测试
+
+验证各配置在建立连接时执行的 PRAGMA 以及配置切换。
+"""
+
+import os
+import tempfile
+import shutil
+
+import pytest
+from sqlalchemy import text
+
+from arkts_processor.database import DatabaseManager, SymbolRepository, ENGINE_PROFILES, get_profile
+from arkts_processor.models import Symbol, SymbolType, Range, Position
+
+
+def _pragma(db_manager, name):
+    with db_manager.engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestEngineProfiles:
+    """引擎配置测试"""
+
+    @pytest.fixture
+    def db_path(self):
+        temp_dir = tempfile.mkdtemp()
+        yield os.path.join(temp_dir, "profiles.db")
+        shutil.rmtree(temp_dir)
+
+    def test_serving_profile_pragmas(self, db_path):
+        """serving 配置启用 WAL 和 NORMAL 同步"""
+        db_manager = DatabaseManager(db_path, profile="serving")
+        assert _pragma(db_manager, "journal_mode") == "wal"
+        assert _pragma(db_manager, "synchronous") == 1
+        assert _pragma(db_manager, "cache_size") == -65536
+        assert _pragma(db_manager, "temp_store") == 2
+        assert _pragma(db_manager, "busy_timeout") == 5000
+        assert db_manager.engine.pool.size() == 8
+
+    def test_default_profile_is_safe(self, db_path):
+        """默认配置保持回滚日志和完全同步"""
+        db_manager = DatabaseManager(db_path)
+        assert db_manager.profile is ENGINE_PROFILES["safe"]
+        assert _pragma(db_manager, "journal_mode") == "delete"
+        assert _pragma(db_manager, "synchronous") == 2
+
+    def test_switch_profile_keeps_data(self, db_path):
+        """bulk_load 写入后切换到 serving，数据和自定义函数保持可用"""
+        db_manager = DatabaseManager(db_path, profile="bulk_load")
+        db_manager.create_tables()
+        assert _pragma(db_manager, "synchronous") == 0
+
+        repository = SymbolRepository(db_manager)
+        repository.save_symbols_batch([
+            Symbol(id=None, name="Alpha", symbol_type=SymbolType.CLASS, file_path="a.ets",
+                   range=Range(Position(0, 0, 0), Position(0, 5, 5)), scope_id=1)
+        ])
+
+        db_manager.set_profile("serving")
+        assert _pragma(db_manager, "synchronous") == 1
+        assert [s.name for s in repository.query_symbols(name_regex="Al.*")] == ["Alpha"]
+
+    def test_readers_not_blocked_by_writer(self, db_path):
+        """WAL 模式下写事务未提交时读者仍可读取"""
+        db_manager = DatabaseManager(db_path, profile="serving")
+        db_manager.create_tables()
+
+        with db_manager.engine.connect() as writer, db_manager.engine.connect() as reader:
+            writer.execute(text("BEGIN IMMEDIATE"))
+            writer.execute(text("INSERT INTO types (name) VALUES ('pending')"))
+            assert reader.execute(text("SELECT COUNT(*) FROM types")).scalar() == 0
+            writer.execute(text("COMMIT"))
+            assert reader.execute(text("SELECT COUNT(*) FROM types")).scalar() == 1
+
+    def test_unknown_profile(self):
+        """未知配置名称报错"""
+        with pytest.raises(ValueError):
+            get_profile("turbo")
+
+    def test_memory_database(self):
+        """内存数据库忽略连接池参数，切换配置不丢失数据"""
+        db_manager = DatabaseManager(":memory:", profile="serving")
+        db_manager.create_tables()
+        db_manager.set_profile("bulk_load")
+        with db_manager.engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM symbols")).scalar() == 0
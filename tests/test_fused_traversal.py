@@ -0,0 +1,142 @@
+"""
+融合遍历测试
+
+验证单次融合遍历与各阶段独立遍历的结果一致。
+"""
+
+from dataclasses import asdict
+
+from arkts_processor.symbol_service.ast_traverser import ASTVisitor, FusedTraverser
+from arkts_processor.symbol_service.extractor import SymbolExtractor
+from arkts_processor.symbol_service.scope_analyzer import ScopeAnalyzer
+from arkts_processor.symbol_service.reference_resolver import ReferenceResolver
+from arkts_processor.symbol_service.type_inference import TypeInferenceEngine
+from arkts_processor.symbol_service.pipeline import AnalysisPipeline, create_default_parser
+
+
+SOURCE = b"""import { Helper } from './helper'
+
+export class Calculator extends Base implements Shape {
+  private result: number = 0;
+
+  add(a: number, b: number): number {
+    const sum = a + b;
+    this.result = sum;
+    return this.result;
+  }
+}
+
+@Entry
+@Component
+struct Index {
+  @State message: string = 'Hello'
+
+  build() {
+    Column() {
+      Text(this.message)
+        .fontSize(20)
+        .onClick(() => {
+          this.message = 'Clicked'
+        })
+    }
+  }
+}
+
+export function helper(x: number): number {
+  return x * 2;
+}
+"""
+
+
+class _Recorder(ASTVisitor):
+    """记录进入/离开顺序的处理器"""
+
+    def __init__(self, skip_type=None):
+        self.skip_type = skip_type
+        self.events = []
+
+    def enter_node(self, node):
+        self.events.append(("enter", node.type, node.start_byte))
+        return node.type != self.skip_type
+
+    def leave_node(self, node):
+        self.events.append(("leave", node.type, node.start_byte))
+
+
+def _recursive_events(node, skip_type=None):
+    """递归遍历得到的期望事件序列"""
+    events = [("enter", node.type, node.start_byte)]
+    if node.type != skip_type:
+        for child in node.children:
+            events.extend(_recursive_events(child, skip_type))
+    events.append(("leave", node.type, node.start_byte))
+    return events
+
+
+class TestFusedTraverser:
+    """融合遍历器测试"""
+
+    def test_events_match_recursive_walk(self):
+        """进入/离开顺序与递归遍历一致"""
+        tree = create_default_parser().parse(SOURCE)
+        recorder = _Recorder()
+        FusedTraverser([recorder]).walk(tree.root_node)
+        assert recorder.events == _recursive_events(tree.root_node)
+
+    def test_skip_is_per_handler(self):
+        """一个处理器跳过子树不影响其他处理器"""
+        tree = create_default_parser().parse(SOURCE)
+        skipping = _Recorder(skip_type="class_declaration")
+        full = _Recorder()
+        FusedTraverser([skipping, full]).walk(tree.root_node)
+
+        assert skipping.events == _recursive_events(tree.root_node, "class_declaration")
+        assert full.events == _recursive_events(tree.root_node)
+
+    def test_walk_subtree(self):
+        """从非根节点开始遍历时不越过该子树"""
+        tree = create_default_parser().parse(SOURCE)
+        node = tree.root_node.children[1]
+        recorder = _Recorder()
+        FusedTraverser([recorder]).walk(node)
+        assert recorder.events == _recursive_events(node)
+
+
+class TestFusedPipeline:
+    """融合流水线测试"""
+
+    def test_pipeline_matches_separate_passes(self):
+        """融合遍历的分析结果与分阶段独立遍历一致"""
+        file_path = "sample.ets"
+        tree = create_default_parser().parse(SOURCE)
+
+        # 各阶段独立遍历
+        symbols = SymbolExtractor(file_path, SOURCE).extract(tree)
+        scope_analyzer = ScopeAnalyzer(file_path, SOURCE)
+        scopes = scope_analyzer.analyze(tree, symbols)
+        TypeInferenceEngine(SOURCE).infer_types(symbols, scopes)
+        references, relations = ReferenceResolver(file_path, SOURCE).resolve(
+            tree, symbols, scopes, scope_analyzer
+        )
+
+        analysis = AnalysisPipeline().analyze(file_path, SOURCE, tree)
+
+        assert [asdict(s) for s in analysis.symbols] == [asdict(s) for s in symbols]
+        assert [(s.id, s.scope_type, s.parent_id, s.range, list(s.symbols))
+                for s in analysis.scopes] == \
+               [(s.id, s.scope_type, s.parent_id, s.range, list(s.symbols)) for s in scopes]
+        assert analysis.references == references
+        assert analysis.relations == relations
+
+    def test_extract_matches_visitor_dispatch(self):
+        """extract() 的结果与直接使用 visit() 分发一致"""
+        file_path = "sample.ets"
+        tree = create_default_parser().parse(SOURCE)
+
+        extractor = SymbolExtractor(file_path, SOURCE)
+        extractor.visit(tree.root_node)
+        extractor.finish()
+
+        fused = SymbolExtractor(file_path, SOURCE).extract(tree)
+        assert [asdict(s) for s in fused] == [asdict(s) for s in extractor.symbols]
+        assert len(fused) > 0
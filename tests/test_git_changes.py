@@ -0,0 +1,133 @@
+"""
+git diff 增量索引测试
+
+验证 name-status 输出解析，以及按工作区变化只刷新、删除和移动受影响的文件。
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from arkts_processor.models import SymbolType
+from arkts_processor.symbol_ids import symbol_id
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import create_default_parser
+from arkts_processor.symbol_service.git_changes import (
+    GitChange, GitIncrementalIndexer, git_changed_files, parse_name_status
+)
+from arkts_processor.chunk_service.service import ChunkService
+
+
+SAMPLE_SOURCES = {
+    "a.ets": "class Alpha {\n  run(): void {}\n}\n",
+    "b.ets": "class Beta {\n  size: number = 1\n}\n",
+    "c.ets": "interface Gamma {\n  id: number\n}\n",
+    "README.md": "docs\n",
+}
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+
+def test_parse_name_status():
+    """解析修改、删除、重命名、复制和类型变化"""
+    output = b"M\0a.ets\0D\0b.ets\0R087\0old.ets\0new.ets\0C100\0x.ets\0y.ets\0T\0z.ts\0"
+    assert parse_name_status(output) == [
+        GitChange("M", "a.ets"),
+        GitChange("D", "b.ets"),
+        GitChange("R", "new.ets", "old.ets", 87),
+        GitChange("A", "y.ets"),
+        GitChange("M", "z.ts"),
+    ]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not available")
+class TestGitIncrementalIndexer:
+    """git diff 增量索引测试"""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        for name, content in SAMPLE_SOURCES.items():
+            (repo / name).write_text(content, encoding="utf-8")
+        _git(repo, "init", "-q")
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-q", "-m", "initial")
+
+        service = SymbolService(db_path=str(tmp_path / "symbols.db"))
+        service.set_parser(create_default_parser())
+        chunk_service = ChunkService(service, db_path=str(tmp_path / "chunks.db"))
+        for name in SAMPLE_SOURCES:
+            if name.endswith(".ets"):
+                chunk_service.generate_chunks(str(repo / name))
+        return str(repo), service, chunk_service
+
+    def test_working_tree_changes(self, workspace):
+        """工作区变化只涉及源文件，未跟踪的文件视为新增"""
+        repo, _, _ = workspace
+        with open(os.path.join(repo, "a.ets"), "a", encoding="utf-8") as f:
+            f.write("class Extra {}\n")
+        os.remove(os.path.join(repo, "b.ets"))
+        with open(os.path.join(repo, "d.ets"), "w", encoding="utf-8") as f:
+            f.write("class Delta {}\n")
+        with open(os.path.join(repo, "README.md"), "a", encoding="utf-8") as f:
+            f.write("more\n")
+
+        changes = git_changed_files(repo)
+        assert sorted(changes, key=lambda c: c.path) == [
+            GitChange("M", "a.ets"), GitChange("D", "b.ets"), GitChange("A", "d.ets")
+        ]
+
+    def test_index_changes(self, workspace):
+        """修改的文件重新处理，删除的文件清除，重命名的文件移动原有符号和 Chunk"""
+        repo, service, chunk_service = workspace
+        path = lambda name: os.path.join(repo, name)
+        gamma_id = service.find_symbol_by_name("Gamma")[0].id
+
+        with open(path("a.ets"), "w", encoding="utf-8") as f:
+            f.write("class Omega {\n  run(): void {}\n}\n")
+        os.remove(path("b.ets"))
+        _git(repo, "mv", "c.ets", "moved.ets")
+        _git(repo, "commit", "-q", "-am", "changes")
+
+        indexer = GitIncrementalIndexer(service, chunk_service)
+        summary = indexer.index_changes(repo, "HEAD~1", "HEAD")
+        assert {k: summary[k] for k in ("added", "modified", "deleted", "renamed", "errors")} == {
+            "added": 0, "modified": 1, "deleted": 1, "renamed": 1, "errors": 0
+        }
+
+        assert service.find_symbol_by_name("Alpha") == []
+        assert len(service.find_symbol_by_name("Omega")) == 1
+        assert service.find_symbol_by_name("Beta") == []
+        assert chunk_service.get_chunks_by_file(path("b.ets")) == []
+
+        # 重命名不重新提取：路径指向新文件，符号ID按新路径重新计算
+        moved_id = symbol_id(path("moved.ets"), "Gamma", SymbolType.INTERFACE.value, 0)
+        gamma = service.find_symbol_by_name("Gamma")
+        assert moved_id != gamma_id
+        assert [(s.id, s.file_path) for s in gamma] == [(moved_id, path("moved.ets"))]
+        assert service.repository.get_symbol_by_id(moved_id).file_path == path("moved.ets")
+        assert service.repository.get_symbols_by_file(path("c.ets")) == []
+        assert service.repository.get_file_fingerprint(path("moved.ets")) is not None
+        assert service.find_symbol_at_position(path("moved.ets"), 1, 2).name == "Gamma"
+
+        chunks = chunk_service.get_chunks_by_file(path("moved.ets"))
+        assert chunks and all(c.chunk_id.startswith(path("moved.ets") + "#") for c in chunks)
+        assert all(path("c.ets") not in c.source for c in chunks)
+        assert chunk_service.get_chunks_by_file(path("c.ets")) == []
+        # Chunk 关联的符号ID随重命名更新
+        assert any(c.symbol_id for c in chunks)
+        assert all(
+            service.repository.get_symbol_by_id(c.symbol_id).file_path == path("moved.ets")
+            for c in chunks if c.symbol_id
+        )
+
+        # 重新索引时移动后的文件未变化
+        assert service.reindex([path("a.ets"), path("moved.ets")])["skipped"] == 2
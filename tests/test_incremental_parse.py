@@ -0,0 +1,205 @@
+"""
+增量解析测试
+
+验证增量重解析得到的符号与完整重新提取的结果一致。
+"""
+
+import os
+import tempfile
+import shutil
+from dataclasses import asdict
+
+import pytest
+
+from arkts_processor.models import Position, Range, TextEdit
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.extractor import SymbolExtractor
+from arkts_processor.symbol_service.pipeline import create_default_parser
+
+
+SOURCE = """import { Helper } from './helper'
+
+/** 计算器 */
+export class Calculator {
+  private result: number = 0;
+
+  add(a: number, b: number): number {
+    this.result = a + b;
+    return this.result;
+  }
+}
+
+@Component
+export struct Card {
+  @State title: string = '标题'
+
+  build() {
+    Column() {
+      Text(this.title)
+    }
+  }
+}
+
+interface Shape {
+  area(): number;
+}
+"""
+
+
+def _edit(start_line, start_col, end_line, end_col, text):
+    """构造编辑（行列均从0开始，列为字节列，offset 不参与计算）"""
+    return TextEdit(
+        range=Range(
+            start=Position(line=start_line, column=start_col, offset=0),
+            end=Position(line=end_line, column=end_col, offset=0)
+        ),
+        new_text=text
+    )
+
+
+def _comparable(symbols):
+    """转换为可比较的形式（忽略ID和作用域ID）"""
+    result = []
+    for symbol in symbols:
+        data = asdict(symbol)
+        data.pop("id")
+        data.pop("scope_id")
+        for param in data["parameters"]:
+            param.pop("id")
+            param.pop("scope_id")
+        result.append(data)
+    return result
+
+
+class TestIncrementalParse:
+    """增量解析测试"""
+
+    @pytest.fixture
+    def service(self):
+        """创建已索引示例文件的服务"""
+        temp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(temp_dir, "sample.ets")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(SOURCE)
+
+        service = SymbolService(db_path=os.path.join(temp_dir, "symbols.db"))
+        service.set_parser(create_default_parser())
+        service.process_file(file_path)
+        yield service, file_path
+        shutil.rmtree(temp_dir)
+
+    def _full_extract(self, file_path, source):
+        """对完整源代码重新提取符号"""
+        source_code = source.encode("utf-8")
+        tree = create_default_parser().parse(source_code)
+        return SymbolExtractor(file_path, source_code).extract(tree)
+
+    def _apply(self, source, edits):
+        """在字符串上按顺序应用编辑（示例只包含ASCII编辑位置）"""
+        for edit in edits:
+            lines = source.split("\n")
+            start = sum(len(l) + 1 for l in lines[:edit.range.start.line]) + edit.range.start.column
+            end = sum(len(l) + 1 for l in lines[:edit.range.end.line]) + edit.range.end.column
+            source = source[:start] + edit.new_text + source[end:]
+        return source
+
+    def _check(self, service, file_path, edits):
+        """应用编辑后与完整提取比较，并返回处理结果"""
+        result = service.update_file_content(file_path, edits)
+        expected = self._full_extract(file_path, self._apply(SOURCE, edits))
+
+        actual = service._file_symbols[file_path]
+        assert _comparable(actual) == _comparable(expected)
+        assert result["symbols"] == len(expected)
+        return result
+
+    def test_edit_inside_method_body(self, service):
+        """方法体内的编辑只重新提取所在的顶层声明"""
+        svc, file_path = service
+        result = self._check(svc, file_path, [_edit(8, 4, 8, 4, "let x = 1;\n    ")])
+        assert result["reextracted"] == 1
+        assert result["reused"] > 0
+
+    def test_insert_declaration_before_class(self, service):
+        """在类之前插入新声明，后续声明的位置整体平移"""
+        svc, file_path = service
+        result = self._check(svc, file_path, [_edit(2, 0, 2, 0, "const VERSION: string = '1.0'\n\n")])
+        assert result["reused"] > 0
+
+    def test_rename_class(self, service):
+        """修改声明名称"""
+        svc, file_path = service
+        self._check(svc, file_path, [_edit(3, 13, 3, 23, "Adder")])
+
+    def test_edit_decorator(self, service):
+        """修改装饰器会重新提取被装饰的声明"""
+        svc, file_path = service
+        self._check(svc, file_path, [_edit(12, 1, 12, 10, "Entry")])
+
+    def test_sequential_edits(self, service):
+        """多个编辑按顺序应用，且后续调用复用新的语法树"""
+        svc, file_path = service
+        edits = [
+            _edit(24, 2, 24, 6, "perimeter"),
+            _edit(0, 9, 0, 15, "Util"),
+        ]
+        self._check(svc, file_path, edits)
+
+        # 基于上一次编辑后的内容继续编辑
+        source = self._apply(SOURCE, edits)
+        follow_up = [_edit(4, 10, 4, 16, "total")]
+        svc.update_file_content(file_path, follow_up)
+        expected = self._full_extract(file_path, self._apply(source, follow_up))
+        assert _comparable(svc._file_symbols[file_path]) == _comparable(expected)
+
+    def test_database_replaced(self, service):
+        """增量更新会替换数据库中文件的旧数据"""
+        svc, file_path = service
+        svc.update_file_content(file_path, [_edit(3, 13, 3, 23, "Adder")])
+
+        names = {s.name for s in svc.repository.get_symbols_by_file(file_path)}
+        assert "Adder" in names
+        assert "Calculator" not in names
+
+    def test_invalid_edit_range(self, service):
+        """超出文档范围的编辑"""
+        svc, file_path = service
+        with pytest.raises(ValueError):
+            svc.update_file_content(file_path, [_edit(100, 0, 100, 1, "x")])
+
+    def test_failed_batch_keeps_cached_tree(self, service):
+        """批量编辑中途失败时缓存的源代码和语法树都保持不变"""
+        svc, file_path = service
+        with pytest.raises(ValueError):
+            svc.update_file_content(file_path, [
+                _edit(0, 9, 0, 15, "Utility"),
+                _edit(100, 0, 100, 1, "x"),
+            ])
+
+        source, tree = svc._parse_cache[file_path]
+        assert source == SOURCE.encode("utf-8")
+        assert tree.root_node.end_byte == len(source)
+        self._check(svc, file_path, [_edit(4, 10, 4, 16, "total")])
+
+    def test_line_starts_follow_edits(self, service):
+        """同一批中的后续编辑按前面编辑之后的行号定位"""
+        svc, file_path = service
+        self._check(svc, file_path, [
+            _edit(2, 0, 2, 0, "// 第一行\n// 第二行\n"),
+            _edit(6, 10, 6, 16, "total"),
+            _edit(1, 0, 3, 0, ""),
+        ])
+
+    def test_parallel_processing_evicts_cached_tree(self, service):
+        """并行处理提交新内容后，增量更新基于新内容而不是缓存的旧语法树"""
+        svc, file_path = service
+        changed = SOURCE.replace("Calculator", "Counter")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(changed)
+        svc.process_files([file_path], workers=2)
+        assert file_path not in svc._parse_cache
+
+        edits = [_edit(4, 10, 4, 16, "total")]
+        svc.update_file_content(file_path, edits)
+        expected = self._full_extract(file_path, self._apply(changed, edits))
+        assert _comparable(svc._file_symbols[file_path]) == _comparable(expected)
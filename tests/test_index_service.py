@@ -0,0 +1,514 @@
+"""
+符号索引服务测试
+
+验证项目级增量索引和从数据库预热。
+"""
+
+import os
+import tempfile
+import shutil
+
+import pytest
+
+from arkts_processor.models import Symbol, SymbolType, Range, Position, Visibility, TypeInfo
+from arkts_processor.database.repository import DatabaseManager, SymbolRepository
+from arkts_processor.symbol_service import index_service as index_service_module
+from arkts_processor.symbol_service.index_service import SymbolIndexService, SymbolQuery, QueryOperator
+from arkts_processor.symbol_service.prefix_index import PrefixIndex, camel_humps
+from arkts_processor.symbol_service.fuzzy_index import trigrams, fuzzy_score
+from arkts_processor.symbol_service.regex_filter import compile_regex, extract_literals
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import create_default_parser
+
+
+def _symbol(name, symbol_type, file_path, line=0):
+    return Symbol(
+        id=None,
+        name=name,
+        symbol_type=symbol_type,
+        file_path=file_path,
+        range=Range(Position(line, 0, 0), Position(line, len(name), len(name))),
+        scope_id=1
+    )
+
+
+class TestIncrementalIndex:
+    """增量索引测试"""
+
+    @pytest.fixture
+    def index(self):
+        temp_dir = tempfile.mkdtemp()
+        db_manager = DatabaseManager(os.path.join(temp_dir, "index.db"))
+        db_manager.create_tables()
+        index = SymbolIndexService(SymbolRepository(db_manager))
+        # 数据库为空，内存索引即完整的项目索引
+        index.ensure_loaded()
+        yield index
+        shutil.rmtree(temp_dir)
+
+    def test_add_files_keeps_other_files(self, index):
+        """加入新文件不会清除其他文件的符号"""
+        index.add_file("a.ets", [_symbol("Foo", SymbolType.CLASS, "a.ets")])
+        index.add_file("b.ets", [_symbol("Foo", SymbolType.FUNCTION, "b.ets"),
+                                 _symbol("bar", SymbolType.FUNCTION, "b.ets", 1)])
+
+        assert {s.file_path for s in index.find_symbol_by_name("Foo")} == {"a.ets", "b.ets"}
+        assert [s.file_path for s in index.find_symbol_by_name("Foo", "a.ets")] == ["a.ets"]
+        assert len(index.find_functions()) == 2
+        assert index.get_statistics()["total"] == 3
+        assert sorted(index.get_indexed_files()) == ["a.ets", "b.ets"]
+
+    def test_add_file_replaces_previous_version(self, index):
+        """重新加入同一文件时替换旧符号"""
+        index.add_file("a.ets", [_symbol("Old", SymbolType.CLASS, "a.ets")])
+        index.add_file("a.ets", [_symbol("New", SymbolType.CLASS, "a.ets")])
+
+        assert index.find_symbol_by_name("Old") == []
+        assert len(index.find_symbol_by_name("New")) == 1
+        assert index.get_statistics("a.ets")["total"] == 1
+
+    def test_remove_file(self, index):
+        """移除文件后其符号从所有索引中消失"""
+        index.add_file("a.ets", [_symbol("Foo", SymbolType.CLASS, "a.ets")])
+        index.add_file("b.ets", [_symbol("Foo", SymbolType.CLASS, "b.ets")])
+
+        assert index.remove_file("a.ets") == 1
+        assert index.remove_file("missing.ets") == 0
+        assert [s.file_path for s in index.find_symbol_by_name("Foo")] == ["b.ets"]
+        assert [s.file_path for s in index.find_classes()] == ["b.ets"]
+
+        index.remove_file("b.ets")
+        assert index.find_symbol_by_name("Foo") == []
+        assert index._symbol_name_index == {}
+        assert index._symbol_type_index == {}
+
+    def test_query_by_type_without_name(self, index):
+        """仅按类型查询"""
+        index.add_file("a.ets", [_symbol("Foo", SymbolType.CLASS, "a.ets"),
+                                 _symbol("run", SymbolType.FUNCTION, "a.ets", 1)])
+        query = SymbolQuery()
+        query.symbol_types = [SymbolType.FUNCTION]
+        assert [s.name for s in index.query(query)] == ["run"]
+
+
+class TestWarmLoad:
+    """启动预热测试"""
+
+    def test_service_warm_loads_from_database(self):
+        """新建服务时从数据库恢复项目级索引"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            db_path = os.path.join(temp_dir, "symbols.db")
+            first = SymbolService(db_path=db_path)
+            first.repository.save_symbols_batch([
+                _symbol("Alpha", SymbolType.CLASS, "a.ets"),
+                _symbol("beta", SymbolType.FUNCTION, "b.ets"),
+                _symbol("gamma", SymbolType.FUNCTION, "b.ets", 2),
+            ])
+
+            second = SymbolService(db_path=db_path)
+            assert sorted(second.index_service.get_indexed_files()) == ["a.ets", "b.ets"]
+            assert len(second.find_symbol_by_name("Alpha")) == 1
+            assert second.get_statistics()["total"] == 3
+
+            cold = SymbolService(db_path=db_path, warm_index=False)
+            assert cold.index_service.get_indexed_files() == []
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_cold_service_keeps_database_files(self, tmp_path):
+        """未预热时处理文件后，查询结果仍包含数据库中其他文件的符号"""
+        db_path = str(tmp_path / "symbols.db")
+        SymbolService(db_path=db_path).repository.save_symbols_batch([
+            _symbol("Alpha", SymbolType.CLASS, "a.ets"),
+            _symbol("beta", SymbolType.FUNCTION, "b.ets"),
+        ])
+        source = tmp_path / "c.ets"
+        source.write_text("class Gamma {}\n", encoding="utf-8")
+
+        cold = SymbolService(db_path=db_path, warm_index=False)
+        cold.set_parser(create_default_parser())
+        assert len(cold.find_symbol_by_name("Alpha")) == 1
+        cold.process_file(str(source))
+
+        assert len(cold.find_symbol_by_name("Alpha")) == 1
+        assert len(cold.find_symbol_by_name("Gamma")) == 1
+        assert [s.name for s in cold.index_service.find_symbols_by_prefix("bet")] == ["beta"]
+        assert [s.name for s in cold.get_workspace_symbols("Alph")] == ["Alpha"]
+        assert cold.get_statistics()["total"] == 3
+
+
+class TestPrefixIndex:
+    """名称前缀索引测试"""
+
+    NAMES = ["getSymbolName", "getScope", "GetValue", "setName", "HTTPServer",
+             "MAX_VALUE", "myName", "get", "renderName"]
+
+    def test_camel_humps(self):
+        """驼峰首字母提取"""
+        assert camel_humps("getSymbolName") == "gsn"
+        assert camel_humps("HTTPServer") == "hs"
+        assert camel_humps("MAX_VALUE") == "mv"
+        assert camel_humps("$value") == "v"
+
+    def test_matches_linear_scan(self):
+        """前缀/后缀查询与逐个比较一致，增删后保持一致"""
+        index = PrefixIndex()
+        for name in self.NAMES:
+            index.add(name)
+
+        for prefix in ["get", "Get", "g", "", "set", "x"]:
+            assert list(index.iter_prefix(prefix)) == sorted(n for n in self.NAMES if n.startswith(prefix))
+            assert set(index.iter_prefix(prefix, ignore_case=True)) == \
+                {n for n in self.NAMES if n.lower().startswith(prefix.lower())}
+        for suffix in ["Name", "e", "VALUE"]:
+            assert set(index.iter_suffix(suffix)) == {n for n in self.NAMES if n.endswith(suffix)}
+
+        index.discard("getScope")
+        index.add("getScopeChain")
+        index.discard("missing")
+        assert list(index.iter_prefix("getS")) == ["getScopeChain", "getSymbolName"]
+
+    def test_completions(self, tmp_path):
+        """补全先返回前缀匹配，再返回驼峰匹配，并在达到数量限制时停止"""
+        index = PrefixIndex()
+        for name in self.NAMES:
+            index.add(name)
+        assert list(index.iter_completions("gsn", camel_case=True)) == ["getSymbolName"]
+        assert list(index.iter_completions("hs", camel_case=True)) == ["HTTPServer"]
+
+        db_manager = DatabaseManager(str(tmp_path / "prefix.db"))
+        db_manager.create_tables()
+        service = SymbolIndexService(SymbolRepository(db_manager))
+        service.ensure_loaded()
+        service.add_file("a.ets", [_symbol(name, SymbolType.FUNCTION, "a.ets", i)
+                                   for i, name in enumerate(self.NAMES)])
+
+        assert [s.name for s in service.find_symbols_by_prefix("get")] == \
+            ["get", "getScope", "getSymbolName"]
+        assert [s.name for s in service.find_symbols_by_prefix("get", limit=2)] == ["get", "getScope"]
+        assert [s.name for s in service.find_symbols_by_prefix("get", ignore_case=True)] == \
+            ["get", "getScope", "getSymbolName", "GetValue"]
+        assert [s.name for s in service.find_symbols_by_prefix("gV", camel_case=True)] == ["GetValue"]
+
+        query = SymbolQuery()
+        query.name = "Name"
+        query.name_operator = QueryOperator.ENDS_WITH
+        assert sorted(s.name for s in service.query(query)) == \
+            ["getSymbolName", "myName", "renderName", "setName"]
+
+
+class TestFuzzySearch:
+    """模糊搜索测试"""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        db_manager = DatabaseManager(str(tmp_path / "fuzzy.db"))
+        db_manager.create_tables()
+        service = SymbolIndexService(SymbolRepository(db_manager))
+        service.ensure_loaded()
+        service.add_file("a.ets", [
+            _symbol("getSymbolName", SymbolType.METHOD, "a.ets", 0),
+            _symbol("SymbolService", SymbolType.CLASS, "a.ets", 1),
+            _symbol("symbolCount", SymbolType.VARIABLE, "a.ets", 2),
+            _symbol("lastSymbol", SymbolType.VARIABLE, "a.ets", 3),
+            _symbol("render", SymbolType.FUNCTION, "a.ets", 4),
+        ])
+        return service
+
+    def test_trigrams(self):
+        """三元组按小写提取"""
+        assert trigrams("AbcD") == {"abc", "bcd"}
+        assert trigrams("ab") == set()
+
+    def test_fuzzy_score_prefers_boundaries_and_prefix(self):
+        """单词边界和前缀匹配得分更高"""
+        assert fuzzy_score("xyz", "getSymbolName") is None
+        assert fuzzy_score("gsn", "getSymbolName") > fuzzy_score("gsn", "agsxnx")
+        assert fuzzy_score("sym", "symbolCount") > fuzzy_score("sym", "lastSymbol")
+        assert fuzzy_score("render", "render") > fuzzy_score("render", "renderAll")
+
+    def test_ranked_top_k(self, index):
+        """结果按相关度排序并截取前 limit 个"""
+        names = [s.name for s in index.search_symbols("symbol", fuzzy=True)]
+        assert names[0] == "SymbolService"
+        assert set(names) == {"getSymbolName", "SymbolService", "symbolCount", "lastSymbol"}
+        assert len(index.search_symbols("symbol", fuzzy=True, limit=2)) == 2
+        assert [s.name for s in index.search_symbols("gsn", fuzzy=True)] == ["getSymbolName"]
+        assert index.search_symbols("zzz", fuzzy=True) == []
+
+    def test_abbreviation_falls_back_to_scan(self, index):
+        """缩写没有共同的三元组时，按子序列匹配遍历其余名称"""
+        index.add_file("b.ets", [_symbol("Calculator", SymbolType.CLASS, "b.ets", 0)])
+        assert [s.name for s in index.search_symbols("clctr", fuzzy=True)] == ["Calculator"]
+        assert [s.name for s in index.search_symbols("smbcnt", fuzzy=True)] == ["symbolCount"]
+
+    def test_abbreviation_scan_is_bounded(self, index, monkeypatch):
+        """子序列补充只遍历首字母相同的名称，不遍历全部名称"""
+        index.add_file("b.ets", [_symbol("Calculator", SymbolType.CLASS, "b.ets", 0)])
+        index.add_file("c.ets", [
+            _symbol(f"{letter}Widget{i}", SymbolType.VARIABLE, "c.ets", i)
+            for i, letter in enumerate("abdefhijkmnopqtuvwxyz" * 5)
+        ])
+        scored_names = []
+        original = index_service_module.fuzzy_score
+
+        def counting_score(pattern, name):
+            scored_names.append(name)
+            return original(pattern, name)
+
+        monkeypatch.setattr(index_service_module, "fuzzy_score", counting_score)
+        assert [s.name for s in index.search_symbols("clctr", fuzzy=True)] == ["Calculator"]
+        assert scored_names and all(name[0].lower() == "c" for name in scored_names)
+
+    def test_trigram_index_tracks_files(self, index):
+        """移除文件后三元组倒排表同步更新"""
+        index.remove_file("a.ets")
+        assert len(index._trigram_index) == 0
+        assert index.search_symbols("symbol", fuzzy=True) == []
+
+    def test_contains_uses_trigram_candidates(self, index):
+        """子串查询区分大小写，结果与逐个比较一致"""
+        assert sorted(s.name for s in index.search_symbols("Symbol")) == \
+            ["SymbolService", "getSymbolName", "lastSymbol"]
+        assert [s.name for s in index.search_symbols("nd")] == ["render"]
+
+
+class TestRegexQuery:
+    """正则查询测试"""
+
+    NAMES = ["getSymbolName", "getScope", "GetValue", "setName", "HTTPServer",
+             "MAX_VALUE", "myName", "get", "renderName", "a.b", "onClick2"]
+
+    PATTERNS = ["get.*", "get[A-Z]\\w+", ".*Name", "(?i)getv.*", "set|get", "ge?t\\w*",
+                "a\\.b", "on\\w+\\d", ".*Sym.*Name", "^get$", "x*get.*", "(get|set)Name",
+                "[A-Z]+_VALUE", "render(Name)?", "M.X_V.*", "\\w{3}"]
+
+    def test_extract_literals(self):
+        """提取必须出现的字面量和前缀"""
+        assert extract_literals("get.*Name") == ("get", ["get", "Name"])
+        assert extract_literals(".*Sym.*") == (None, ["Sym"])
+        assert extract_literals("ab?c") == ("a", ["a", "c"])
+        assert extract_literals("a+bc") == ("a", ["a", "bc"])
+        assert extract_literals("(foo)bar") == (None, ["bar"])
+        assert extract_literals("a\\.b") == ("a.b", ["a.b"])
+        assert extract_literals("foo|bar") == (None, [])
+
+    @pytest.mark.parametrize("pattern, text, expected", [
+        (r"a\x41bc", "aAbc", ("aAbc", ["aAbc"])),
+        (r"a\u0041bc", "aAbc", ("aAbc", ["aAbc"])),
+        (r"a\U00000041bc", "aAbc", ("aAbc", ["aAbc"])),
+        (r"a\N{LATIN CAPITAL LETTER A}bc", "aAbc", ("aAbc", ["aAbc"])),
+        (r"a\101bc", "aAbc", ("aAbc", ["aAbc"])),
+        (r"a\07bc", "a\abc", ("a\abc", ["a\abc"])),
+        (r"a\tbc", "a\tbc", ("a\tbc", ["a\tbc"])),
+        (r"(a)\1bc", "aabc", (None, ["bc"])),
+        (r"a\d{2}bc", "a12bc", ("a", ["a", "bc"])),
+    ])
+    def test_extract_literals_escapes(self, pattern, text, expected):
+        """多字符转义整体读取并解码，反向引用和字符类转义结束当前字面量"""
+        import re
+
+        assert re.fullmatch(pattern, text)
+        assert extract_literals(pattern) == expected
+        assert all(literal in text for literal in expected[1])
+
+    def test_compiled_patterns_are_cached(self):
+        """同一模式只编译一次"""
+        assert compile_regex("get.*") is compile_regex("get.*")
+        assert compile_regex("(?i)Get.*").prefix is None
+
+    def test_matches_fullmatch_scan(self, tmp_path):
+        """索引查询与逐个 fullmatch 的结果一致"""
+        import re
+
+        db_manager = DatabaseManager(str(tmp_path / "regex.db"))
+        db_manager.create_tables()
+        index = SymbolIndexService(SymbolRepository(db_manager))
+        index.ensure_loaded()
+        index.add_file("a.ets", [_symbol(name, SymbolType.FUNCTION, "a.ets", i)
+                                 for i, name in enumerate(self.NAMES)])
+
+        for pattern in self.PATTERNS:
+            query = SymbolQuery()
+            query.name = pattern
+            query.name_operator = QueryOperator.REGEX
+            expected = sorted(n for n in self.NAMES if re.fullmatch(pattern, n))
+            assert sorted(s.name for s in index.query(query)) == expected, pattern
+
+
+class TestQueryPlanner:
+    """查询计划测试"""
+
+    @pytest.fixture
+    def symbols(self):
+        import random
+
+        rng = random.Random(3)
+        names = ["Foo", "FooBar", "barFoo", "render", "Base", "getName", "name"]
+        types = [SymbolType.CLASS, SymbolType.METHOD, SymbolType.PROPERTY, SymbolType.FUNCTION]
+        result = []
+        for i in range(300):
+            symbol = _symbol(rng.choice(names), rng.choice(types), f"f{i % 5}.ets", i)
+            symbol.scope_id = rng.randint(1, 4)
+            symbol.visibility = rng.choice(list(Visibility))
+            symbol.is_static = rng.random() < 0.2
+            symbol.is_abstract = rng.random() < 0.1
+            symbol.extends = rng.choice([[], ["Base"], ["Other"]])
+            symbol.implements = rng.choice([[], ["IFoo"], ["IFoo", "IBar"]])
+            if rng.random() < 0.5:
+                symbol.type_info = TypeInfo(name="string", is_primitive=True)
+            result.append(symbol)
+        return result
+
+    @staticmethod
+    def _queries():
+        def make(**kwargs):
+            query = SymbolQuery()
+            for key, value in kwargs.items():
+                setattr(query, key, value)
+            return query
+
+        return [
+            make(name="Foo"),
+            make(name="Foo", file_path="f1.ets", is_static=False),
+            make(name="Foo", name_operator=QueryOperator.STARTS_WITH, is_public=True),
+            make(name="Foo", name_operator=QueryOperator.ENDS_WITH, is_public=False),
+            make(name="ame", name_operator=QueryOperator.CONTAINS, has_type=True),
+            make(name="[a-z]+", name_operator=QueryOperator.REGEX, scope_id=2),
+            make(symbol_types=[SymbolType.CLASS, SymbolType.METHOD], extends="Base"),
+            make(implements="IBar", is_abstract=True),
+            make(scope_id=3, has_type=False, file_path="f2.ets"),
+            make(is_static=True),
+            make(),
+        ]
+
+    @staticmethod
+    def _matches(query, symbol):
+        import re
+
+        if query.name:
+            operator = query.name_operator
+            if operator == QueryOperator.EQUALS and symbol.name != query.name:
+                return False
+            if operator == QueryOperator.STARTS_WITH and not symbol.name.startswith(query.name):
+                return False
+            if operator == QueryOperator.ENDS_WITH and not symbol.name.endswith(query.name):
+                return False
+            if operator == QueryOperator.CONTAINS and query.name not in symbol.name:
+                return False
+            if operator == QueryOperator.REGEX and not re.fullmatch(query.name, symbol.name):
+                return False
+        return ((not query.symbol_types or symbol.symbol_type in query.symbol_types)
+                and (not query.file_path or symbol.file_path == query.file_path)
+                and (query.scope_id is None or symbol.scope_id == query.scope_id)
+                and (query.is_public is None
+                     or (symbol.visibility == Visibility.PUBLIC) == query.is_public)
+                and (query.is_static is None or symbol.is_static == query.is_static)
+                and (query.is_abstract is None or symbol.is_abstract == query.is_abstract)
+                and (query.has_type is None or (symbol.type_info is not None) == query.has_type)
+                and (not query.extends or query.extends in symbol.extends)
+                and (not query.implements or query.implements in symbol.implements))
+
+    def test_index_and_database_match_brute_force(self, symbols, tmp_path):
+        """内存查询和 SQL 查询的结果都与逐个过滤一致"""
+        db_manager = DatabaseManager(str(tmp_path / "planner.db"))
+        db_manager.create_tables()
+        repository = SymbolRepository(db_manager)
+        repository.save_symbols_batch(symbols)
+
+        memory = SymbolIndexService(repository)
+        memory.build_index(symbols)
+        database = SymbolIndexService(repository)
+
+        for query in self._queries():
+            expected = {s for s in symbols if self._matches(query, s)}
+            assert set(memory.query(query)) == expected
+            assert set(database.query(query)) == expected
+
+    def test_smallest_posting_drives(self, symbols, tmp_path):
+        """选择规模最小的倒排表作为驱动集合"""
+        db_manager = DatabaseManager(str(tmp_path / "planner.db"))
+        db_manager.create_tables()
+        index = SymbolIndexService(SymbolRepository(db_manager))
+        index.build_index(symbols)
+
+        query = SymbolQuery()
+        query.is_public = True
+        query.name = "render"
+        query.is_abstract = True
+        steps = index.explain(query)
+        assert steps[0] == "scan is_abstract"
+        assert set(steps[1:]) == {"filter name", "filter visibility"}
+
+        index.remove_file("f0.ets")
+        assert all(s.file_path != "f0.ets" for s in index.query(query))
+        assert all(by_file.keys() - {"f0.ets"} == by_file.keys()
+                   for by_file in index._attribute_index.values())
+
+
+class TestPositionQuery:
+    """位置查询测试"""
+
+    @staticmethod
+    def _nested(file_path="a.ets"):
+        def make(name, symbol_type, start, end):
+            return Symbol(
+                id=None,
+                name=name,
+                symbol_type=symbol_type,
+                file_path=file_path,
+                range=Range(Position(*start, 0), Position(*end, 0)),
+                scope_id=1
+            )
+        return [
+            make("Outer", SymbolType.CLASS, (0, 0), (20, 1)),
+            make("run", SymbolType.METHOD, (2, 2), (8, 3)),
+            make("value", SymbolType.PARAMETER, (2, 6), (2, 19)),
+            make("count", SymbolType.VARIABLE, (4, 4), (4, 20)),
+            make("stop", SymbolType.METHOD, (10, 2), (12, 3)),
+            make("Other", SymbolType.CLASS, (22, 0), (24, 1)),
+        ]
+
+    @pytest.fixture
+    def repository(self, tmp_path):
+        db_manager = DatabaseManager(str(tmp_path / "position.db"))
+        db_manager.create_tables()
+        return SymbolRepository(db_manager)
+
+    def test_innermost_symbol(self, repository):
+        """内存索引和数据库查询都返回包含位置的最内层符号"""
+        symbols = self._nested()
+        repository.save_symbols_batch(symbols)
+        memory = SymbolIndexService(repository)
+        memory.add_file("a.ets", symbols)
+        database = SymbolIndexService(repository)
+
+        cases = {
+            (0, 0): "Outer",
+            (2, 2): "run",
+            (2, 6): "value",
+            (2, 19): "run",
+            (4, 10): "count",
+            (9, 0): "Outer",
+            (11, 0): "stop",
+            (20, 1): None,
+            (23, 5): "Other",
+            (30, 0): None,
+        }
+        for (line, column), expected in cases.items():
+            for index in (memory, database):
+                symbol = index.find_symbol_at_position("a.ets", line, column)
+                assert (symbol.name if symbol else None) == expected, (line, column)
+
+    def test_position_index_follows_file_updates(self, repository):
+        """文件重新加入后位置索引使用新符号"""
+        index = SymbolIndexService(repository)
+        index.add_file("a.ets", self._nested())
+        assert index.find_symbol_at_position("a.ets", 4, 10).name == "count"
+
+        index.add_file("a.ets", [s for s in self._nested() if s.name != "count"])
+        assert index.find_symbol_at_position("a.ets", 4, 10).name == "run"
+
+        index.remove_file("a.ets")
+        assert index.find_symbol_at_position("a.ets", 4, 10) is None
@@ -0,0 +1,112 @@
+"""
+区间索引测试
+
+验证最内层区间查询与逐个比较的结果一致。
+"""
+
+import random
+
+from arkts_processor.models import Position, Range, Scope, ScopeType
+from arkts_processor.symbol_service.interval_index import IntervalIndex
+from arkts_processor.symbol_service.scope_analyzer import ScopeAnalyzer
+
+
+def _range(start_line, start_col, end_line, end_col):
+    return Range(Position(start_line, start_col, 0), Position(end_line, end_col, 0))
+
+
+def _random_nested_ranges(rng, start, end, depth, result):
+    """在 [start, end) 内随机生成嵌套且互不交叉的区间"""
+    if depth == 0 or end - start < 4:
+        return
+    cursor = start
+    while cursor < end - 2:
+        child_start = rng.randint(cursor, end - 2)
+        child_end = rng.randint(child_start + 1, end)
+        result.append((child_start, child_end))
+        if rng.random() < 0.2:
+            # 范围完全相同的嵌套区间
+            result.append((child_start, child_end))
+        _random_nested_ranges(rng, child_start, child_end, depth - 1, result)
+        cursor = child_end
+
+
+def _to_range(start, end, width=10):
+    return _range(start // width, start % width, end // width, end % width)
+
+
+def _brute_force(ranges, position):
+    """逐个比较：起始最靠后、结束最靠前、最先出现的包含区间"""
+    containing = [(i, r) for i, r in enumerate(ranges) if r.contains(position)]
+    if not containing:
+        return None
+
+    best = containing[0]
+    for item in containing[1:]:
+        start, best_start = item[1].start, best[1].start
+        end, best_end = item[1].end, best[1].end
+        if (start.line, start.column) > (best_start.line, best_start.column):
+            best = item
+        elif ((start.line, start.column) == (best_start.line, best_start.column)
+              and (end.line, end.column) < (best_end.line, best_end.column)):
+            best = item
+    return best[0]
+
+
+class TestIntervalIndex:
+    """区间索引测试"""
+
+    def test_matches_brute_force(self):
+        """随机嵌套区间的查询结果与逐个比较一致"""
+        rng = random.Random(7)
+        for _ in range(20):
+            spans = [(0, 300)]
+            _random_nested_ranges(rng, 0, 300, 5, spans)
+            ranges = [_to_range(s, e) for s, e in spans]
+            index = IntervalIndex((r, i) for i, r in enumerate(ranges))
+
+            for offset in range(0, 310):
+                position = Position(offset // 10, offset % 10, 0)
+                assert index.find_innermost(position) == _brute_force(ranges, position)
+
+    def test_half_open_and_empty(self):
+        """区间为半开区间，空区间被忽略"""
+        index = IntervalIndex([
+            (_range(0, 0, 10, 0), "outer"),
+            (_range(2, 4, 2, 8), "inner"),
+            (_range(5, 0, 5, 0), "empty"),
+        ])
+        assert index.find_innermost(Position(2, 4, 0)) == "inner"
+        assert index.find_innermost(Position(2, 8, 0)) == "outer"
+        assert index.find_innermost(Position(5, 0, 0)) == "outer"
+        assert index.find_innermost(Position(10, 0, 0)) is None
+        assert len(index) == 2
+
+    def test_identical_ranges_prefer_first(self):
+        """范围相同时返回最先加入的值"""
+        index = IntervalIndex([
+            (_range(0, 0, 3, 0), "first"),
+            (_range(0, 0, 3, 0), "second"),
+        ])
+        assert index.find_innermost(Position(1, 0, 0)) == "first"
+
+
+class TestScopeLookup:
+    """作用域查找测试"""
+
+    def test_scope_by_position_uses_innermost(self):
+        """按位置查找返回最内层作用域，作用域列表变化后自动重建索引"""
+        analyzer = ScopeAnalyzer("test.ets", b"")
+        outer = Scope(id=0, scope_type=ScopeType.GLOBAL, file_path="test.ets",
+                      range=_range(0, 0, 20, 0))
+        inner = Scope(id=1, scope_type=ScopeType.CLASS, file_path="test.ets",
+                      range=_range(2, 0, 8, 1), parent_id=0)
+        analyzer.scopes = [outer, inner]
+
+        assert analyzer.get_scope_by_position(Position(3, 2, 0)) is inner
+        assert analyzer.get_scope_by_position(Position(9, 0, 0)) is outer
+
+        block = Scope(id=2, scope_type=ScopeType.BLOCK, file_path="test.ets",
+                      range=_range(4, 0, 5, 0), parent_id=1)
+        analyzer.scopes.append(block)
+        assert analyzer.get_scope_by_position(Position(4, 3, 0)) is block
@@ -0,0 +1,149 @@
+"""
+文件清单测试
+
+验证重新索引时跳过未变化的文件，并正确统计新增、变化和删除的文件。
+"""
+
+import os
+
+import pytest
+
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import create_default_parser
+from arkts_processor.symbol_service.manifest import content_hash, diff_manifest
+
+
+SAMPLE_SOURCES = {
+    "a.ets": "class Alpha {\n  run(): void {}\n}\n",
+    "b.ets": "class Beta {\n  size: number = 1\n}\n",
+    "c.ets": "interface Gamma {\n  id: number\n}\n",
+}
+
+
+class TestManifest:
+    """文件清单测试"""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        paths = []
+        for name, content in SAMPLE_SOURCES.items():
+            path = tmp_path / name
+            path.write_text(content, encoding="utf-8")
+            paths.append(str(path))
+        service = SymbolService(db_path=str(tmp_path / "symbols.db"))
+        service.set_parser(create_default_parser())
+        return service, paths
+
+    @staticmethod
+    def _counts(summary):
+        return {key: summary[key] for key in ("added", "changed", "skipped", "removed", "errors")}
+
+    def test_reindex_skips_unchanged(self, workspace):
+        """第二次重新索引跳过所有未变化的文件"""
+        service, paths = workspace
+
+        first = service.reindex(paths)
+        assert self._counts(first) == {"added": 3, "changed": 0, "skipped": 0, "removed": 0, "errors": 0}
+        assert set(service.repository.get_file_manifest()) == set(paths)
+
+        second = service.reindex(paths)
+        assert self._counts(second) == {"added": 0, "changed": 0, "skipped": 3, "removed": 0, "errors": 0}
+        assert second["results"] == []
+        assert len(service.find_symbol_by_name("Alpha")) == 1
+
+    def test_reindex_detects_changes_and_removals(self, workspace):
+        """内容变化的文件替换旧符号，已删除的文件从数据库和索引中清除"""
+        service, paths = workspace
+        service.reindex(paths)
+
+        # 仅修改时间变化：按内容摘要判断为未变化，并更新清单
+        stat = os.stat(paths[0])
+        os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns - 60 * 10 ** 9))
+        # 内容变化
+        with open(paths[1], "w", encoding="utf-8") as f:
+            f.write("class Delta {\n  size: number = 2\n}\n")
+        os.remove(paths[2])
+
+        summary = service.reindex(paths)
+        assert self._counts(summary) == {"added": 0, "changed": 1, "skipped": 1, "removed": 1, "errors": 0}
+
+        manifest = service.repository.get_file_manifest()
+        assert set(manifest) == set(paths[:2])
+        assert manifest[paths[0]].mtime_ns == os.stat(paths[0]).st_mtime_ns
+        assert service.find_symbol_by_name("Beta") == []
+        assert len(service.find_symbol_by_name("Delta")) == 1
+        assert service.repository.get_symbols_by_file(paths[2]) == []
+        assert service.find_symbol_by_name("Gamma") == []
+
+        assert self._counts(service.reindex(paths[:2]))["skipped"] == 2
+
+    def test_recently_modified_files_are_hashed(self, workspace):
+        """刚修改过的文件不按 stat 信息跳过，同一时间粒度内的修改也能被发现"""
+        service, paths = workspace
+        service.reindex(paths)
+
+        # 大小相同的修改，恢复原来的修改时间
+        stat = os.stat(paths[1])
+        with open(paths[1], "w", encoding="utf-8") as f:
+            f.write("class Zeta {\n  size: number = 1\n}\n")
+        os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        summary = service.reindex(paths)
+        assert (summary["changed"], summary["skipped"]) == (1, 2)
+        assert len(service.find_symbol_by_name("Zeta")) == 1
+
+    def test_process_file_skip_unchanged(self, workspace):
+        """process_file 在 skip_unchanged 时跳过未变化的文件，重复处理时替换旧数据"""
+        service, paths = workspace
+        service.process_file(paths[0])
+
+        assert service.process_file(paths[0], skip_unchanged=True) == {"file_path": paths[0], "skipped": True}
+        result = service.process_file(paths[0])
+        assert result["symbols"] == len(service.repository.get_symbols_by_file(paths[0]))
+
+    def test_process_files_skips_unchanged(self, workspace):
+        """批量处理默认跳过未变化的文件，不重新解析；只处理变化的文件"""
+        service, paths = workspace
+        service.process_files(paths)
+
+        parsed = []
+        parser = service.parser
+
+        class CountingParser:
+            def parse(self, source):
+                parsed.append(source)
+                return parser.parse(source)
+
+        service.parser = CountingParser()
+        assert service.process_files(paths) == [{"file_path": path, "skipped": True} for path in paths]
+        assert parsed == []
+
+        with open(paths[1], "w", encoding="utf-8") as f:
+            f.write("class Delta {\n  size: number = 2\n}\n")
+        results = service.process_files(paths)
+        assert [result.get("skipped", False) for result in results] == [True, False, True]
+        assert len(parsed) == 1
+        assert len(service.find_symbol_by_name("Delta")) == 1
+
+        assert len(service.process_files(paths, skip_unchanged=False)) == 3
+        assert len(parsed) == 4
+
+    def test_purge_missing_outside_request(self, workspace):
+        """清单中不在请求列表内且已不存在的文件也被清除"""
+        service, paths = workspace
+        service.reindex(paths)
+        os.remove(paths[2])
+
+        diff = diff_manifest(paths[:1], service.repository.get_file_manifest())
+        assert diff.unchanged == paths[:1]
+        assert diff.removed == [paths[2]]
+        assert diff_manifest(paths[:1], service.repository.get_file_manifest(), purge_missing=False).removed == []
+
+        assert service.reindex(paths[:1])["removed"] == 1
+        assert set(service.repository.get_file_manifest()) == set(paths[:2])
+
+    def test_content_hash_is_stable(self):
+        """内容摘要只取决于内容"""
+        assert content_hash(b"class A {}") == content_hash(b"class A {}")
+        assert content_hash(b"class A {}") != content_hash(b"class B {}")
+        assert len(content_hash(b"")) == 32
@@ -0,0 +1,126 @@
+"""
+并行索引测试
+
+验证并行模式与顺序模式的输出完全一致。
+"""
+
+import os
+import tempfile
+import shutil
+
+import pytest
+
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import create_default_parser
+
+
+SAMPLE_SOURCES = {
+    "calculator.ets": """
+export class Calculator {
+  private result: number = 0;
+
+  add(a: number, b: number): number {
+    this.result = a + b;
+    return this.result;
+  }
+}
+""",
+    "card.ets": """
+@Component
+export struct Card {
+  @State title: string = '标题'
+
+  aboutToAppear() {
+    console.log('appear')
+  }
+
+  build() {
+    Column() {
+      Text(this.title).fontSize(12)
+    }
+  }
+}
+""",
+    "types.ets": """
+interface Shape {
+  area(): number;
+}
+
+enum Color {
+  RED,
+  GREEN
+}
+
+type Alias = string;
+""",
+}
+
+
+def _snapshot(service: SymbolService, file_paths):
+    """导出可比较的数据库内容"""
+    snapshot = []
+    for file_path in file_paths:
+        symbols = service.repository.get_symbols_by_file(file_path)
+        scopes = service.repository.get_scopes_by_file(file_path)
+        snapshot.append((
+            [(s.id, s.name, s.symbol_type, s.scope_id, s.range, s.type_info, s.return_type,
+              s.is_exported, s.metadata) for s in symbols],
+            [(s.id, s.scope_type, s.parent_id, s.range) for s in scopes],
+        ))
+    return snapshot
+
+
+class TestParallelIndexing:
+    """并行索引测试"""
+
+    @pytest.fixture
+    def workspace(self):
+        """创建包含示例文件的临时目录"""
+        temp_dir = tempfile.mkdtemp()
+        file_paths = []
+        for name, content in SAMPLE_SOURCES.items():
+            path = os.path.join(temp_dir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            file_paths.append(path)
+        # 不存在的文件用于验证错误处理
+        file_paths.append(os.path.join(temp_dir, "missing.ets"))
+        yield temp_dir, file_paths
+        shutil.rmtree(temp_dir)
+
+    def _create_service(self, temp_dir, name):
+        service = SymbolService(db_path=os.path.join(temp_dir, name))
+        service.set_parser(create_default_parser())
+        return service
+
+    def test_parallel_matches_sequential(self, workspace):
+        """并行模式的结果与顺序模式完全一致"""
+        temp_dir, file_paths = workspace
+
+        sequential = self._create_service(temp_dir, "sequential.db")
+        sequential_results = sequential.process_files(file_paths)
+
+        parallel = self._create_service(temp_dir, "parallel.db")
+        parallel_results = parallel.process_files(file_paths, workers=2, chunksize=1)
+
+        assert parallel_results == sequential_results
+        assert _snapshot(parallel, file_paths) == _snapshot(sequential, file_paths)
+        assert "error" in parallel_results[-1]
+
+    def test_parallel_preserves_input_order(self, workspace):
+        """结果顺序与输入顺序一致"""
+        temp_dir, file_paths = workspace
+        reordered = list(reversed(file_paths))
+
+        service = self._create_service(temp_dir, "ordered.db")
+        results = service.process_files(reordered, workers=2, chunksize=2)
+
+        assert [r["file_path"] for r in results] == reordered
+
+    def test_invalid_chunksize(self, workspace):
+        """chunksize 必须为正数"""
+        temp_dir, file_paths = workspace
+        service = self._create_service(temp_dir, "invalid.db")
+
+        with pytest.raises(ValueError):
+            service.process_files(file_paths, workers=2, chunksize=0)
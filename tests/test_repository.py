@@ -6,7 +6,9 @@ import pytest
 import tempfile
 import os
 from arkts_processor.database.repository import DatabaseManager, SymbolRepository
-from arkts_processor.models import Symbol, SymbolType, Scope, ScopeType, Position, Range
+from arkts_processor.models import (
+    Symbol, SymbolType, Scope, ScopeType, Position, Range, TypeInfo, Reference, ReferenceType
+)
 
 
 class TestDatabaseRepository:
@@ -159,6 +161,241 @@ class TestDatabaseRepository:
         # 获取文件的所有符号
         file_symbols = repository.get_symbols_by_file("test.ts")
         assert len(file_symbols) == 3
+    
+    def test_batch_save_interns_types_and_keeps_order(self, repository):
+        """测试批量保存时类型只写入一次，返回的ID与输入顺序一致"""
+        from sqlalchemy import func, select
+        from arkts_processor.database.schema import TypeModel
+        
+        # 已存在的类型直接复用
+        existing = Symbol(
+            id=None,
+            name="existing",
+            symbol_type=SymbolType.VARIABLE,
+            file_path="test.ts",
+            range=Range(start=Position(0, 0, 0), end=Position(0, 8, 8)),
+            scope_id=1,
+            type_info=TypeInfo(name="string", is_primitive=True)
+        )
+        repository.save_symbol(existing)
+        
+        symbols = [
+            Symbol(
+                id=None,
+                name=f"method{i}",
+                symbol_type=SymbolType.METHOD,
+                file_path="test.ts",
+                range=Range(
+                    start=Position(i + 1, 0, 0),
+                    end=Position(i + 1, 5, 5)
+                ),
+                scope_id=1,
+                type_info=TypeInfo(name=["string", "number"][i % 2], is_primitive=True),
+                return_type=TypeInfo(name="void", is_primitive=True),
+                metadata={"index": i}
+            )
+            for i in range(50)
+        ]
+        
+        ids = repository.save_symbols_batch(symbols)
+        assert ids == [s.id for s in symbols]
+        assert ids == sorted(ids)
+        
+        with repository.db_manager.get_session() as session:
+            names = session.scalars(select(TypeModel.name).order_by(TypeModel.name)).all()
+        assert names == ["number", "string", "void"]
+        
+        retrieved = repository.get_symbol_by_id(ids[3])
+        assert retrieved.name == "method3"
+        assert retrieved.type_info.name == "number"
+        assert retrieved.return_type.name == "void"
+        assert retrieved.metadata == {"index": 3}
+        
+        assert repository.save_symbols_batch([]) == []
+    
+    def test_batch_save_scopes_remaps_parents(self, repository):
+        """测试批量保存作用域时父作用域ID映射为数据库ID"""
+        def make_scope(temp_id, parent_id, scope_type, line):
+            return Scope(
+                id=temp_id,
+                scope_type=scope_type,
+                file_path="test.ts",
+                range=Range(start=Position(line, 0, 0), end=Position(line + 10, 0, 0)),
+                parent_id=parent_id
+            )
+        
+        # 占用几个ID，使临时ID与数据库ID不同
+        repository.save_scope(make_scope(None, None, ScopeType.GLOBAL, 0))
+        repository.save_scope(make_scope(None, None, ScopeType.GLOBAL, 0))
+        
+        scopes = [
+            make_scope(0, None, ScopeType.GLOBAL, 0),
+            make_scope(1, 0, ScopeType.CLASS, 1),
+            make_scope(2, 1, ScopeType.FUNCTION, 2),
+            make_scope(3, 0, ScopeType.FUNCTION, 5),
+        ]
+        ids = repository.save_scopes_batch(scopes)
+        assert ids == [s.id for s in scopes]
+        
+        stored = {s.id: s for s in repository.get_scopes_by_file("test.ts")}
+        assert stored[scopes[0].id].parent_id is None
+        assert stored[scopes[1].id].parent_id == scopes[0].id
+        assert stored[scopes[2].id].parent_id == scopes[1].id
+        assert stored[scopes[3].id].parent_id == scopes[0].id
+        assert scopes[2].parent_id == scopes[1].id
+    
+    def test_batch_save_references(self, repository):
+        """测试批量保存引用"""
+        references = [
+            Reference(
+                id=None,
+                symbol_id=7,
+                file_path="test.ts",
+                position=Position(i, 2, 0),
+                reference_type=ReferenceType.READ,
+                context=f"line {i}"
+            )
+            for i in range(4)
+        ]
+        ids = repository.save_references_batch(references)
+        assert ids == [r.id for r in references]
+        
+        stored = repository.get_references_by_symbol(7)
+        assert sorted(r.position.line for r in stored) == [0, 1, 2, 3]
+    
+    def test_shared_session_is_one_transaction(self, repository):
+        """测试传入同一会话的批量写入在一个事务中提交或回滚"""
+        scope = Scope(
+            id=0,
+            scope_type=ScopeType.GLOBAL,
+            file_path="test.ts",
+            range=Range(start=Position(0, 0, 0), end=Position(10, 0, 100))
+        )
+        symbol = Symbol(
+            id=None,
+            name="dup",
+            symbol_type=SymbolType.VARIABLE,
+            file_path="test.ts",
+            range=Range(start=Position(1, 0, 0), end=Position(1, 3, 3)),
+            scope_id=1
+        )
+        
+        with pytest.raises(Exception):
+            with repository.db_manager.get_session() as session:
+                repository.save_scopes_batch([scope], session)
+                # 违反唯一约束，整个事务回滚
+                repository.save_symbols_batch([symbol, symbol], session)
+        
+        assert repository.get_scopes_by_file("test.ts") == []
+    
+    def test_type_cache_queries_each_key_once(self, repository, db_manager):
+        """测试类型驻留缓存：预热后已知类型不再查询，新类型只查询一次"""
+        from sqlalchemy import event
+        
+        def make_symbol(i, type_name, generic_params=None):
+            return Symbol(
+                id=None,
+                name=f"value{i}",
+                symbol_type=SymbolType.VARIABLE,
+                file_path="test.ts",
+                range=Range(start=Position(i, 0, 0), end=Position(i, 5, 5)),
+                scope_id=1,
+                type_info=TypeInfo(name=type_name, generic_params=generic_params or [])
+            )
+        
+        repository.save_symbols_batch([make_symbol(0, "string"), make_symbol(1, "Array", ["number"])])
+        
+        # 新的仓库实例从 types 表预热
+        fresh = SymbolRepository(db_manager)
+        assert fresh.warm_type_cache() == 2
+        
+        type_queries = []
+        
+        def count_type_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and "FROM types" in statement:
+                type_queries.append(statement)
+        
+        event.listen(db_manager.engine, "before_cursor_execute", count_type_selects)
+        try:
+            fresh.save_symbols_batch([make_symbol(2, "string"), make_symbol(3, "Array", ["number"])])
+            assert type_queries == []
+            
+            # 泛型参数不同视为不同类型，缓存未命中时只查询一次
+            fresh.save_symbols_batch([make_symbol(4, "Array", ["string"])])
+            fresh.save_symbols_batch([make_symbol(5, "Array", ["string"])])
+            assert len(type_queries) == 1
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", count_type_selects)
+        
+        assert fresh.warm_type_cache() == 3
+    
+    def test_type_cache_discards_rolled_back_types(self, repository):
+        """测试事务回滚后新插入的类型不进入缓存"""
+        symbol = Symbol(
+            id=None,
+            name="dup",
+            symbol_type=SymbolType.VARIABLE,
+            file_path="test.ts",
+            range=Range(start=Position(1, 0, 0), end=Position(1, 3, 3)),
+            scope_id=1,
+            type_info=TypeInfo(name="Rolled")
+        )
+        with pytest.raises(Exception):
+            repository.save_symbols_batch([symbol, symbol])
+        
+        assert repository.type_key(symbol.type_info) not in repository._type_ids
+        symbol.id = None
+        repository.save_symbols_batch([symbol])
+        assert repository.get_symbol_by_id(symbol.id).type_info.name == "Rolled"
+
+    
+    def test_reading_symbols_issues_constant_queries(self, repository, db_manager):
+        """测试读取符号时类型信息批量还原，查询次数与符号数量无关"""
+        from sqlalchemy import event
+        
+        symbols = [
+            Symbol(
+                id=None,
+                name=f"method{i}",
+                symbol_type=SymbolType.METHOD,
+                file_path="test.ts",
+                range=Range(start=Position(i, 0, 0), end=Position(i, 5, 5)),
+                scope_id=1,
+                type_info=TypeInfo(name=f"Param{i % 7}", generic_params=["T"]),
+                return_type=TypeInfo(name="number", is_primitive=True)
+            )
+            for i in range(50)
+        ]
+        repository.save_symbols_batch(symbols)
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        # 新的仓库实例：类型缓存为空，需要从数据库加载
+        fresh = SymbolRepository(db_manager)
+        event.listen(db_manager.engine, "before_cursor_execute", record)
+        try:
+            loaded = fresh.get_symbols_by_file("test.ts")
+            cold_queries = len(statements)
+            statements.clear()
+            fresh.get_symbols_by_name("method3")
+            fresh.get_symbols_by_type(SymbolType.METHOD)
+            warm_queries = len(statements)
+        finally:
+            event.remove(db_manager.engine, "before_cursor_execute", record)
+        
+        assert cold_queries <= 2
+        assert warm_queries == 2
+        
+        by_name = {s.name: s for s in loaded}
+        assert by_name["method10"].type_info.name == "Param3"
+        assert by_name["method10"].type_info.generic_params == ["T"]
+        assert by_name["method10"].return_type.is_primitive
+        # 每个符号得到独立的类型对象
+        by_name["method10"].type_info.generic_params.append("U")
+        assert by_name["method3"].type_info.generic_params == ["T"]
 
 
 if __name__ == "__main__":
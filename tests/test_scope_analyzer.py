@@ -3,7 +3,7 @@
 """
 
 import pytest
-from arkts_processor.models import Scope, ScopeType
+from arkts_processor.models import Scope, ScopeType, Symbol, SymbolType, Range, Position
 from arkts_processor.symbol_service.scope_analyzer import ScopeAnalyzer
 
 
@@ -29,3 +29,104 @@ class TestScopeAnalyzer:
     def test_scope_lookup(self):
         """测试作用域查找"""
         pass
+
+
+def _scope(scope_id, scope_type, parent=None, line=0):
+    """创建测试用作用域"""
+    return Scope(
+        id=scope_id,
+        scope_type=scope_type,
+        file_path="test.ets",
+        range=Range(Position(line, 0, 0), Position(line + 10, 0, 0)),
+        parent_id=parent.id if parent else None,
+        parent=parent
+    )
+
+
+def _symbol(name):
+    """创建测试用符号"""
+    return Symbol(
+        id=None,
+        name=name,
+        symbol_type=SymbolType.VARIABLE,
+        file_path="test.ets",
+        range=Range(Position(0, 0, 0), Position(0, 1, 1))
+    )
+
+
+class TestScopeChain:
+    """作用域链与名称查找测试"""
+
+    def test_chain_follows_parent_references(self):
+        """作用域链沿父引用查找，不受数据库ID重新分配影响"""
+        analyzer = ScopeAnalyzer("test.ets", b"")
+        root = _scope(0, ScopeType.GLOBAL)
+        cls = _scope(1, ScopeType.CLASS, root)
+        method = _scope(2, ScopeType.FUNCTION, cls)
+        analyzer.scopes = [root, cls, method]
+
+        # 模拟保存到数据库后ID变化
+        root.id, cls.id, method.id = 10, 11, 12
+        assert analyzer.get_scope_chain(method) == [method, cls, root]
+
+    def test_chain_falls_back_to_parent_id(self):
+        """没有父引用的作用域通过ID映射查找"""
+        analyzer = ScopeAnalyzer("test.ets", b"")
+        root = _scope(0, ScopeType.GLOBAL)
+        child = _scope(1, ScopeType.FUNCTION)
+        child.parent_id = 0
+        analyzer.scopes = [root, child]
+
+        assert analyzer.get_scope_chain(child) == [child, root]
+        assert analyzer.get_scope_by_id(1) is child
+
+    def test_lookup_cache_invalidated_on_add_symbol(self):
+        """符号表变化后名称查找缓存失效"""
+        analyzer = ScopeAnalyzer("test.ets", b"")
+        root = _scope(0, ScopeType.GLOBAL)
+        inner = _scope(1, ScopeType.FUNCTION, root)
+        analyzer.scopes = [root, inner]
+
+        outer_x = _symbol("x")
+        root.add_symbol(outer_x)
+        assert analyzer.lookup_symbol("x", inner) is outer_x
+        assert analyzer.lookup_symbol("y", inner) is None
+
+        # 内层遮蔽外层同名符号
+        inner_x = _symbol("x")
+        inner.add_symbol(inner_x)
+        assert analyzer.lookup_symbol("x", inner) is inner_x
+
+        y = _symbol("y")
+        root.add_symbol(y)
+        assert analyzer.lookup_symbol("y", inner) is y
+
+    def test_lookup_cache_ignores_other_scope_trees(self):
+        """其他作用域树（其他文件）的符号表变化不会清空缓存"""
+        analyzer = ScopeAnalyzer("a.ets", b"")
+        root = _scope(0, ScopeType.GLOBAL)
+        inner = _scope(1, ScopeType.FUNCTION, root)
+        analyzer.scopes = [root, inner]
+        x = _symbol("x")
+        root.add_symbol(x)
+        assert analyzer.lookup_symbol("x", inner) is x
+
+        assert inner.symbol_table_version is root.symbol_table_version
+
+        other_root = _scope(0, ScopeType.GLOBAL)
+        _scope(1, ScopeType.FUNCTION, other_root).add_symbol(_symbol("z"))
+        assert other_root.symbol_table_version.value == 1
+        assert root.symbol_table_version.value == 1
+
+        assert analyzer.lookup_symbol("x", inner) is x
+        assert (id(inner), "x") in analyzer._lookup_cache
+
+    def test_scope_lookup_recursive(self):
+        """Scope.lookup 沿父作用域递归查找"""
+        root = _scope(0, ScopeType.GLOBAL)
+        inner = _scope(1, ScopeType.BLOCK, root)
+        symbol = _symbol("value")
+        root.add_symbol(symbol)
+
+        assert inner.lookup("value") is symbol
+        assert inner.lookup("value", recursive=False) is None
@@ -0,0 +1,88 @@
+"""
+SourceIndex 单元测试
+
+测试源代码索引的行偏移和字节/字符映射。
+"""
+
+import unittest
+
+from arkts_processor.source_index import SourceIndex
+from arkts_processor.chunk_service.extractor import ChunkExtractor
+from arkts_processor.models import Symbol, SymbolType, Range, Position
+
+
+class TestSourceIndex(unittest.TestCase):
+    """SourceIndex 单元测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.text = "let a = 1;\n// 中文注释\nlet title = '标题';\n\nend"
+        self.source_code = self.text.encode('utf-8')
+        self.index = SourceIndex(self.source_code)
+
+    def test_lines_match_split(self):
+        """按行获取与 split('\\n') 一致"""
+        lines = self.text.split('\n')
+        self.assertEqual(self.index.line_count, len(lines))
+        for i, line in enumerate(lines):
+            self.assertEqual(self.index.get_line(i), line)
+        self.assertEqual(self.index.get_lines(1, 2), '\n'.join(lines[1:3]))
+        self.assertEqual(self.index.get_lines(3, 10), '\n'.join(lines[3:]))
+        self.assertEqual(self.index.get_line(10), "")
+
+    def test_byte_char_mapping(self):
+        """字节偏移与字符偏移互相转换"""
+        for char_offset in range(len(self.text) + 1):
+            byte_offset = len(self.text[:char_offset].encode('utf-8'))
+            self.assertEqual(self.index.byte_to_char(byte_offset), char_offset)
+            self.assertEqual(self.index.char_to_byte(char_offset), byte_offset)
+
+    def test_get_text(self):
+        """按字节范围取文本与解码切片一致"""
+        start = self.source_code.index("'标题'".encode('utf-8'))
+        end = start + len("'标题'".encode('utf-8'))
+        self.assertEqual(self.index.get_text(start, end), "'标题'")
+        self.assertEqual(self.index.get_text(0, 3), "let")
+
+    def test_line_of_offset(self):
+        """字节偏移所在行"""
+        self.assertEqual(self.index.line_of_offset(0), 0)
+        self.assertEqual(self.index.line_of_offset(len(b"let a = 1;\n")), 1)
+        self.assertEqual(self.index.line_of_offset(len(self.source_code)), 4)
+
+    def test_char_offset_at_clamps(self):
+        """超出行尾的列截断到行尾"""
+        self.assertEqual(self.index.char_offset_at(0, 100), len("let a = 1;"))
+        self.assertEqual(self.index.char_offset_at(100, 0), len(self.text))
+
+    def test_ascii_fast_path(self):
+        """纯ASCII源代码直接使用字节偏移"""
+        index = SourceIndex(b"a\nbc\n")
+        self.assertTrue(index.is_ascii)
+        self.assertEqual(index.byte_to_char(4), 4)
+        self.assertEqual(index.get_lines(0, 1), "a\nbc")
+
+
+class TestChunkSourceWithMultibyte(unittest.TestCase):
+    """ChunkExtractor 在多字节字符下的源代码提取"""
+
+    def test_extract_source_code_uses_byte_columns(self):
+        """符号范围的字节列正确映射为字符"""
+        text = "const 标题: string = 'x';\nfunction f() {}\n"
+        source_code = text.encode('utf-8')
+        start_column = len("const ".encode('utf-8'))
+        end_column = len("const 标题".encode('utf-8'))
+        symbol = Symbol(
+            id=1,
+            name="标题",
+            symbol_type=SymbolType.VARIABLE,
+            file_path="test.ets",
+            range=Range(Position(0, start_column, start_column), Position(0, end_column, end_column))
+        )
+
+        extractor = ChunkExtractor("test.ets", source_code)
+        self.assertEqual(extractor.extract_source_code(symbol), "标题")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+确定性符号ID测试
+
+验证符号ID在提取阶段由文件路径、限定名、类型和起始偏移确定，引用在写入数据库前
+即指向这些ID，批量写入保留ID，重命名文件时ID和指向它们的引用一同更新。
+"""
+
+import pytest
+
+from arkts_processor.models import ReferenceType
+from arkts_processor.symbol_ids import compute_symbol_ids, qualified_names
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import AnalysisPipeline, create_default_parser
+
+
+SOURCE = b"""export class Counter {
+  count: number = 0
+}
+
+class Local extends Counter {}
+
+let counter = new Counter()
+"""
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return create_default_parser()
+
+
+def _analyze(parser, file_path, source=SOURCE):
+    return AnalysisPipeline().analyze(file_path, source, parser.parse(source))
+
+
+class TestSymbolIds:
+    """确定性符号ID测试"""
+
+    def test_deterministic(self, parser):
+        """同一文件的两次分析得到相同的ID，文件路径或位置变化时ID变化"""
+        first = _analyze(parser, "counter.ets")
+        second = _analyze(parser, "counter.ets")
+        ids = [s.id for s in first.symbols]
+
+        assert all(ids) and len(set(ids)) == len(ids)
+        assert [s.id for s in second.symbols] == ids
+        assert not set(ids) & {s.id for s in _analyze(parser, "other.ets").symbols}
+        assert _analyze(parser, "counter.ets", b"\n" + SOURCE).symbols[0].id != ids[0]
+
+    def test_references_resolved_offline(self, parser):
+        """引用和关系在写入数据库前即指向本文件符号的ID"""
+        analysis = _analyze(parser, "counter.ets")
+        ids = {s.name: s.id for s in analysis.symbols}
+
+        assert analysis.references
+        assert all(r.symbol_id in ids.values() for r in analysis.references)
+        assert [(r.from_symbol_id, r.to_symbol_id) for r in analysis.relations] == [
+            (ids["Local"], ids["Counter"])
+        ]
+
+    def test_qualified_names(self):
+        """限定名按范围包含关系计算，与输入顺序无关；键相同的符号得到不同ID"""
+        keys = [("build", "build_method", 40, 60), ("Card", "component", 0, 100), ("title", "property", 20, 30)]
+        assert qualified_names(keys) == ["Card.build", "Card", "Card.title"]
+        assert qualified_names(keys[::-1]) == ["Card.title", "Card", "Card.build"]
+
+        duplicated = compute_symbol_ids("card.ets", [keys[1], keys[1]])
+        assert len(set(duplicated)) == 2
+
+    def test_stored_and_renamed(self, tmp_path):
+        """写入数据库保留提取时的ID，重命名后ID和引用按新路径更新"""
+        path = tmp_path / "counter.ets"
+        path.write_bytes(SOURCE)
+        service = SymbolService(db_path=str(tmp_path / "symbols.db"))
+        service.set_parser(create_default_parser())
+        service.process_file(str(path))
+
+        extracted = [s.id for s in _analyze(service.parser, str(path)).symbols]
+        assert sorted(s.id for s in service.repository.get_symbols_by_file(str(path))) == sorted(extracted)
+
+        moved = str(tmp_path / "moved.ets")
+        id_map = service.rename_file(str(path), moved)
+        expected = [s.id for s in _analyze(service.parser, moved).symbols]
+        assert sorted(id_map) == sorted(extracted)
+        assert sorted(id_map.values()) == sorted(expected)
+        stored = {s.id: s for s in service.repository.get_symbols_by_file(moved)}
+        assert sorted(stored) == sorted(expected)
+        assert sorted(s.id for s in service.index_service.get_file_symbols(moved)) == sorted(expected)
+
+        references = [
+            r for r in service.repository.get_references_by_file(moved)
+            if r.reference_type != ReferenceType.IMPORT
+        ]
+        assert references and all(r.symbol_id in stored for r in references)
+        local = service.find_symbol_by_name("Local")[0]
+        assert [s.name for s in service.find_ancestors(local.id)] == ["Counter"]
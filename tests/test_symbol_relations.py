@@ -0,0 +1,132 @@
+"""
+符号关系测试
+
+验证继承/实现关系的持久化和层次闭包查询。
+"""
+
+import os
+import tempfile
+import shutil
+
+import pytest
+
+from arkts_processor.models import SymbolRelation
+from arkts_processor.symbol_service.service import SymbolService
+from arkts_processor.symbol_service.pipeline import create_default_parser
+
+
+SAMPLE_SOURCES = {
+    "shapes.ets": """
+interface Shape {
+  area(): number
+}
+
+interface Polygon extends Shape {
+  sides(): number
+}
+
+class Base implements Polygon {
+  area(): number { return 0 }
+  sides(): number { return 0 }
+}
+""",
+    "derived.ets": """
+class Square extends Base {}
+
+class Tile extends Square {}
+""",
+}
+
+
+class TestSymbolRelations:
+    """符号关系测试"""
+
+    @pytest.fixture
+    def workspace(self):
+        """创建包含示例文件的临时目录"""
+        temp_dir = tempfile.mkdtemp()
+        paths = {}
+        for name, content in SAMPLE_SOURCES.items():
+            path = os.path.join(temp_dir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            paths[name] = path
+        yield temp_dir, paths
+        shutil.rmtree(temp_dir)
+
+    def _create_service(self, temp_dir):
+        service = SymbolService(db_path=os.path.join(temp_dir, "symbols.db"))
+        service.set_parser(create_default_parser())
+        return service
+
+    def _symbol(self, service, name):
+        return service.find_symbol_by_name(name)[0]
+
+    def test_relations_are_persisted(self, workspace):
+        """处理文件时保存继承/实现关系，文件顺序不影响结果"""
+        temp_dir, paths = workspace
+        service = self._create_service(temp_dir)
+
+        # 子类文件先处理，基类文件处理时补建跨文件关系
+        derived = service.process_file(paths["derived.ets"])
+        shapes = service.process_file(paths["shapes.ets"])
+        assert derived["relations"] == 1
+        assert shapes["relations"] == 3
+
+        base = self._symbol(service, "Base")
+        relations = service.repository.get_relations(base.id, incoming=True)
+        assert [(r.from_symbol_id, r.relation_type) for r in relations] == [
+            (self._symbol(service, "Square").id, "extends")
+        ]
+
+    def test_closure_queries(self, workspace):
+        """子类、实现者和祖先链查询返回传递闭包，由近及远排序"""
+        temp_dir, paths = workspace
+        service = self._create_service(temp_dir)
+        service.process_files([paths["shapes.ets"], paths["derived.ets"]])
+
+        base = self._symbol(service, "Base")
+        shape = self._symbol(service, "Shape")
+        tile = self._symbol(service, "Tile")
+
+        assert [s.name for s in service.find_subclasses(base.id)] == ["Square", "Tile"]
+        assert [s.name for s in service.find_implementors(shape.id)] == ["Base", "Square", "Tile"]
+        assert [s.name for s in service.find_ancestors(tile.id)] == [
+            "Square", "Base", "Polygon", "Shape"
+        ]
+
+        hierarchy = service.index_service.get_symbol_hierarchy(tile)
+        assert [s.name for s in hierarchy["extends"]] == ["Square"]
+        assert [s.name for s in hierarchy["ancestors"]] == ["Square", "Base", "Polygon", "Shape"]
+
+    def test_refresh_replaces_relations(self, workspace):
+        """刷新文件时删除涉及旧符号的关系，并重新建立关系"""
+        temp_dir, paths = workspace
+        service = self._create_service(temp_dir)
+        service.process_files([paths["shapes.ets"], paths["derived.ets"]])
+
+        service.refresh_file(paths["shapes.ets"])
+
+        tile = self._symbol(service, "Tile")
+        assert [s.name for s in service.find_ancestors(tile.id)] == [
+            "Square", "Base", "Polygon", "Shape"
+        ]
+
+    def test_cycles_terminate(self, workspace):
+        """关系中存在环时查询仍然结束且不包含起始符号"""
+        temp_dir, paths = workspace
+        service = self._create_service(temp_dir)
+        service.process_files([paths["shapes.ets"], paths["derived.ets"]])
+
+        base = self._symbol(service, "Base")
+        tile = self._symbol(service, "Tile")
+        service.repository.save_relations_batch([SymbolRelation(base.id, tile.id, "extends")])
+
+        assert [s.name for s in service.find_subclasses(base.id)] == ["Square", "Tile"]
+        assert [s.name for s in service.find_ancestors(tile.id)] == [
+            "Square", "Base", "Polygon", "Shape"
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])